@@ -1,9 +1,13 @@
+import logging
 import os
 from typing import List, Dict, Any
 import google.generativeai as genai
 from django.conf import settings
 import random
 import json
+from core.instrumentation import span
+
+logger = logging.getLogger(__name__)
 
 class StyleAdvisorAgent:
     """
@@ -15,13 +19,13 @@ class StyleAdvisorAgent:
         try:
             self.api_key = settings.GOOGLE_API_KEY
             if not self.api_key or self.api_key == 'your-google-gemini-api-key-here':
-                print("Warning: Google API key not configured properly")
+                logger.warning("Google API key not configured properly")
                 self.model = None
             else:
                 genai.configure(api_key=self.api_key)
                 self.model = genai.GenerativeModel('gemini-1.5-flash')
         except Exception as e:
-            print(f"Error initializing AI agent: {e}")
+            logger.error("Error initializing AI agent: %s", e)
             self.model = None
         
         # Personality and style guidelines
@@ -67,12 +71,13 @@ class StyleAdvisorAgent:
         
         try:
             if self.model:
-                response = self.model.generate_content(prompt)
+                with span(logger, 'stylist.greeting'):
+                    response = self.model.generate_content(prompt)
                 return response.text.strip()
             else:
                 raise Exception("AI model not initialized")
         except Exception as e:
-            print(f"AI generation error: {e}")
+            logger.warning("AI generation error: %s", e)
             return f"Hello! I'm your AI Style Advisor. I've analyzed your skin tone and found that you have beautiful {skin_tone.replace('_', ' ')} undertones, perfect for {season} colors! I'm excited to help you find the perfect interview outfits that will make you look confident and professional. Let me show you some amazing options!"
     
     def generate_outfit_explanation(self, outfit: Dict, skin_tone: str, 
@@ -104,12 +109,13 @@ class StyleAdvisorAgent:
         
         try:
             if self.model:
-                response = self.model.generate_content(prompt)
+                with span(logger, 'stylist.outfit_explanation'):
+                    response = self.model.generate_content(prompt)
                 return response.text.strip()
             else:
                 raise Exception("AI model not initialized")
         except Exception as e:
-            print(f"AI outfit explanation error: {e}")
+            logger.warning("AI outfit explanation error: %s", e)
             primary_color = outfit.get('primary_colors', ['neutral'])[0] if outfit.get('primary_colors') else 'neutral'
             return f"This {primary_color} combination beautifully complements your {season} coloring and creates a polished, professional look that's perfect for interviews. The color harmony will enhance your natural features and project confidence."
     
@@ -163,7 +169,8 @@ class StyleAdvisorAgent:
         """
         
         try:
-            response = self.model.generate_content(prompt)
+            with span(logger, 'stylist.alternative_suggestion'):
+                response = self.model.generate_content(prompt)
             return response.text.strip()
         except Exception as e:
             return f"Let me find some different options that better match your personal style while still working beautifully with your {season} coloring!"
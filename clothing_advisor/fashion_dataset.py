@@ -1,9 +1,12 @@
+import logging
 import pandas as pd
 import random
 from django.conf import settings
 from typing import List, Dict, Any
 import re
 
+logger = logging.getLogger(__name__)
+
 class FashionDatasetManager:
     """
     Manages the fashion dataset and provides intelligent filtering
@@ -40,9 +43,9 @@ class FashionDatasetManager:
             self.df = pd.read_csv(dataset_path)
             # Clean NaN values that cause JSON issues
             self.df = self.df.fillna('')
-            print(f"Loaded {len(self.df)} fashion items from dataset")
+            logger.info("Loaded %d fashion items from dataset", len(self.df))
         except Exception as e:
-            print(f"Error loading dataset: {e}")
+            logger.warning("Error loading dataset: %s", e)
             # Try alternative path
             try:
                 import os
@@ -51,9 +54,9 @@ class FashionDatasetManager:
                 self.df = pd.read_csv(alt_path)
                 # Clean NaN values that cause JSON issues
                 self.df = self.df.fillna('')
-                print(f"Loaded {len(self.df)} fashion items from alternative path")
+                logger.info("Loaded %d fashion items from alternative path", len(self.df))
             except Exception as e2:
-                print(f"Error loading from alternative path: {e2}")
+                logger.error("Error loading from alternative path: %s", e2)
                 self.df = pd.DataFrame()
     
     def get_recommendations(self, gender: str, recommended_colors: List[str], 
@@ -95,7 +98,7 @@ class FashionDatasetManager:
                 ]
         
         if color_filtered_df.empty:
-            print(f"DEBUG: No color matches found, using fallback with {len(filtered_df)} items")
+            logger.debug("No color matches found, using fallback with %d items", len(filtered_df))
             color_filtered_df = filtered_df.head(50)  # Larger fallback for better variety
         
         professional_categories = [
@@ -2,6 +2,9 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.utils import timezone
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 class SkinToneAnalysis(models.Model):
     """Model to store skin tone analysis results"""
@@ -118,7 +121,7 @@ class ChatSession(models.Model):
                 
                 self.current_recommendations = serializable_recommendations
             except Exception as e:
-                print(f"Error serializing recommendations: {e}")
+                logger.warning("Error serializing recommendations: %s", e)
                 self.current_recommendations = []
         
         self.save()
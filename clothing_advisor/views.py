@@ -10,13 +10,15 @@ import uuid
 import base64
 from PIL import Image
 import io
-import traceback
+import logging
 
 from .models import SkinToneAnalysis, UserPreference, ChatSession
 from .skin_tone_detector import SkinToneDetector
 from .fashion_dataset import FashionDatasetManager
 from .ai_agents import StyleAdvisorAgent, ColorTheoryAgent, PreferenceAgent
 
+logger = logging.getLogger(__name__)
+
 def index(request):
     """Render the main chat interface"""
     return render(request, 'clothing_advisor/stylist.html')
@@ -78,7 +80,7 @@ def analyze_skin_tone(request):
                 gender, analysis_result['skin_tone'], analysis_result['season']
             )
         except Exception as e:
-            print(f"AI greeting error: {e}")
+            logger.warning("AI greeting error: %s", e)
             # Fallback greeting
             skin_tone_display = analysis_result['skin_tone'].replace('_', ' ')
             greeting = f"Hello! I'm your AI Style Advisor. I've analyzed your skin tone and found that you have beautiful {skin_tone_display} undertones, perfect for {analysis_result['season']} colors! I'm excited to help you find the perfect interview outfits that will make you look confident and professional. Let me show you some amazing options!"
@@ -99,8 +101,7 @@ def analyze_skin_tone(request):
         })
         
     except Exception as e:
-        print(f"Error in skin tone analysis: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception("Error in skin tone analysis")
         return JsonResponse({'error': 'Failed to analyze skin tone'}, status=500)
 
 @csrf_exempt
@@ -113,7 +114,7 @@ def get_recommendations(request):
         data = json.loads(request.body)
         session_id = data.get('session_id')
         
-        print(f"DEBUG: Received session_id: {session_id}")
+        logger.debug("Received session_id: %s", session_id)
         
         if not session_id:
             return JsonResponse({'error': 'Session ID required'}, status=400)
@@ -122,9 +123,9 @@ def get_recommendations(request):
         try:
             skin_analysis = SkinToneAnalysis.objects.get(session_id=session_id)
             chat_session = ChatSession.objects.get(session_id=session_id)
-            print(f"DEBUG: Found session - skin_tone: {skin_analysis.skin_tone}, gender: {chat_session.gender}")
+            logger.debug("Found session - skin_tone: %s, gender: %s", skin_analysis.skin_tone, chat_session.gender)
         except (SkinToneAnalysis.DoesNotExist, ChatSession.DoesNotExist):
-            print(f"DEBUG: Session not found. Available sessions: {list(SkinToneAnalysis.objects.values_list('session_id', flat=True))}")
+            logger.debug("Session not found: %s", session_id)
             return JsonResponse({'error': 'Session not found'}, status=404)
         
         # Get user preferences
@@ -141,12 +142,12 @@ def get_recommendations(request):
         
         # Get fashion recommendations
         fashion_manager = FashionDatasetManager()
-        print(f"DEBUG: Getting recommendations for gender={chat_session.gender}, colors={recommended_colors}, season={skin_analysis.season}")
+        logger.debug("Getting recommendations for gender=%s, colors=%s, season=%s", chat_session.gender, recommended_colors, skin_analysis.season)
         
         # Ensure we have fallback colors if recommended_colors is empty
         if not recommended_colors:
             recommended_colors = ['Navy', 'Black', 'White', 'Grey', 'Blue']
-            print(f"DEBUG: Using fallback colors: {recommended_colors}")
+            logger.debug("Using fallback colors: %s", recommended_colors)
         
         outfits = fashion_manager.get_recommendations(
             gender=chat_session.gender,
@@ -156,11 +157,11 @@ def get_recommendations(request):
             limit=5
         )
         
-        print(f"DEBUG: Found {len(outfits)} outfits")
+        logger.debug("Found %d outfits", len(outfits))
         
         # If no outfits found, try with broader criteria
         if not outfits:
-            print(f"DEBUG: No outfits found with specific criteria, trying broader search...")
+            logger.debug("No outfits found with specific criteria, trying broader search")
             # Try with just gender and basic professional colors
             outfits = fashion_manager.get_recommendations(
                 gender=chat_session.gender,
@@ -169,10 +170,10 @@ def get_recommendations(request):
                 user_preferences={},
                 limit=5
             )
-            print(f"DEBUG: Broader search found {len(outfits)} outfits")
+            logger.debug("Broader search found %d outfits", len(outfits))
         
         if not outfits:
-            print(f"DEBUG: Still no outfits found - dataset size: {len(fashion_manager.df)}")
+            logger.warning("Still no outfits found - dataset size: %d", len(fashion_manager.df))
             # Return a helpful error message with suggestions
             return JsonResponse({
                 'error': 'No suitable outfits found',
@@ -196,7 +197,7 @@ def get_recommendations(request):
                     )
                     compliment = style_agent.generate_compliment(outfit, chat_session.gender)
                 except Exception as ai_error:
-                    print(f"AI generation error: {ai_error}")
+                    logger.warning("AI generation error: %s", ai_error)
                     # Fallback explanations
                     explanation = f"This outfit complements your {skin_analysis.season} coloring beautifully and creates a professional, polished look perfect for interviews."
                     compliment = "You'll look confident and professional in this outfit!"
@@ -208,7 +209,7 @@ def get_recommendations(request):
                 }
                 enhanced_outfits.append(enhanced_outfit)
         except Exception as agent_error:
-            print(f"Style agent initialization error: {agent_error}")
+            logger.warning("Style agent initialization error: %s", agent_error)
             # Use outfits without AI enhancements
             enhanced_outfits = outfits[:3]
         
@@ -244,8 +245,7 @@ def get_recommendations(request):
         })
         
     except Exception as e:
-        print(f"Error getting recommendations: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception("Error getting recommendations")
         return JsonResponse({
             'error': 'Failed to get recommendations', 
             'details': str(e),
@@ -358,8 +358,7 @@ def submit_feedback(request):
         return JsonResponse(response_data)
         
     except Exception as e:
-        print(f"Error submitting feedback: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception("Error submitting feedback")
         return JsonResponse({'error': 'Failed to submit feedback'}, status=500)
 
 @csrf_exempt
@@ -387,7 +386,7 @@ def get_chat_history(request):
         })
         
     except Exception as e:
-        print(f"Error getting chat history: {str(e)}")
+        logger.exception("Error getting chat history")
         return JsonResponse({'error': 'Failed to get chat history'}, status=500)
 
 @csrf_exempt
@@ -425,5 +424,5 @@ def end_session(request):
         })
         
     except Exception as e:
-        print(f"Error ending session: {str(e)}")
+        logger.exception("Error ending session")
         return JsonResponse({'error': 'Failed to end session'}, status=500)
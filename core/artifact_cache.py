@@ -0,0 +1,146 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from typing import Callable, Iterable, Optional
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from core.instrumentation import span
+
+# Rendered downloads (PDFs, text exports) stored on disk under a hash of everything
+# that affects their bytes. Edited content hashes to a new key, so a stale file is
+# never served; old entries are removed on edit or aged out by the size cap.
+# Recency for LRU eviction is the file's mtime, refreshed on every hit.
+
+logger = logging.getLogger(__name__)
+
+_size_lock = threading.Lock()
+_cached_bytes: Optional[int] = None
+
+def artifact_key(kind: str, content: str, fmt: str, renderer_version: str, template: str = '') -> str:
+    """Hex digest identifying one rendering of `content`; also used as the ETag"""
+    digest = hashlib.sha256()
+    for part in (kind, renderer_version, template, fmt):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    digest.update(content.encode('utf-8'))
+    return digest.hexdigest()
+
+def _artifact_path(key: str) -> str:
+    # Two-character fan-out keeps directories small
+    return os.path.join(settings.ARTIFACT_CACHE_DIR, key[:2], key)
+
+def _iter_artifacts() -> Iterable[os.DirEntry]:
+    if not os.path.isdir(settings.ARTIFACT_CACHE_DIR):
+        return
+    for bucket in os.scandir(settings.ARTIFACT_CACHE_DIR):
+        if bucket.is_dir():
+            for entry in os.scandir(bucket.path):
+                if entry.is_file() and not entry.name.startswith('.'):
+                    yield entry
+
+def _evict(target_bytes: int) -> int:
+    """Delete least recently used artifacts until the cache fits in `target_bytes`; returns the new size"""
+    entries = []
+    for entry in _iter_artifacts():
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= target_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except FileNotFoundError:
+            pass
+    return total
+
+def _account(added_bytes: int):
+    global _cached_bytes
+    with _size_lock:
+        if _cached_bytes is None:
+            _cached_bytes = _evict(settings.ARTIFACT_CACHE_MAX_BYTES)
+        _cached_bytes += added_bytes
+        if _cached_bytes > settings.ARTIFACT_CACHE_MAX_BYTES:
+            # Evict down to 90% so a full cache doesn't rescan on every write
+            _cached_bytes = _evict(int(settings.ARTIFACT_CACHE_MAX_BYTES * 0.9))
+
+def get_artifact(key: str) -> Optional[bytes]:
+    path = _artifact_path(key)
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return data
+
+def store_artifact(key: str, data: bytes):
+    path = _artifact_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Written under a temporary name and renamed, so readers never see a partial file
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _account(len(data))
+
+def get_or_render(key: str, render: Callable[[], bytes]) -> bytes:
+    """Cached bytes for `key`, rendering and storing them on a miss"""
+    data = get_artifact(key)
+    if data is None:
+        with span(logger, 'artifact_cache.render') as fields:
+            data = render()
+            fields['bytes'] = len(data)
+        try:
+            store_artifact(key, data)
+        except OSError as e:
+            # A read-only or full disk only costs the cache, not the download
+            logger.warning('Could not store a rendered artifact: %s', e)
+    return data
+
+def discard_artifacts(*keys: str):
+    for key in keys:
+        try:
+            os.remove(_artifact_path(key))
+        except FileNotFoundError:
+            pass
+
+def _etag_matches(request, etag: str) -> bool:
+    header = request.META.get('HTTP_IF_NONE_MATCH', '')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    return etag in [tag.strip() for tag in header.split(',')]
+
+def artifact_response(request, key: str, render: Callable[[], bytes], content_type: str, filename: str, cache: bool = True) -> HttpResponse:
+    """
+    Download response for an artifact with a strong ETag
+    A matching If-None-Match is answered with 304 before anything is read or rendered;
+    `cache=False` skips the disk for artifacts that are cheaper to build than to read
+    """
+    etag = f'"{key}"'
+    if request.method in ('GET', 'HEAD') and _etag_matches(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        data = get_or_render(key, render) if cache else render()
+        response = HttpResponse(data, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['ETag'] = etag
+    # Browsers keep the file but revalidate each time, so an edit is picked up immediately
+    response['Cache-Control'] = 'private, no-cache'
+    return response
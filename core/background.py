@@ -0,0 +1,32 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict
+from django.db import close_old_connections, connection
+
+# Named, bounded thread pools for work that runs off the request path
+# Each kind of work gets its own pool, so a burst of one kind cannot starve another
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+def get_executor(name: str, max_workers: int) -> ThreadPoolExecutor:
+    """Process-wide pool for `name`, created on first use with `max_workers` threads"""
+    executor = _executors.get(name)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix=name)
+                _executors[name] = executor
+    return executor
+
+def _run_with_connection_cleanup(function: Callable, *args, **kwargs):
+    # Pool threads outlive requests, so their database connections are closed explicitly
+    close_old_connections()
+    try:
+        return function(*args, **kwargs)
+    finally:
+        connection.close()
+
+def submit_background(name: str, max_workers: int, function: Callable, *args, **kwargs) -> Future:
+    """Queue `function(*args, **kwargs)` on the named pool; extra submissions wait for a free worker"""
+    return get_executor(name, max_workers).submit(_run_with_connection_cleanup, function, *args, **kwargs)
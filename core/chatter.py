@@ -0,0 +1,119 @@
+import json
+import re
+from functools import lru_cache
+from typing import Iterable, Optional, Pattern
+from django.conf import settings
+
+# Removes the model's conversational wrapping ("Okay, here's the resume...") from
+# generated documents. Rules per kind of document live in CHATTER_RULES_PATH:
+#   drop_lines    phrases; any line containing one is removed, wherever it is
+#   edge_lines    phrases removed like drop_lines, but only from the leading and
+#                 trailing lines ("I hope this helps"); the body is left alone, since
+#                 first-person documents can say the same things as content
+#   preamble      words marking the leading lines before the content as intro
+#   skip_to_name  the content starts at the first short line with letters (a name)
+# Each list is compiled into one regex and the text is lower-cased and scanned once,
+# instead of lower-casing and testing every phrase on every line (re's own
+# IGNORECASE matching is several times slower than lower-casing up front).
+
+MAX_NAME_LINE_LENGTH = 100
+
+def _compile(phrases: Iterable[str], flags: int = 0) -> Optional[Pattern]:
+    phrases = sorted({phrase.lower() for phrase in phrases}, key=len, reverse=True)
+    if not phrases:
+        return None
+    # Straight and curly apostrophes are interchangeable
+    return re.compile('|'.join(re.escape(phrase).replace("'", "['\u2019]") for phrase in phrases), flags)
+
+class ChatterFilter:
+    """Compiled rules for one kind of document"""
+    
+    def __init__(self, drop_lines: Iterable[str] = (), preamble: Iterable[str] = (), skip_to_name: bool = False,
+                 edge_lines: Iterable[str] = ()):
+        drop_lines = list(drop_lines)
+        self.drop_lines = _compile(drop_lines)  # Matched against lower-cased text
+        # For the rare text whose lower-casing changes its length (offsets would shift)
+        self.drop_lines_any_case = _compile(drop_lines, re.IGNORECASE)
+        self.preamble = _compile(preamble, re.IGNORECASE)
+        self.edge_lines = _compile(edge_lines, re.IGNORECASE)
+        self.skip_to_name = skip_to_name
+    
+    def _is_content(self, stripped: str) -> bool:
+        if not stripped or (self.preamble and self.preamble.search(stripped)):
+            return False
+        if self.edge_lines and self.edge_lines.search(stripped):
+            return False
+        if self.skip_to_name:
+            return len(stripped) < MAX_NAME_LINE_LENGTH and any(c.isalpha() for c in stripped)
+        return True
+    
+    def _content_start(self, text: str) -> int:
+        """Offset of the first content line (len(text) if there is none)"""
+        position = 0
+        while position < len(text):
+            end = text.find('\n', position)
+            end = len(text) if end < 0 else end
+            line = text[position:end]
+            if not (self.drop_lines_any_case and self.drop_lines_any_case.search(line)) and self._is_content(line.strip()):
+                return position
+            position = end + 1
+        return len(text)
+    
+    def _strip_trailing(self, text: str) -> str:
+        """Remove the closing run of blank and edge_lines lines, if it has any of the latter"""
+        end = len(text)
+        found = False
+        while end > 0:
+            start = text.rfind('\n', 0, end) + 1
+            line = text[start:end].strip()
+            if line and not self.edge_lines.search(line):
+                break
+            found = found or bool(line)
+            end = start - 1 if start else 0
+        return text[:max(end, 0)] if found else text
+    
+    def clean(self, text: str) -> str:
+        text = self._clean_body(text)
+        return self._strip_trailing(text) if self.edge_lines else text
+    
+    def _clean_body(self, text: str) -> str:
+        position = self._content_start(text) if (self.preamble or self.skip_to_name or self.edge_lines) else 0
+        if self.drop_lines is None:
+            return text[position:]
+        
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            haystack, drop_lines = lowered, self.drop_lines
+        else:
+            haystack, drop_lines = text, self.drop_lines_any_case
+        
+        pieces = []
+        while True:
+            match = drop_lines.search(haystack, position)
+            if match is None:
+                pieces.append(text[position:])
+                return ''.join(pieces)
+            # Cut the whole line the phrase is on
+            line_start = text.rfind('\n', position, match.start()) + 1 or position
+            line_end = text.find('\n', match.end())
+            pieces.append(text[position:line_start])
+            if line_end < 0:
+                # The last line went, so its line break goes with it
+                cleaned = ''.join(pieces)
+                return cleaned[:-1] if cleaned.endswith('\n') else cleaned
+            position = line_end + 1
+
+@lru_cache(maxsize=None)
+def get_chatter_filter(kind: str) -> ChatterFilter:
+    """Filter for `kind` ('resume', 'cover_letter', 'interview_tips'), compiled once per process"""
+    with open(settings.CHATTER_RULES_PATH, encoding='utf-8') as f:
+        rules = json.load(f)['kinds'][kind]
+    return ChatterFilter(
+        rules.get('drop_lines', ()),
+        rules.get('preamble', ()),
+        rules.get('skip_to_name', False),
+        rules.get('edge_lines', ()),
+    )
+
+def strip_chatter(text: str, kind: str) -> str:
+    return get_chatter_filter(kind).clean(text)
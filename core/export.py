@@ -0,0 +1,98 @@
+import io
+import logging
+import re
+import zipfile
+from collections import deque
+from datetime import datetime
+from typing import Callable, Iterable, Iterator, List, NamedTuple
+from django.conf import settings
+from core.artifact_cache import get_or_render
+from core.background import submit_background
+from core.instrumentation import span
+
+# Bulk download of many rendered documents as one ZIP, streamed as it is written:
+# files are rendered (or read from the artifact cache) on a worker pool, a bounded
+# number at a time, and each is sent as soon as it and every file before it are ready.
+# Memory stays at about EXPORT_FILES_IN_FLIGHT files whatever the size of the archive.
+
+logger = logging.getLogger(__name__)
+
+EXPORT_POOL = 'export'
+ZIP_EPOCH = datetime(1980, 1, 1)
+
+class ExportFile(NamedTuple):
+    name: str  # Path inside the archive
+    key: str  # Artifact cache key
+    render: Callable[[], bytes]
+    modified: datetime
+
+def safe_filename(text: str) -> str:
+    """`text` reduced to word characters and underscores, for names in downloads"""
+    text = re.sub(r'[^\w\s-]', '', text)
+    return re.sub(r'[-\s]+', '_', text).strip('_')
+
+class _ZipStream(io.RawIOBase):
+    """Write-only, unseekable buffer that zipfile writes to; drained after every file"""
+    
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._offset = 0
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._offset
+    
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def _rendered(files: Iterable[ExportFile]) -> Iterator:
+    """(file, future of its bytes) in order, with at most EXPORT_FILES_IN_FLIGHT submitted ahead"""
+    pending = deque()
+    try:
+        for file in files:
+            pending.append((file, submit_background(EXPORT_POOL, settings.EXPORT_WORKERS, get_or_render, file.key, file.render)))
+            if len(pending) >= settings.EXPORT_FILES_IN_FLIGHT:
+                yield pending.popleft()
+        while pending:
+            yield pending.popleft()
+    finally:
+        # The client went away: don't render files nobody will receive
+        for _, future in pending:
+            future.cancel()
+
+def stream_zip(files: Iterable[ExportFile]) -> Iterator[bytes]:
+    """
+    ZIP archive of `files`, yielded in chunks for a StreamingHttpResponse
+    A file that fails to render is left out and listed in export_errors.txt
+    """
+    stream = _ZipStream()
+    failed = []
+    with span(logger, 'export.zip') as fields:
+        with zipfile.ZipFile(stream, 'w') as archive:
+            for file, future in _rendered(files):
+                try:
+                    data = future.result()
+                except Exception:
+                    logger.exception('Could not render %s for export', file.name)
+                    failed.append(file.name)
+                    continue
+                info = zipfile.ZipInfo(file.name, max(file.modified, ZIP_EPOCH).timetuple()[:6])
+                # PDFs are already compressed
+                info.compress_type = zipfile.ZIP_STORED if file.name.endswith('.pdf') else zipfile.ZIP_DEFLATED
+                archive.writestr(info, data)
+                yield stream.drain()
+            if failed:
+                archive.writestr('export_errors.txt', 'These files could not be rendered:\n' + '\n'.join(failed) + '\n')
+        # Closing the archive writes the central directory
+        yield stream.drain()
+        fields['bytes'] = stream.tell()
+        fields['failed'] = len(failed)
@@ -0,0 +1,139 @@
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from django.conf import settings
+
+# Logging for the app modules: a JSON (or text) formatter, a handler that hands
+# records to a background thread so request threads never block on stdout, and
+# timing spans around the expensive stages (AI calls, parsing, rendering).
+# Spans nest per request/thread; each record carries the trace id of its root span.
+# Log lengths and counts, never resume or letter text.
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar('current_span', default=None)
+
+# LogRecord attributes that are not extra fields
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, span context and any extra fields"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class _SpanContextFilter(logging.Filter):
+    # Runs in the calling thread, where the current span is known
+    def filter(self, record: logging.LogRecord) -> bool:
+        span = _current_span.get()
+        if span is not None and not hasattr(record, 'trace_id'):
+            record.trace_id = span['trace_id']
+            record.span = span['name']
+        return True
+
+class QueuedStreamHandler(logging.handlers.QueueHandler):
+    """
+    Queue-backed stream handler: the caller only enqueues the record, a listener
+    thread formats it and writes it to stderr. Records are dropped (and counted)
+    rather than blocking the request when the queue is full
+    """
+    
+    def __init__(self, max_queue_size: int = 10000):
+        super().__init__(queue.Queue(maxsize=max_queue_size))
+        self.dropped = 0
+        self.stream_handler = logging.StreamHandler(sys.stderr)
+        self.addFilter(_SpanContextFilter())
+        self.listener = logging.handlers.QueueListener(self.queue, self.stream_handler, respect_handler_level=False)
+        # Stopped, after draining the queue, by close() when logging shuts down
+        self.listener.start()
+    
+    def setFormatter(self, formatter):
+        # Formatting happens on the listener thread
+        self.stream_handler.setFormatter(formatter)
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only resolve what may change after the call returns (arguments, the exception)
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+    
+    def close(self):
+        if self.listener._thread is not None:
+            self.listener.stop()
+        super().close()
+
+def _sampled(sample_rate: Optional[float]) -> bool:
+    rate = settings.LOG_SPAN_SAMPLE_RATE if sample_rate is None else sample_rate
+    return rate >= 1 or random.random() < rate
+
+@contextmanager
+def span(logger: logging.Logger, name: str, sample_rate: Optional[float] = None, **fields):
+    """
+    Time a block and log it as one 'span' record with duration_ms
+    Spans are sampled per trace (LOG_SPAN_SAMPLE_RATE, decided by the outermost span);
+    a span that raises is always logged, at ERROR. `fields` are added to the record
+    and can be extended inside the block through the yielded dict
+    """
+    parent = _current_span.get()
+    current = {
+        'name': name,
+        'trace_id': parent['trace_id'] if parent else uuid.uuid4().hex[:16],
+        'sampled': parent['sampled'] if parent else _sampled(sample_rate),
+        'fields': dict(fields),
+    }
+    token = _current_span.set(current)
+    start = time.perf_counter()
+    try:
+        yield current['fields']
+    except Exception as e:
+        _log_span(logger, logging.ERROR, current, parent, start, 'error', error=type(e).__name__)
+        raise
+    else:
+        if current['sampled'] and logger.isEnabledFor(logging.INFO):
+            _log_span(logger, logging.INFO, current, parent, start, 'ok')
+    finally:
+        _current_span.reset(token)
+
+def _log_span(logger: logging.Logger, level: int, current: Dict, parent: Optional[Dict], start: float, status: str, **extra):
+    duration_ms = round((time.perf_counter() - start) * 1000, 2)
+    logger.log(level, 'span %s %.1fms', current['name'], duration_ms, extra={
+        'event': 'span',
+        'span': current['name'],
+        'parent_span': parent['name'] if parent else None,
+        'trace_id': current['trace_id'],
+        'duration_ms': duration_ms,
+        'status': status,
+        **current['fields'],
+        **extra,
+    })
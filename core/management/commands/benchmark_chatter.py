@@ -0,0 +1,77 @@
+import json
+import time
+from pathlib import Path
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from core.chatter import get_chatter_filter
+
+SAMPLE_DOCUMENT = """Okay, here's the resume tailored to the job description:
+
+Jane Doe
+jane.doe@example.com | +1 555 0100
+
+PROFESSIONAL SUMMARY
+Backend engineer with 7 years of experience building payment and data platforms.
+
+EXPERIENCE
+* Led the migration of billing services to event-driven processing, cutting latency by 40%
+* Built an internal analytics pipeline processing 2TB of events per day
+I've created this section to highlight your leadership.
+
+SKILLS
+Python, Django, PostgreSQL, Kafka, AWS, Terraform
+
+EDUCATION
+B.Sc. Computer Science, 2016
+"""
+
+class Command(BaseCommand):
+    help = 'Measure the cost per KB of stripping model chatter, against a per-line phrase scan'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--file', help='Text file to use as the document (default: a built-in sample with chatter)')
+        parser.add_argument('--sizes', default='1,10,100', help='Comma-separated document sizes in KB')
+        parser.add_argument('--repeat', type=int, default=50, help='Runs per measurement (the fastest is reported)')
+    
+    def handle(self, *args, **options):
+        if options['file']:
+            try:
+                sample = Path(options['file']).read_text(encoding='utf-8')
+            except OSError as e:
+                raise CommandError(f'Could not read {options["file"]}: {e}')
+        else:
+            sample = SAMPLE_DOCUMENT
+        try:
+            sizes = [float(size) for size in options['sizes'].split(',')]
+        except ValueError:
+            raise CommandError('--sizes must be comma-separated numbers')
+        
+        with open(settings.CHATTER_RULES_PATH, encoding='utf-8') as f:
+            kinds = json.load(f)['kinds']
+        
+        self.stdout.write(f"{'kind':<16}{'KB':>8}{'compiled us/KB':>17}{'per-line us/KB':>17}")
+        for kind, rules in kinds.items():
+            chatter_filter = get_chatter_filter(kind)
+            for size in sizes:
+                text = (sample * (int(size * 1024 / len(sample)) + 1))[:int(size * 1024)]
+                kb = len(text.encode('utf-8')) / 1024
+                compiled = _fastest(lambda: chatter_filter.clean(text), options['repeat'])
+                per_line = _fastest(lambda: _per_line_scan(text, rules), options['repeat'])
+                self.stdout.write(f'{kind:<16}{kb:>8.1f}{compiled / kb * 1e6:>17.1f}{per_line / kb * 1e6:>17.1f}')
+
+def _fastest(function, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def _per_line_scan(text: str, rules) -> str:
+    # Baseline: lower-case each line and test every phrase with `in`
+    kept = []
+    for line in text.split('\n'):
+        stripped = line.strip().lower()
+        if not any(phrase in stripped for phrase in rules.get('drop_lines', ())):
+            kept.append(line)
+    return '\n'.join(kept)
@@ -0,0 +1,24 @@
+from django.db.models import Model, Q, QuerySet
+
+# Generated documents are saved with user=None for anonymous visitors, so the rows
+# a browser session created are remembered in the session itself. Signed-in users
+# also own the rows saved with their user, on models that have a user field.
+
+OWNED_ROWS_SESSION_KEY = 'owned_rows'
+MAX_REMEMBERED_ROWS = 500  # Per model; the oldest ids are forgotten first
+
+def remember_row(request, instance: Model):
+    """Record that this session created `instance`"""
+    owned = request.session.get(OWNED_ROWS_SESSION_KEY, {})
+    ids = owned.setdefault(instance._meta.label_lower, [])
+    ids.append(instance.pk)
+    del ids[:-MAX_REMEMBERED_ROWS]
+    request.session[OWNED_ROWS_SESSION_KEY] = owned
+
+def owned_rows(request, queryset: QuerySet) -> QuerySet:
+    """The rows of `queryset` this session created or, when signed in, the user's"""
+    ids = request.session.get(OWNED_ROWS_SESSION_KEY, {}).get(queryset.model._meta.label_lower, [])
+    owned = Q(pk__in=ids)
+    if request.user.is_authenticated and any(field.name == 'user' for field in queryset.model._meta.fields):
+        owned |= Q(user=request.user)
+    return queryset.filter(owned)
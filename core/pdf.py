@@ -0,0 +1,133 @@
+import hashlib
+import io
+import logging
+import os
+import tempfile
+from functools import lru_cache
+from typing import Optional, Tuple
+from django.conf import settings
+from fontTools import subset as font_subset
+from fontTools import ttLib
+from fpdf import FPDF
+
+logger = logging.getLogger(__name__)
+
+CORE_FONT_FAMILY = 'Helvetica'
+UNICODE_FONT_FAMILY = 'DejaVu'
+
+# Typography the renderers normalize before layout, applied with one str.translate
+TYPOGRAPHY_TRANSLATION = str.maketrans({
+    '\u2018': "'",
+    '\u2019': "'",
+    '\u201c': '"',
+    '\u201d': '"',
+    '\u2013': '-',
+    '\u2014': '-',
+    '\u00a0': ' ',
+    '\u25aa': '\u2022 ',
+    '\u2192': '\u2022 ',
+})
+
+# Closest Latin-1 stand-ins, so text that only needs these stays on the built-in fonts
+LATIN1_TRANSLATION = str.maketrans({
+    '\u2022': '\u00b7',
+    '\u2026': '...',
+    '\u2122': '(TM)',
+    '\u20ac': 'EUR',
+})
+
+# Tried in order when PDF_UNICODE_FONT is not set
+UNICODE_FONT_CANDIDATES = [
+    ('/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf', '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'),
+    ('/usr/share/fonts/dejavu/DejaVuSans.ttf', '/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf'),
+    ('/usr/share/fonts/TTF/DejaVuSans.ttf', '/usr/share/fonts/TTF/DejaVuSans-Bold.ttf'),
+    ('/Library/Fonts/Arial Unicode.ttf', '/Library/Fonts/Arial Unicode.ttf'),
+    ('C:/Windows/Fonts/arial.ttf', 'C:/Windows/Fonts/arialbd.ttf'),
+]
+
+@lru_cache(maxsize=None)
+def unicode_font_paths() -> Optional[Tuple[str, str]]:
+    """(regular, bold) TTF paths for non-Latin-1 text, or None when no font is installed"""
+    if settings.PDF_UNICODE_FONT:
+        regular = settings.PDF_UNICODE_FONT
+        bold = settings.PDF_UNICODE_BOLD_FONT or regular
+        return (regular, bold) if os.path.exists(regular) and os.path.exists(bold) else None
+    for regular, bold in UNICODE_FONT_CANDIDATES:
+        if os.path.exists(regular):
+            return regular, bold if os.path.exists(bold) else regular
+    return None
+
+# Scripts kept in the working copy of the Unicode font: Latin, Greek, Cyrillic,
+# Armenian, Hebrew, Arabic, Vietnamese, punctuation, currency and common symbols
+UNICODE_FONT_RANGES = [
+    (0x0020, 0x024F), (0x0370, 0x04FF), (0x0530, 0x06FF), (0x1E00, 0x1EFF),
+    (0x2000, 0x206F), (0x20A0, 0x20CF), (0x2100, 0x22FF), (0x25A0, 0x27BF),
+]
+
+@lru_cache(maxsize=None)
+def _reduced_font(path: str) -> Tuple[bytes, str]:
+    """The font reduced to the ranges above, without hinting or layout tables, and a file name for it"""
+    font = ttLib.TTFont(path, recalcTimestamp=False, fontNumber=0)
+    options = font_subset.Options(notdef_outline=True, recommended_glyphs=True, hinting=False, glyph_names=False)
+    options.layout_features = []
+    options.drop_tables += ['FFTM']
+    subsetter = font_subset.Subsetter(options)
+    subsetter.populate(unicodes=[code for start, end in UNICODE_FONT_RANGES for code in range(start, end + 1)])
+    subsetter.subset(font)
+    output = io.BytesIO()
+    font.save(output)
+    data = output.getvalue()
+    return data, hashlib.sha256(data).hexdigest()[:32] + '.ttf'
+
+def reduced_font_path(path: str) -> str:
+    """
+    The font reduced once per process and written to the temp directory, named by
+    its content so processes share the file; add_font then parses a few hundred
+    glyphs instead of several thousand, and so does the subset made at output time
+    """
+    data, name = _reduced_font(path)
+    directory = os.path.join(tempfile.gettempdir(), 'resume_optimizer_fonts')
+    reduced_path = os.path.join(directory, name)
+    # Checked on every call: temp directories get cleaned
+    if not os.path.exists(reduced_path):
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(descriptor, 'wb') as f:
+            f.write(data)
+        os.replace(temporary_path, reduced_path)
+    return reduced_path
+
+def new_pdf(unicode_text: bool) -> Tuple[FPDF, str]:
+    """
+    Blank FPDF document and the font family to write with
+    Latin-1 text uses a built-in font (nothing to embed); other text gets a
+    subset of a Unicode TTF when one is installed
+    """
+    pdf = FPDF()
+    font_paths = unicode_font_paths() if unicode_text else None
+    if font_paths is None:
+        return pdf, CORE_FONT_FAMILY
+    try:
+        pdf.add_font(UNICODE_FONT_FAMILY, '', reduced_font_path(font_paths[0]))
+        pdf.add_font(UNICODE_FONT_FAMILY, 'B', reduced_font_path(font_paths[1]))
+    except Exception:
+        # A font fontTools cannot reduce (or an unwritable temp directory): embed it whole
+        logger.warning('Could not reduce %s; embedding the full font', font_paths[0], exc_info=True)
+        pdf = FPDF()
+        pdf.add_font(UNICODE_FONT_FAMILY, '', font_paths[0])
+        pdf.add_font(UNICODE_FONT_FAMILY, 'B', font_paths[1])
+    return pdf, UNICODE_FONT_FAMILY
+
+def needs_unicode_font(text: str) -> bool:
+    """True when the text has characters without a Latin-1 stand-in"""
+    if text.isascii():
+        return False
+    return any(ord(char) > 255 for char in text.translate(LATIN1_TRANSLATION))
+
+def to_latin1(text: str) -> str:
+    """Text the built-in fonts can encode"""
+    return text.translate(LATIN1_TRANSLATION).encode('latin-1', 'ignore').decode('latin-1')
+
+def pdf_bytes(pdf: FPDF) -> bytes:
+    """Rendered document, produced in memory"""
+    return bytes(pdf.output())
@@ -7,5 +7,6 @@ urlpatterns = [
     path('', views.home, name='home'),
     path('dashboard/', views.dashboard, name='dashboard'),
     path('about/', views.about, name='about'),
+    path('export/', views.export_history, name='export_history'),
 ]
 
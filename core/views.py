@@ -1,7 +1,17 @@
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from resume_analysis.models import ResumeAnalysis
+from resume_analysis.aggregates import score_distribution, skill_gap_heatmap
+from resume_tailoring.models import TailoredResume
+from resume_tailoring.document import get_document, to_pdf
+from resume_tailoring.utils import resume_artifact_key
+from cover_letter.models import CoverLetter
+from cover_letter.utils import cover_letter_pdf_key, save_cover_letter_as_pdf
+from .export import ExportFile, safe_filename, stream_zip
+from .ownership import owned_rows
 
 def home(request):
     """Home page view"""
@@ -14,8 +24,13 @@ def home(request):
 def dashboard(request):
     """Dashboard view"""
     recent_analysis = ResumeAnalysis.objects.first()
+    # Served from the precomputed aggregates rather than scanning every analysis
+    distribution = score_distribution()
     context = {
         'recent_analysis': recent_analysis,
+        'total_analyses': distribution['total'],
+        'score_distribution': distribution,
+        'skill_gap_heatmap': skill_gap_heatmap(weeks=8, limit=8),
     }
     return render(request, 'core/dashboard.html', context)
 
@@ -27,4 +42,48 @@ def about(request):
     }
     return render(request, 'core/about.html', context)
 
+EXPORT_KINDS = ('resumes', 'cover_letters')
 
+def _resume_export_files(request):
+    # Same keys as the single downloads, so anything downloaded before is not rendered again
+    for resume in owned_rows(request, TailoredResume.objects).only('id', 'tailored_content', 'template_used', 'created_at').order_by('created_at'):
+        content = resume.tailored_content
+        created = timezone.localtime(resume.created_at).replace(tzinfo=None)
+        yield ExportFile(
+            f"resumes/{created:%Y-%m-%d}_{resume.template_used}_{resume.id}.pdf",
+            resume_artifact_key(content, 'pdf', resume.template_used),
+            lambda content=content: to_pdf(get_document(content)),
+            created,
+        )
+
+def _cover_letter_export_files(request):
+    for letter in owned_rows(request, CoverLetter.objects).only('id', 'company_name', 'cover_letter_content', 'created_at').order_by('created_at'):
+        content = letter.cover_letter_content
+        created = timezone.localtime(letter.created_at).replace(tzinfo=None)
+        yield ExportFile(
+            f"cover_letters/{created:%Y-%m-%d}_{safe_filename(letter.company_name) or 'company'}_{letter.id}.pdf",
+            cover_letter_pdf_key(content),
+            lambda content=content: save_cover_letter_as_pdf(content),
+            created,
+        )
+
+def export_history(request):
+    """
+    The caller's tailored resumes and cover letters as PDFs in one ZIP download
+    ?include=resumes or ?include=cover_letters limits the archive to one kind
+    """
+    include = request.GET.getlist('include') or EXPORT_KINDS
+    if not set(include) <= set(EXPORT_KINDS):
+        messages.error(request, 'Invalid export requested.')
+        return redirect('core:dashboard')
+    
+    # Evaluated here, while the request's database connection is open; rendering happens while streaming
+    files = []
+    if 'resumes' in include:
+        files.extend(_resume_export_files(request))
+    if 'cover_letters' in include:
+        files.extend(_cover_letter_export_files(request))
+    
+    response = StreamingHttpResponse(stream_zip(files), content_type='application/zip')
+    response['Content-Disposition'] = f'attachment; filename="resume_ai_export_{timezone.localdate():%Y-%m-%d}.zip"'
+    return response
@@ -1,9 +1,16 @@
 import json
+import logging
 from datetime import date
 import google.generativeai as genai
 from django.conf import settings
 from typing import Dict, List
 from fpdf import FPDF
+from core.artifact_cache import artifact_key
+from core.chatter import strip_chatter
+from core.instrumentation import span
+from core.pdf import pdf_bytes
+
+logger = logging.getLogger(__name__)
 
 # Configure Gemini AI
 genai.configure(api_key=settings.GOOGLE_API_KEY)
@@ -79,11 +86,14 @@ def generate_cover_letter_with_ai(
     """
     
     try:
-        response = model.generate_content(prompt)
-        return response.text
+        with span(logger, 'cover_letter.generate', writing_style=writing_style, prompt_chars=len(prompt)):
+            response = model.generate_content(prompt)
+        # Drop "Here's your cover letter" and similar lines; keep the raw text if nothing is left
+        return strip_chatter(response.text, 'cover_letter').strip() or response.text
         
     except Exception as e:
         # Fallback to basic cover letter if AI fails
+        logger.warning('Cover letter generation failed, using the fallback letter: %s', type(e).__name__)
         return generate_fallback_cover_letter(
             personal_info, company_info, current_date, writing_style
         )
@@ -126,7 +136,22 @@ Sincerely,
     
     return cover_letter.strip()
 
-def save_cover_letter_as_pdf(cover_letter_content, filename):
+# Part of the download cache key; bump when a change here alters the PDF output
+COVER_LETTER_PDF_RENDERER_VERSION = '1'
+
+def cover_letter_pdf_key(content: str) -> str:
+    """Artifact cache key of a cover letter's PDF"""
+    return artifact_key('cover_letter', content, 'pdf', COVER_LETTER_PDF_RENDERER_VERSION)
+
+def _pdf_output(pdf, filename):
+    """PDF bytes, written to `filename` as well unless it is None"""
+    if filename is None:
+        return pdf_bytes(pdf)
+    pdf.output(filename)
+    with open(filename, 'rb') as f:
+        return f.read()
+
+def save_cover_letter_as_pdf(cover_letter_content, filename=None):
     """Save cover letter content as PDF with proper formatting - Fixed horizontal space issue"""
     try:
         pdf = FPDF()
@@ -199,13 +224,12 @@ def save_cover_letter_as_pdf(cover_letter_content, filename):
                 # Empty line - add some space
                 pdf.ln(4)
         
-        # Save to file and return bytes
-        pdf.output(filename)
-        with open(filename, 'rb') as f:
-            return f.read()
+        # Save to file (if given) and return bytes
+        return _pdf_output(pdf, filename)
             
     except Exception as e:
         # Enhanced fallback with better error handling
+        logger.warning('Cover letter PDF layout failed, using the plain layout: %s', e)
         try:
             pdf = FPDF()
             pdf.add_page()
@@ -232,12 +256,11 @@ def save_cover_letter_as_pdf(cover_letter_content, filename):
                 else:
                     pdf.ln(4)
             
-            pdf.output(filename)
-            with open(filename, 'rb') as f:
-                return f.read()
+            return _pdf_output(pdf, filename)
                 
         except Exception as fallback_error:
             # Last resort: create a simple PDF with error message
+            logger.error('Plain cover letter PDF layout failed: %s', fallback_error)
             pdf = FPDF()
             pdf.add_page()
             pdf.set_margins(left=20, top=20, right=20)
@@ -245,9 +268,7 @@ def save_cover_letter_as_pdf(cover_letter_content, filename):
             pdf.multi_cell(0, 10, "Error generating PDF. Please try downloading as text format.")
             pdf.multi_cell(0, 10, f"Original content length: {len(cover_letter_content)} characters")
             
-            pdf.output(filename)
-            with open(filename, 'rb') as f:
-                return f.read()
+            return _pdf_output(pdf, filename)
 
 def format_cover_letter_content(content: str, font_size: str = "medium", line_spacing: str = "1.5") -> str:
     """Format cover letter content with specified styling"""
@@ -7,8 +7,11 @@ from django.http import HttpResponse
 from django.conf import settings
 from .forms import CoverLetterForm, CoverLetterCustomizationForm
 from .models import CoverLetter
-from .utils import generate_cover_letter_with_ai, save_cover_letter_as_pdf
+from .utils import generate_cover_letter_with_ai, save_cover_letter_as_pdf, cover_letter_pdf_key
 from resume_analysis.models import ResumeAnalysis
+from core.artifact_cache import artifact_key, artifact_response, discard_artifacts
+from core.export import safe_filename
+from core.ownership import OWNED_ROWS_SESSION_KEY, remember_row
 from django.utils import timezone
 from datetime import timedelta
 import uuid
@@ -145,11 +148,14 @@ def generate_cover_letter(request):
                 )
                 
                 # FORCE COMPLETE SESSION CLEARING after generation
+                owned = request.session.get(OWNED_ROWS_SESSION_KEY, {})  # Kept: the export needs it
                 keys_to_clear = ['cover_letter_data', 'cover_letter_session_id', 'cover_letter_content', 'cover_letter_form_data']
                 for key in keys_to_clear:
                     request.session.pop(key, None)
                 request.session.flush()  # Complete session flush
                 request.session.clear()  # Additional clearing
+                request.session[OWNED_ROWS_SESSION_KEY] = owned
+                remember_row(request, cover_letter)
                 request.session.modified = True
                 
                 messages.success(request, 'Cover letter generated successfully!')
@@ -264,34 +270,31 @@ def download_cover_letter(request, letter_id, format_type):
         messages.error(request, 'Cover letter not found.')
         return redirect('cover_letter:home')
     
-    # Clean company name for filename
-    import re
-    safe_company_name = re.sub(r'[^\w\s-]', '', cover_letter.company_name)
-    safe_company_name = re.sub(r'[-\s]+', '_', safe_company_name)
+    # Clean company name for filename (named as in the history export)
+    safe_company_name = safe_filename(cover_letter.company_name) or 'company'
     
+    content = cover_letter.cover_letter_content
     if format_type == 'txt':
-        response = HttpResponse(cover_letter.cover_letter_content, content_type='text/plain')
-        response['Content-Disposition'] = f'attachment; filename="cover_letter_{safe_company_name}.txt"'
-        return response
+        # Cheaper to encode than to read back, so only the ETag is used
+        return artifact_response(
+            request,
+            artifact_key('cover_letter', content, 'txt', ''),
+            lambda: content.encode('utf-8'),
+            'text/plain',
+            f'cover_letter_{safe_company_name}.txt',
+            cache=False,
+        )
     
     elif format_type == 'pdf':
         try:
-            import tempfile
-            import os
-            
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-                filename = tmp_file.name
-            
-            pdf_content = save_cover_letter_as_pdf(cover_letter.cover_letter_content, filename)
-            
-            # Clean up temp file
-            if os.path.exists(filename):
-                os.unlink(filename)
-                
-            response = HttpResponse(pdf_content, content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="cover_letter_{safe_company_name}.pdf"'
-            return response
+            # Rendered in memory on the first download, then read from the artifact cache
+            return artifact_response(
+                request,
+                cover_letter_pdf_key(content),
+                lambda: save_cover_letter_as_pdf(content),
+                'application/pdf',
+                f'cover_letter_{safe_company_name}.pdf',
+            )
         except Exception as e:
             messages.error(request, f'Error generating PDF: {str(e)}')
             return redirect('cover_letter:preview', letter_id=letter_id)
@@ -319,7 +322,11 @@ def edit_cover_letter(request, letter_id):
     if request.method == 'POST':
         form = CoverLetterCustomizationForm(request.POST)
         if form.is_valid():
-            cover_letter.cover_letter_content = form.cleaned_data['custom_content']
+            new_content = form.cleaned_data['custom_content']
+            if new_content != cover_letter.cover_letter_content:
+                # The old text's PDF can no longer be requested
+                discard_artifacts(cover_letter_pdf_key(cover_letter.cover_letter_content))
+            cover_letter.cover_letter_content = new_content
             cover_letter.save()
             messages.success(request, 'Cover letter updated successfully!')
             return redirect('cover_letter:preview', letter_id=cover_letter.id)
@@ -1,7 +1,12 @@
 import json
+import logging
 import google.generativeai as genai
 from django.conf import settings
 from typing import Dict, List
+from core.chatter import strip_chatter
+from core.instrumentation import span
+
+logger = logging.getLogger(__name__)
 
 # Configure Gemini AI
 genai.configure(api_key=settings.GOOGLE_API_KEY)
@@ -53,8 +58,9 @@ def generate_interview_tips(
     """
     
     try:
-        response = model.generate_content(prompt)
-        response_text = response.text.strip()
+        with span(logger, 'interview.tips', level=level):
+            response = model.generate_content(prompt)
+        response_text = strip_chatter(response.text.strip(), 'interview_tips')
         
         # Clean the response text
         response_text = response_text.replace('```json', '').replace('```', '').replace('[', '').replace(']', '')
@@ -71,9 +77,10 @@ def generate_interview_tips(
         
         # Return exactly 5 tips
         return tips[:5] if tips else generate_fallback_tips(level, experience_level, industry)
-        
+    
     except Exception as e:
         # Fallback tips if AI fails
+        logger.warning('Tip generation failed, using fallback tips: %s', type(e).__name__)
         return generate_fallback_tips(level, experience_level, industry)
 
 def generate_fallback_tips(level: int, experience_level: str, industry: str) -> List[str]:
@@ -132,7 +139,8 @@ def generate_interview_answer(
     """
     
     try:
-        response = model.generate_content(prompt)
+        with span(logger, 'interview.answer', question_chars=len(question)):
+            response = model.generate_content(prompt)
         answer = response.text.strip()
         
         # Ensure answer is concise
@@ -141,9 +149,10 @@ def generate_interview_answer(
             answer = '. '.join(sentences[:3]) + '.'
         
         return answer
-        
+    
     except Exception as e:
         # Fallback answer if AI fails
+        logger.warning('Answer generation failed, using the fallback answer: %s', type(e).__name__)
         return generate_fallback_answer(question)
 
 def generate_fallback_answer(question: str) -> str:
@@ -354,39 +354,53 @@ def unlock_next_level(request):
     
     return redirect('interview_prep:home')
 
+# Part of the download cache key; bump when a change here alters the PDF output
+TIPS_PDF_RENDERER_VERSION = '1'
+
+def _render_tips_pdf(tips):
+    """Combined tips PDF, built in memory; [(level, content), ...]"""
+    from core.pdf import CORE_FONT_FAMILY, TYPOGRAPHY_TRANSLATION, needs_unicode_font, new_pdf, pdf_bytes, to_latin1
+    
+    tips = [(level, content.translate(TYPOGRAPHY_TRANSLATION)) for level, content in tips]
+    pdf, family = new_pdf(any(needs_unicode_font(content) for _, content in tips))
+    if family == CORE_FONT_FAMILY:
+        tips = [(level, to_latin1(content)) for level, content in tips]
+    
+    pdf.add_page()
+    pdf.set_font(family, 'B', 16)
+    pdf.cell(0, 10, "Interview Preparation Tips", ln=True, align='C')
+    pdf.ln(10)
+    
+    for level, content in tips:
+        pdf.set_font(family, 'B', 12)
+        pdf.cell(0, 10, f"Level {level} Tip", ln=True)
+        pdf.set_font(family, size=12)
+        pdf.multi_cell(0, 8, content)
+        pdf.ln(5)
+    
+    return pdf_bytes(pdf)
+
 def download_all_tips(request):
     """Download all completed tips as a combined document"""
     try:
-        from fpdf import FPDF
+        from core.artifact_cache import artifact_key, artifact_response
         
         # Get all completed tips
-        completed_tips = InterviewTip.objects.filter(user=None, is_completed=True).order_by('level')
+        tips = list(InterviewTip.objects.filter(user=None, is_completed=True).order_by('level').values_list('level', 'tip_content'))
         
-        if not completed_tips:
+        if not tips:
             messages.warning(request, 'No completed tips to download.')
             return redirect('interview_prep:home')
         
-        # Create PDF
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_font("Arial", 'B', 16)
-        pdf.cell(0, 10, "Interview Preparation Tips", ln=True, align='C')
-        pdf.ln(10)
-        
-        pdf.set_font("Arial", size=12)
-        
-        for tip in completed_tips:
-            pdf.set_font("Arial", 'B', 12)
-            pdf.cell(0, 10, f"Level {tip.level} Tip", ln=True)
-            pdf.set_font("Arial", size=12)
-            pdf.multi_cell(0, 8, tip.tip_content)
-            pdf.ln(5)
-        
-        # Return PDF response
-        from django.http import HttpResponse
-        response = HttpResponse(pdf.output(dest='S').encode('latin-1'), content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename="interview_tips.pdf"'
-        return response
+        # Completing another tip changes the content and so the cache key
+        content = json.dumps(tips)
+        return artifact_response(
+            request,
+            artifact_key('interview_tips', content, 'pdf', TIPS_PDF_RENDERER_VERSION),
+            lambda: _render_tips_pdf(tips),
+            'application/pdf',
+            'interview_tips.pdf',
+        )
         
     except Exception as e:
         messages.error(request, f'Error generating PDF: {str(e)}')
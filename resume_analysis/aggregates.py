@@ -0,0 +1,148 @@
+from collections import Counter, defaultdict
+from datetime import timedelta
+from typing import Dict, Iterable, List
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from .courses import get_course_catalog
+from .models import ResumeAnalysis, ScoreBandAggregate, SkillGapAggregate
+from .terms import normalize_skill
+
+# Every analysis is counted under its own week and category and under these rollups,
+# so any (period, category) view is a single indexed lookup
+ALL = 'all'
+SCORE_BANDS = 11
+
+def week_period(moment) -> str:
+    """ISO week of a datetime, e.g. '2024-W35'"""
+    year, week, _ = timezone.localtime(moment).isocalendar()
+    return f'{year}-W{week:02d}'
+
+def recent_week_periods(weeks: int) -> List[str]:
+    """The last `weeks` ISO weeks, oldest first"""
+    now = timezone.now()
+    return [week_period(now - timedelta(weeks=offset)) for offset in range(weeks - 1, -1, -1)]
+
+def _analysis_increments(created_at, job_description: str, match_score: int, missing_skills, skill_counts, band_counts, labels):
+    category = get_course_catalog().category_for_text(job_description)
+    band = min(max(int(match_score or 0), 0), 100) // 10
+    skills = set()
+    for skill in missing_skills or []:
+        if not isinstance(skill, str) or not skill.strip():
+            continue
+        key = normalize_skill(skill)[:200]
+        if key:
+            skills.add(key)
+            labels.setdefault(key, skill.strip()[:200])
+    
+    for period in (week_period(created_at), ALL):
+        for jd_category in (category, ALL):
+            band_counts[(period, jd_category, band)] += 1
+            for skill in skills:
+                skill_counts[(period, jd_category, skill)] += 1
+
+def _apply_increments(model, key_field: str, counts: Counter, defaults=None):
+    """Add counts to aggregate rows, creating missing rows first so concurrent writers never lose an increment"""
+    if not counts:
+        return
+    model.objects.bulk_create(
+        [
+            model(period=period, jd_category=jd_category, count=0, **{key_field: key}, **(defaults(key) if defaults else {}))
+            for period, jd_category, key in counts
+        ],
+        ignore_conflicts=True
+    )
+    # One UPDATE per (period, category, increment) instead of one per row
+    groups = defaultdict(list)
+    for (period, jd_category, key), increment in counts.items():
+        groups[(period, jd_category, increment)].append(key)
+    for (period, jd_category, increment), keys in groups.items():
+        model.objects.filter(period=period, jd_category=jd_category, **{f'{key_field}__in': keys}).update(
+            count=F('count') + increment
+        )
+
+def record_analyses(analyses: Iterable[ResumeAnalysis]):
+    """Fold newly created analyses into the aggregate tables; fallback placeholders are skipped"""
+    skill_counts, band_counts, labels = Counter(), Counter(), {}
+    for analysis in analyses:
+        if analysis.is_fallback:
+            continue
+        _analysis_increments(
+            analysis.created_at, analysis.job_description, analysis.match_score,
+            analysis.missing_skills, skill_counts, band_counts, labels
+        )
+    with transaction.atomic():
+        _apply_increments(SkillGapAggregate, 'skill', skill_counts, lambda key: {'label': labels[key]})
+        _apply_increments(ScoreBandAggregate, 'band', band_counts)
+
+def rebuild_aggregates(chunk_size: int = 2000) -> int:
+    """Recompute every aggregate from scratch; returns the number of analyses counted"""
+    skill_counts, band_counts, labels = Counter(), Counter(), {}
+    total = 0
+    rows = ResumeAnalysis.objects.filter(is_fallback=False).values_list(
+        'created_at', 'job_description', 'match_score', 'missing_skills'
+    ).iterator(chunk_size=chunk_size)
+    for created_at, job_description, match_score, missing_skills in rows:
+        _analysis_increments(created_at, job_description, match_score, missing_skills, skill_counts, band_counts, labels)
+        total += 1
+    
+    with transaction.atomic():
+        SkillGapAggregate.objects.all().delete()
+        ScoreBandAggregate.objects.all().delete()
+        SkillGapAggregate.objects.bulk_create(
+            [
+                SkillGapAggregate(period=period, jd_category=jd_category, skill=skill, label=labels[skill], count=count)
+                for (period, jd_category, skill), count in skill_counts.items()
+            ],
+            batch_size=chunk_size
+        )
+        ScoreBandAggregate.objects.bulk_create(
+            [
+                ScoreBandAggregate(period=period, jd_category=jd_category, band=band, count=count)
+                for (period, jd_category, band), count in band_counts.items()
+            ],
+            batch_size=chunk_size
+        )
+    return total
+
+def top_missing_skills(period: str = ALL, jd_category: str = ALL, limit: int = 10) -> List[Dict]:
+    """Most frequently missing skills for one (period, category) cell"""
+    rows = SkillGapAggregate.objects.filter(period=period, jd_category=jd_category).order_by('-count', 'skill')[:limit]
+    return [{'skill': row.skill, 'label': row.label, 'count': row.count} for row in rows]
+
+def score_distribution(period: str = ALL, jd_category: str = ALL) -> Dict:
+    """Analyses per 10-point score band, with the total and an approximate mean"""
+    counts = [0] * SCORE_BANDS
+    for band, count in ScoreBandAggregate.objects.filter(period=period, jd_category=jd_category).values_list('band', 'count'):
+        counts[band] = count
+    total = sum(counts)
+    # Band midpoints; the top band only holds scores of exactly 100
+    midpoints = [band * 10 + 4.5 for band in range(SCORE_BANDS - 1)] + [100]
+    mean = round(sum(c * m for c, m in zip(counts, midpoints)) / total, 1) if total else None
+    return {
+        'bands': [{'min_score': band * 10, 'count': count} for band, count in enumerate(counts)],
+        'total': total,
+        'approximate_mean': mean,
+    }
+
+def skill_gap_heatmap(jd_category: str = ALL, weeks: int = 8, limit: int = 10) -> Dict:
+    """
+    Weekly counts for the all-time top missing skills of a category
+    Bounded by weeks x limit cells, whatever the number of analyses
+    """
+    periods = recent_week_periods(weeks)
+    skills = top_missing_skills(ALL, jd_category, limit)
+    cells = {
+        (period, skill): count
+        for period, skill, count in SkillGapAggregate.objects.filter(
+            period__in=periods, jd_category=jd_category, skill__in=[s['skill'] for s in skills]
+        ).values_list('period', 'skill', 'count')
+    }
+    return {
+        'periods': periods,
+        'max_count': max(cells.values(), default=0),
+        'skills': [
+            {**skill, 'weekly_counts': [cells.get((period, skill['skill']), 0) for period in periods]}
+            for skill in skills
+        ],
+    }
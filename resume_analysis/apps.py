@@ -5,3 +5,5 @@ class ResumeAnalysisConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'resume_analysis'
 
+    def ready(self):
+        from . import signals  # noqa: F401
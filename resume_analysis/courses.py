@@ -0,0 +1,95 @@
+import json
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from django.conf import settings
+from .terms import normalize_skill, normalize_terms
+
+class CourseCatalog:
+    """
+    Skill -> family -> category -> course templates, loaded from JSON
+    Every skill alias is indexed under its normalized skill id, so a lookup is a
+    normalization plus one or two dictionary hits
+    """
+    
+    def __init__(self, data: Dict):
+        self.categories = {name: category['templates'] for name, category in data['categories'].items()}
+        self.families = data['families']
+        self.skill_index = {}
+        for family_id, family in self.families.items():
+            for skill in [family_id, family['label']] + family.get('skills', []):
+                self.skill_index.setdefault(normalize_skill(skill), family_id)
+    
+    def find_family(self, skill: str) -> Optional[str]:
+        """Family id for a skill name: exact alias first, then its most specific known term"""
+        family_id = self.skill_index.get(normalize_skill(skill))
+        if family_id:
+            return family_id
+        for term in normalize_terms(skill):
+            family_id = self.skill_index.get(term)
+            if family_id:
+                return family_id
+        return None
+    
+    def category_for_text(self, text: str) -> str:
+        """Category most of the known skills in a text belong to, e.g. a job description's field"""
+        counts = Counter()
+        for term in normalize_terms(text):
+            family_id = self.skill_index.get(term)
+            if family_id:
+                counts[self.families[family_id]['category']] += 1
+        return counts.most_common(1)[0][0] if counts else 'general'
+    
+    def course_for(self, skill: str) -> Tuple[Optional[str], str]:
+        """(family id, course recommendation sentence) for one missing skill"""
+        family_id = self.find_family(skill)
+        if family_id is None:
+            return None, self.categories['general'][0].format(skill=skill, label=skill)
+        family = self.families[family_id]
+        templates = self.categories.get(family['category']) or self.categories['general']
+        # Alternate templates across families so neighbouring suggestions don't read identically
+        template = templates[sum(map(ord, family_id)) % len(templates)]
+        return family_id, template.format(skill=skill, label=family['label'])
+
+@lru_cache(maxsize=None)
+def get_course_catalog() -> CourseCatalog:
+    """Course catalog from COURSE_CATALOG_PATH, loaded once per process"""
+    with open(settings.COURSE_CATALOG_PATH, encoding='utf-8') as f:
+        return CourseCatalog(json.load(f))
+
+def rank_skills_by_importance(skills: List[str], job_description: str) -> List[str]:
+    """
+    Order skills by how prominent they are in the job description: mention count
+    first, then earliest mention; skills the JD never mentions keep their order
+    """
+    if not job_description:
+        return list(skills)
+    jd_terms = normalize_terms(job_description)
+    counts = Counter(jd_terms)
+    first_position = {}
+    for position, term in enumerate(jd_terms):
+        first_position.setdefault(term, position)
+    
+    def importance(item):
+        order, skill = item
+        terms = normalize_terms(skill) or [skill.lower()]
+        mentions = min(counts.get(term, 0) for term in terms)
+        position = max(first_position.get(term, len(jd_terms)) for term in terms)
+        return (-mentions, position if mentions else len(jd_terms), order)
+    
+    return [skill for _, skill in sorted(enumerate(skills), key=importance)]
+
+def recommend_courses(missing_skills: List[str], job_description: str = '', limit: int = 2) -> List[str]:
+    """Course suggestions for the most important missing skills, one per skill family"""
+    catalog = get_course_catalog()
+    recommendations = []
+    seen_families = set()
+    for skill in rank_skills_by_importance([s for s in missing_skills if isinstance(s, str) and s.strip()], job_description):
+        family_id, recommendation = catalog.course_for(skill)
+        if family_id is not None and family_id in seen_families:
+            continue
+        seen_families.add(family_id)
+        recommendations.append(recommendation)
+        if len(recommendations) >= limit:
+            break
+    return recommendations
@@ -0,0 +1,164 @@
+import hashlib
+import random
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Container, Iterator, List, Optional, Tuple
+from django.utils import timezone
+from .models import JobPosting
+from .terms import tokenize
+
+# 128 permutations split into 32 bands of 4 rows. A pair with Jaccard similarity s
+# shares a band with probability 1 - (1 - s^4)^32: about 99.98% at 0.7 and all but
+# certain at the 0.8 threshold (16 x 8 would find only ~61% of 0.7 and ~95% of 0.8
+# pairs). Candidates are then verified against NEAR_DUPLICATE_THRESHOLD
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 32
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+SHINGLE_SIZE = 5
+NEAR_DUPLICATE_THRESHOLD = 0.8
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+# Fixed seed: signatures are stored in the database and must stay comparable
+_random = random.Random(20240824)
+PERMUTATIONS = [
+    (_random.randrange(1, MERSENNE_PRIME), _random.randrange(0, MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+def shingle_hashes(text: str) -> set:
+    """64-bit hashes of the word 5-grams of a text (case and spacing insensitive)"""
+    tokens = tokenize(text)
+    if len(tokens) < SHINGLE_SIZE:
+        shingles = {' '.join(tokens)} if tokens else set()
+    else:
+        shingles = {' '.join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+    return {
+        int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+        for shingle in shingles
+    }
+
+def compute_minhash(text: str) -> List[int]:
+    """MinHash signature of a text's shingle set"""
+    hashes = shingle_hashes(text)
+    if not hashes:
+        return []
+    return [
+        min(((a * value + b) % MERSENNE_PRIME) & MAX_HASH for value in hashes)
+        for a, b in PERMUTATIONS
+    ]
+
+def estimate_similarity(first: List[int], second: List[int]) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures"""
+    if not first or len(first) != len(second):
+        return 0.0
+    return sum(1 for x, y in zip(first, second) if x == y) / len(first)
+
+# The in-process indexes catch up by creation time rather than by id: ids are
+# handed out at insert but rows become visible at commit, so a lower id can
+# appear after a higher one. Every catch-up re-reads this trailing window
+# (longer than any insert transaction) and skips the postings already indexed.
+INDEX_CATCH_UP_OVERLAP = timedelta(minutes=5)
+INDEX_CATCH_UP_BATCH_SIZE = 500
+
+def unindexed_postings(indexed_ids: Container[int], synced_until: Optional[datetime], fields: Tuple[str, ...]) -> Tuple[Iterator[JobPosting], datetime]:
+    """
+    Postings an index synced up to synced_until (None: never synced) may be missing,
+    and the time the index is synced up to once it has added them
+    """
+    started = timezone.now()
+    candidates = JobPosting.objects.all()
+    if synced_until is not None:
+        candidates = candidates.filter(created_at__gte=synced_until - INDEX_CATCH_UP_OVERLAP)
+    missing_ids = sorted(
+        posting_id for posting_id in candidates.values_list('id', flat=True).iterator(chunk_size=5000)
+        if posting_id not in indexed_ids
+    )
+    
+    def postings():
+        for start in range(0, len(missing_ids), INDEX_CATCH_UP_BATCH_SIZE):
+            batch = missing_ids[start:start + INDEX_CATCH_UP_BATCH_SIZE]
+            yield from JobPosting.objects.filter(id__in=batch).order_by('id').only(*fields)
+    
+    return postings(), started
+
+class MinHashLSHIndex:
+    """Banded locality-sensitive hashing over MinHash signatures"""
+    
+    def __init__(self):
+        self.buckets = defaultdict(list)  # (band number, band values) -> [posting_id]
+        self.signatures = {}
+        self.synced_until = None  # Creation time postings are loaded up to (see unindexed_postings)
+        self.lock = threading.Lock()
+    
+    def _bands(self, signature: List[int]):
+        for band in range(LSH_BANDS):
+            yield band, tuple(signature[band * LSH_ROWS:(band + 1) * LSH_ROWS])
+    
+    def add(self, posting_id: int, signature: List[int]):
+        if posting_id in self.signatures or len(signature) != NUM_PERMUTATIONS:
+            return
+        self.signatures[posting_id] = signature
+        for band_key in self._bands(signature):
+            self.buckets[band_key].append(posting_id)
+    
+    def query(self, signature: List[int], threshold: float = NEAR_DUPLICATE_THRESHOLD) -> List[Tuple[int, float]]:
+        """Postings whose estimated similarity is at least threshold, most similar first"""
+        if len(signature) != NUM_PERMUTATIONS:
+            return []
+        candidates = set()
+        for band_key in self._bands(signature):
+            candidates.update(self.buckets.get(band_key, ()))
+        matches = []
+        for posting_id in candidates:
+            similarity = estimate_similarity(signature, self.signatures[posting_id])
+            if similarity >= threshold:
+                matches.append((posting_id, similarity))
+        matches.sort(key=lambda match: (-match[1], match[0]))
+        return matches
+
+# Process-wide index, built lazily and caught up with new rows on every lookup
+_lsh_index = None
+_lsh_index_lock = threading.Lock()
+
+def get_lsh_index() -> MinHashLSHIndex:
+    """Return the LSH index, loading postings created since the last call"""
+    global _lsh_index
+    with _lsh_index_lock:
+        if _lsh_index is None:
+            _lsh_index = MinHashLSHIndex()
+        index = _lsh_index
+    
+    with index.lock:
+        missing_signatures = []
+        new_postings, synced_until = unindexed_postings(index.signatures, index.synced_until, ('id', 'description', 'minhash'))
+        for posting in new_postings:
+            if not posting.minhash:
+                # Rows imported before signatures existed are signed on first load
+                posting.minhash = compute_minhash(posting.description)
+                missing_signatures.append(posting)
+            index.add(posting.id, posting.minhash)
+        index.synced_until = synced_until
+        if missing_signatures:
+            JobPosting.objects.bulk_update(missing_signatures, ['minhash'], batch_size=500)
+    return index
+
+def find_near_duplicate(job_description: str, exclude_id: int = None) -> Optional[JobPosting]:
+    """
+    The stored job posting most similar to job_description among the near-duplicates
+    that already have extracted keywords, if any
+    """
+    matches = [
+        posting_id for posting_id, _ in get_lsh_index().query(compute_minhash(job_description))
+        if posting_id != exclude_id
+    ]
+    if not matches:
+        return None
+    postings = JobPosting.objects.filter(id__in=matches, keywords__isnull=False).only('id', 'keywords').in_bulk()
+    for posting_id in matches:
+        posting = postings.get(posting_id)
+        if posting is not None and posting.keywords:
+            return posting
+    return None
@@ -0,0 +1,130 @@
+import difflib
+from typing import Dict, List, Optional, Tuple
+from django.conf import settings
+from .dedup import compute_minhash, estimate_similarity
+from .matching import job_description_hash
+from .models import ResumeAnalysis
+from .terms import normalize_skill, normalize_terms
+from .utils import analyze_resume_with_ai, build_recommendations, split_into_sections
+
+# Share of the match score attributed to skills alignment (see calculate_match_score)
+SKILLS_SCORE_WEIGHT = 40
+
+def _sections_by_heading(text: str) -> Dict[str, str]:
+    sections = {}
+    for section in split_into_sections(text):
+        heading = section.strip().split('\n', 1)[0].strip().rstrip(':').lower()
+        key = heading
+        suffix = 2
+        while key in sections:
+            key = f'{heading} ({suffix})'
+            suffix += 1
+        sections[key] = section
+    return sections
+
+def diff_sections(old_text: str, new_text: str) -> Tuple[List[str], float]:
+    """
+    Compare two resume versions section by section (paired on their headings)
+    Returns the changed section headings and the share of text that changed
+    """
+    old_sections = _sections_by_heading(old_text)
+    new_sections = _sections_by_heading(new_text)
+    
+    changed = []
+    changed_chars = 0.0
+    for heading in list(new_sections) + [h for h in old_sections if h not in new_sections]:
+        old_section = old_sections.get(heading, '')
+        new_section = new_sections.get(heading, '')
+        if old_section == new_section:
+            continue
+        # Line-level matching keeps the diff linear-ish on long sections
+        if old_section and new_section:
+            ratio = difflib.SequenceMatcher(None, old_section.splitlines(), new_section.splitlines(), autojunk=False).ratio()
+        else:
+            ratio = 0.0
+        changed_chars += (1 - ratio) * max(len(old_section), len(new_section))
+        changed.append(heading)
+    
+    return changed, min(1.0, changed_chars / max(len(old_text), len(new_text), 1))
+
+def _skill_present(skill: str, terms: set) -> bool:
+    skill_terms = normalize_terms(skill)
+    return bool(skill_terms) and all(term in terms for term in skill_terms)
+
+def _same_job_description(previous: ResumeAnalysis, job_description: str) -> bool:
+    if job_description_hash(previous.job_description) == job_description_hash(job_description):
+        return True
+    similarity = estimate_similarity(compute_minhash(previous.job_description), compute_minhash(job_description))
+    return similarity >= settings.RESUME_INCREMENTAL_JD_SIMILARITY
+
+def _rescore_locally(previous: ResumeAnalysis, resume_text: str, job_description: str) -> Tuple[Dict, List[str], List[str]]:
+    """
+    Update the previous result for a small resume edit without calling the AI
+    A keyword only moves when the edit itself added or removed it; skills the
+    model inferred without literal mentions keep their previous classification
+    """
+    old_terms = set(normalize_terms(previous.resume_text))
+    new_terms = set(normalize_terms(resume_text))
+    
+    removed = [k for k in previous.keywords_found if _skill_present(k, old_terms) and not _skill_present(k, new_terms)]
+    added = [s for s in previous.missing_skills if not _skill_present(s, old_terms) and _skill_present(s, new_terms)]
+    keywords_found = [k for k in previous.keywords_found if k not in removed] + added
+    missing_skills = removed + [s for s in previous.missing_skills if s not in added]
+    
+    total = len(keywords_found) + len(missing_skills) or 1
+    match_score = previous.match_score + round(SKILLS_SCORE_WEIGHT * (len(added) - len(removed)) / total)
+    
+    result = {
+        'match_score': max(0, min(100, match_score)),
+        'keywords_found': keywords_found,
+        'missing_skills': missing_skills,
+        'analysis': previous.analysis_result,
+        'recommendations': build_recommendations(missing_skills, job_description),
+    }
+    return result, added, removed
+
+def _change_since_full(previous: ResumeAnalysis, change_ratio: float) -> float:
+    """Share of the resume changed since the last full analysis, summed over the incremental steps"""
+    if previous.delta.get('mode') != 'incremental':
+        return change_ratio
+    return previous.delta.get('change_since_full', previous.delta.get('change_ratio', 0.0)) + change_ratio
+
+def reanalyze_resume(resume_text: str, job_description: str, previous: Optional[ResumeAnalysis]) -> Dict:
+    """
+    Analyze a resume, reusing the user's previous analysis for small edits
+    While the edits since the last full analysis add up to less than the change
+    threshold (and the job description is the same) the result is rescored
+    locally; otherwise the full AI analysis runs. Either way a 'delta' entry
+    describes what changed since the previous analysis
+    """
+    # A placeholder left by a failed AI call is nothing to build on
+    if previous is None or previous.is_fallback:
+        return analyze_resume_with_ai(resume_text, job_description)
+    
+    changed_sections, change_ratio = diff_sections(previous.resume_text, resume_text)
+    # Each step is diffed against the one before, so a run of small edits is summed
+    # up to force a full analysis before the local rescoring drifts too far
+    change_since_full = _change_since_full(previous, change_ratio)
+    
+    if change_since_full <= settings.RESUME_INCREMENTAL_CHANGE_THRESHOLD and _same_job_description(previous, job_description):
+        result, added, removed = _rescore_locally(previous, resume_text, job_description)
+        mode = 'incremental'
+    else:
+        result = analyze_resume_with_ai(resume_text, job_description)
+        mode = 'full'
+        previous_ids = {normalize_skill(k) for k in previous.keywords_found}
+        current_ids = {normalize_skill(k) for k in result.get('keywords_found', [])}
+        added = [k for k in result.get('keywords_found', []) if normalize_skill(k) not in previous_ids]
+        removed = [k for k in previous.keywords_found if normalize_skill(k) not in current_ids]
+    
+    result['delta'] = {
+        'mode': mode,
+        'previous_analysis_id': previous.id,
+        'change_ratio': round(change_ratio, 3),
+        'change_since_full': round(change_since_full, 3) if mode == 'incremental' else 0.0,
+        'changed_sections': changed_sections,
+        'added_keywords': added,
+        'removed_keywords': removed,
+        'score_change': result.get('match_score', 50) - previous.match_score,
+    }
+    return result
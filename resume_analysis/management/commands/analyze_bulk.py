@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from resume_analysis.aggregates import record_analyses
+from resume_analysis.matching import job_description_hash, register_job_description
+from resume_analysis.models import ResumeAnalysis
+from resume_analysis.text_normalization import normalize_pages, normalize_text
+from resume_analysis.utils import RESUME_FILE_EXTENSIONS, analyze_resume_with_ai, extract_pages_from_file, is_fallback_result
+
+CHECKPOINT_FILENAME = '.analyze_bulk_checkpoint.json'
+
+class Command(BaseCommand):
+    help = 'Analyze a folder of resumes against one job description, resuming from a checkpoint'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help='Folder containing resume PDFs or .txt files')
+        parser.add_argument('--jd', required=True, help='File containing the job description')
+        parser.add_argument('--processes', type=int, default=None, help='Worker processes used for text extraction')
+        parser.add_argument('--concurrency', type=int, default=4, help='Maximum concurrent AI analysis calls')
+        parser.add_argument('--batch-size', type=int, default=50, help='Resumes extracted, analyzed and saved per batch')
+        parser.add_argument('--checkpoint', default=None, help=f'Checkpoint file (default: <directory>/{CHECKPOINT_FILENAME})')
+        parser.add_argument('--restart', action='store_true', help='Ignore an existing checkpoint (resumes already saved are still not analyzed again)')
+    
+    def handle(self, *args, **options):
+        directory = Path(options['directory'])
+        if not directory.is_dir():
+            raise CommandError(f'Not a directory: {directory}')
+        try:
+            job_description = normalize_text(Path(options['jd']).read_text(encoding='utf-8'))
+        except OSError as e:
+            raise CommandError(f'Could not read job description: {e}')
+        if not job_description:
+            raise CommandError('The job description file is empty')
+        
+        checkpoint_path = Path(options['checkpoint'] or directory / CHECKPOINT_FILENAME)
+        jd_hash = job_description_hash(job_description)
+        completed = set() if options['restart'] else load_checkpoint(checkpoint_path, jd_hash)
+        
+        paths = sorted(p for p in directory.rglob('*') if p.suffix.lower() in RESUME_FILE_EXTENSIONS)
+        pending = [p for p in paths if str(p.relative_to(directory)) not in completed]
+        self.stdout.write(f'{len(paths)} resumes found, {len(paths) - len(pending)} already done, {len(pending)} to analyze')
+        if not pending:
+            return
+        
+        # bulk_create bypasses post_save, so the JD is added to the matching corpus here
+        register_job_description(job_description)
+        
+        stats = {'analyzed': 0, 'skipped': 0, 'failed': 0, 'already_saved': 0, 'extract_seconds': 0.0, 'analyze_seconds': 0.0, 'save_seconds': 0.0}
+        started = time.perf_counter()
+        batch_size = max(1, options['batch_size'])
+        
+        with ProcessPoolExecutor(max_workers=options['processes']) as extractors, \
+                ThreadPoolExecutor(max_workers=max(1, options['concurrency'])) as analyzers:
+            for batch_start in range(0, len(pending), batch_size):
+                batch = pending[batch_start:batch_start + batch_size]
+                
+                phase_started = time.perf_counter()
+                extracted = list(extractors.map(_extract_for_bulk, batch))
+                stats['extract_seconds'] += time.perf_counter() - phase_started
+                
+                documents = []
+                done_paths = []
+                for path, (raw_text, resume_text, error) in zip(batch, extracted):
+                    if error:
+                        stats['skipped'] += 1
+                        done_paths.append(path)
+                        self.stderr.write(f'Skipping {path.name}: {error}')
+                    else:
+                        documents.append((path, raw_text, resume_text, bulk_key(jd_hash, resume_text)))
+                
+                # Rows saved by an earlier run (e.g. one that stopped before its checkpoint
+                # was written) or earlier in this batch are not analyzed again
+                saved_keys = set(ResumeAnalysis.objects.filter(
+                    bulk_key__in=[document[3] for document in documents]
+                ).values_list('bulk_key', flat=True))
+                to_analyze = []
+                for document in documents:
+                    if document[3] in saved_keys:
+                        stats['already_saved'] += 1
+                        done_paths.append(document[0])
+                    else:
+                        saved_keys.add(document[3])
+                        to_analyze.append(document)
+                
+                phase_started = time.perf_counter()
+                results = list(analyzers.map(lambda document: analyze_resume_with_ai(document[2], job_description), to_analyze))
+                stats['analyze_seconds'] += time.perf_counter() - phase_started
+                
+                # A failed AI call yields a placeholder result: it is not saved and the
+                # file stays out of the checkpoint, so a rerun analyzes it again
+                analyzed = []
+                for document, result in zip(to_analyze, results):
+                    if is_fallback_result(result):
+                        stats['failed'] += 1
+                        self.stderr.write(f'Analysis failed for {document[0].name}; it will be retried on the next run')
+                    else:
+                        analyzed.append((document, result))
+                
+                phase_started = time.perf_counter()
+                with transaction.atomic():
+                    created = ResumeAnalysis.objects.bulk_create([
+                        ResumeAnalysis(
+                            user=None,
+                            resume_text=resume_text,
+                            resume_text_raw=raw_text,
+                            job_description=job_description,
+                            analysis_result=result.get('analysis', 'Analysis completed'),
+                            match_score=result.get('match_score', 50),
+                            keywords_found=result.get('keywords_found', []),
+                            missing_skills=result.get('missing_skills', []),
+                            recommendations=result.get('recommendations', []),
+                            bulk_key=key
+                        )
+                        for (_, raw_text, resume_text, key), result in analyzed
+                    ])
+                    # bulk_create bypasses post_save, so the aggregates are updated here too
+                    record_analyses(created)
+                done_paths.extend(document[0] for document, _ in analyzed)
+                completed.update(str(path.relative_to(directory)) for path in done_paths)
+                save_checkpoint(checkpoint_path, jd_hash, completed)
+                stats['save_seconds'] += time.perf_counter() - phase_started
+                stats['analyzed'] += len(analyzed)
+                
+                elapsed = time.perf_counter() - started
+                done = batch_start + len(batch)
+                self.stdout.write(
+                    f'{done}/{len(pending)} processed ({stats["analyzed"] / elapsed:.2f} analyses/s, '
+                    f'{stats["skipped"]} skipped, {stats["failed"]} failed)'
+                )
+        
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Analyzed {stats["analyzed"]} resumes in {elapsed:.1f}s '
+            f'({stats["analyzed"] / elapsed:.2f}/s); extraction {stats["extract_seconds"]:.1f}s, '
+            f'analysis {stats["analyze_seconds"]:.1f}s, saving {stats["save_seconds"]:.1f}s, '
+            f'{stats["skipped"]} skipped, {stats["failed"]} failed (retried on the next run), '
+            f'{stats["already_saved"]} already saved'
+        ))
+
+def load_checkpoint(path: Path, jd_hash: str) -> set:
+    """Files already analyzed for this job description"""
+    try:
+        data = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return set()
+    if data.get('job_description_hash') != jd_hash:
+        return set()
+    return set(data.get('completed', []))
+
+def save_checkpoint(path: Path, jd_hash: str, completed: set):
+    # Write-then-rename so a crash never leaves a truncated checkpoint behind
+    temporary_path = path.with_name(path.name + '.tmp')
+    temporary_path.write_text(
+        json.dumps({'job_description_hash': jd_hash, 'completed': sorted(completed)}),
+        encoding='utf-8'
+    )
+    os.replace(temporary_path, path)
+
+def bulk_key(jd_hash: str, resume_text: str) -> str:
+    """Identity of one resume's analysis against one job description, stored on the row"""
+    return hashlib.sha256(f'{jd_hash}\0{resume_text}'.encode('utf-8')).hexdigest()
+
+def _extract_for_bulk(path: Path):
+    # Runs in worker processes; returns (raw text, normalized text, error)
+    try:
+        pages = extract_pages_from_file(str(path))
+    except Exception as e:
+        return '', '', f'could not be read ({e})'
+    raw_text = ''.join(page + '\n' for page in pages)
+    if not raw_text.strip():
+        return '', '', 'no extractable text (scanned image?)'
+    return raw_text, normalize_pages(pages), None
@@ -0,0 +1,151 @@
+import csv
+import json
+import os
+from datetime import datetime, time as dt_time
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.utils import timezone
+from resume_analysis.models import ResumeAnalysis
+
+WATERMARK_FILENAME = '.export_analyses_watermark.json'
+
+# One row per (analysis, skill): the JSON lists are exploded into `field` / `skill`
+# An analysis with neither keywords nor missing skills still gets one row with both empty
+EXPORT_COLUMNS = ['analysis_id', 'created_at', 'user_id', 'match_score', 'field', 'skill']
+
+class Command(BaseCommand):
+    help = 'Export resume analyses to CSV or Parquet with keywords and missing skills exploded to one row each'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='Destination file (.csv or .parquet)')
+        parser.add_argument('--format', choices=['csv', 'parquet'], default=None, help='Output format (default: from the file extension)')
+        parser.add_argument('--since', default=None, help='Only analyses created on or after this date (YYYY-MM-DD)')
+        parser.add_argument('--until', default=None, help='Only analyses created on or before this date (YYYY-MM-DD)')
+        parser.add_argument('--incremental', action='store_true', help='Only analyses created after the last exported one, then advance the watermark')
+        parser.add_argument('--watermark', default=None, help=f'Watermark file (default: <output folder>/{WATERMARK_FILENAME})')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Rows fetched from the database and written per chunk')
+    
+    def handle(self, *args, **options):
+        output_path = Path(options['output'])
+        export_format = options['format'] or output_path.suffix.lower().lstrip('.')
+        if export_format not in ('csv', 'parquet'):
+            raise CommandError('Use a .csv or .parquet output file, or pass --format')
+        if not output_path.parent.is_dir():
+            raise CommandError(f'No such directory: {output_path.parent}')
+        if export_format == 'parquet':
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise CommandError('Parquet export needs pyarrow (pip install pyarrow); use a .csv output instead')
+        
+        analyses = ResumeAnalysis.objects.order_by('created_at', 'id').values_list(
+            'id', 'created_at', 'user_id', 'match_score', 'keywords_found', 'missing_skills'
+        )
+        if options['since']:
+            analyses = analyses.filter(created_at__gte=_parse_date(options['since'], dt_time.min))
+        if options['until']:
+            analyses = analyses.filter(created_at__lte=_parse_date(options['until'], dt_time.max))
+        
+        watermark_path = Path(options['watermark'] or output_path.parent / WATERMARK_FILENAME)
+        if options['incremental']:
+            watermark = load_watermark(watermark_path)
+            if watermark:
+                created_at, analysis_id = watermark
+                analyses = analyses.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=analysis_id))
+        
+        rows = analyses.iterator(chunk_size=options['chunk_size'])
+        writer = write_parquet if export_format == 'parquet' else write_csv
+        # Written beside the destination and renamed into place, so a failed export leaves no partial file
+        temporary_path = output_path.with_name(output_path.name + '.tmp')
+        try:
+            stats = writer(temporary_path, _explode(rows), options['chunk_size'])
+        except BaseException:
+            temporary_path.unlink(missing_ok=True)
+            raise
+        os.replace(temporary_path, output_path)
+        
+        if options['incremental'] and stats['last']:
+            save_watermark(watermark_path, *stats['last'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Exported {stats["analyses"]} analyses as {stats["rows"]} rows to {output_path}'
+        ))
+
+def _parse_date(value: str, at: dt_time) -> datetime:
+    try:
+        date = datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise CommandError(f'Invalid date {value!r}; use YYYY-MM-DD')
+    return timezone.make_aware(datetime.combine(date, at))
+
+def _explode(rows):
+    """Yield (analysis key, export row) pairs, one per keyword / missing skill"""
+    for analysis_id, created_at, user_id, match_score, keywords_found, missing_skills in rows:
+        base = [analysis_id, created_at.isoformat(), user_id, match_score]
+        key = (created_at, analysis_id)
+        exploded = [
+            [field, str(skill)]
+            for field, values in (('keyword_found', keywords_found), ('missing_skill', missing_skills))
+            for skill in values or []
+        ]
+        for columns in exploded or [['', '']]:
+            yield key, base + columns
+
+def write_csv(path: Path, exploded, chunk_size: int) -> dict:
+    stats = {'analyses': 0, 'rows': 0, 'last': None}
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_COLUMNS)
+        for key, row in exploded:
+            _count(stats, key)
+            writer.writerow(row)
+    return stats
+
+def write_parquet(path: Path, exploded, chunk_size: int) -> dict:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    schema = pa.schema([
+        ('analysis_id', pa.int64()),
+        ('created_at', pa.string()),
+        ('user_id', pa.int64()),
+        ('match_score', pa.int32()),
+        ('field', pa.string()),
+        ('skill', pa.string()),
+    ])
+    stats = {'analyses': 0, 'rows': 0, 'last': None}
+    batch = []
+    with pq.ParquetWriter(str(path), schema) as writer:
+        for key, row in exploded:
+            _count(stats, key)
+            batch.append(row)
+            if len(batch) >= chunk_size:
+                # One row group per chunk keeps memory flat regardless of table size
+                writer.write_table(pa.Table.from_pylist([dict(zip(EXPORT_COLUMNS, r)) for r in batch], schema=schema))
+                batch = []
+        if batch or not stats['rows']:
+            writer.write_table(pa.Table.from_pylist([dict(zip(EXPORT_COLUMNS, r)) for r in batch], schema=schema))
+    return stats
+
+def _count(stats: dict, key):
+    stats['rows'] += 1
+    if key != stats['last']:
+        stats['analyses'] += 1
+        stats['last'] = key
+
+def load_watermark(path: Path):
+    """(created_at, id) of the last analysis exported, or None"""
+    try:
+        data = json.loads(path.read_text(encoding='utf-8'))
+        return datetime.fromisoformat(data['created_at']), int(data['id'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def save_watermark(path: Path, created_at: datetime, analysis_id: int):
+    # Write-then-rename so a crash never leaves a truncated watermark behind
+    temporary_path = path.with_name(path.name + '.tmp')
+    temporary_path.write_text(
+        json.dumps({'created_at': created_at.isoformat(), 'id': analysis_id}),
+        encoding='utf-8'
+    )
+    os.replace(temporary_path, path)
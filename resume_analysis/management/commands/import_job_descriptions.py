@@ -0,0 +1,96 @@
+import json
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from resume_analysis.dedup import compute_minhash
+from resume_analysis.matching import job_description_hash
+from resume_analysis.models import JobPosting, ResumeAnalysis
+
+class Command(BaseCommand):
+    help = 'Bulk import job descriptions into the job-matching corpus'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help='.txt files (one JD each), .jsonl files or folders of them')
+        parser.add_argument('--from-analyses', action='store_true', help='Also import every job description stored in resume analyses')
+        parser.add_argument('--batch-size', type=int, default=500)
+    
+    def handle(self, *args, **options):
+        if not options['paths'] and not options['from_analyses']:
+            raise CommandError('Give at least one path or --from-analyses')
+        
+        self.batch = []
+        self.seen_hashes = set()
+        self.imported = 0
+        self.invalid = 0
+        self.batch_size = options['batch_size']
+        
+        for path in options['paths']:
+            path = Path(path)
+            if not path.exists():
+                raise CommandError(f'No such file or directory: {path}')
+            files = sorted(path.rglob('*')) if path.is_dir() else [path]
+            for file_path in files:
+                if file_path.suffix.lower() == '.txt':
+                    self.add(file_path.read_text(encoding='utf-8', errors='ignore'), 'import', title=file_path.stem)
+                elif file_path.suffix.lower() == '.jsonl':
+                    self.import_jsonl(file_path)
+        
+        if options['from_analyses']:
+            descriptions = ResumeAnalysis.objects.values_list('job_description', flat=True).iterator(chunk_size=1000)
+            for description in descriptions:
+                self.add(description, 'analysis')
+        
+        self.flush()
+        self.stdout.write(self.style.SUCCESS(
+            f'Processed {len(self.seen_hashes)} distinct job descriptions '
+            f'({self.imported} submitted, existing ones skipped, {self.invalid} invalid lines skipped); '
+            f'corpus now holds {JobPosting.objects.count()}'
+        ))
+    
+    def import_jsonl(self, file_path: Path):
+        with open(file_path, encoding='utf-8') as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    self.skip(file_path, line_number, 'invalid JSON')
+                    continue
+                if not isinstance(record, dict):
+                    self.skip(file_path, line_number, 'not a JSON object')
+                    continue
+                fields = {key: record.get(key) or '' for key in ('description', 'job_description', 'title', 'company_name')}
+                bad_fields = [key for key, value in fields.items() if not isinstance(value, str)]
+                if bad_fields:
+                    self.skip(file_path, line_number, f"{', '.join(bad_fields)} must be text")
+                    continue
+                self.add(fields['description'] or fields['job_description'], 'import', fields['title'], fields['company_name'])
+    
+    def skip(self, file_path: Path, line_number: int, reason: str):
+        self.invalid += 1
+        self.stderr.write(f'{file_path.name}:{line_number}: {reason}, skipped')
+    
+    def add(self, description: str, source: str, title: str = '', company_name: str = ''):
+        if not description.strip():
+            return
+        content_hash = job_description_hash(description)
+        if content_hash in self.seen_hashes:
+            return
+        self.seen_hashes.add(content_hash)
+        self.batch.append(JobPosting(
+            description=description,
+            content_hash=content_hash,
+            source=source,
+            title=title[:200],
+            company_name=company_name[:200],
+            minhash=compute_minhash(description),
+        ))
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+    
+    def flush(self):
+        if self.batch:
+            # Existing postings (same content hash) are left untouched
+            JobPosting.objects.bulk_create(self.batch, ignore_conflicts=True)
+            self.imported += len(self.batch)
+            self.batch = []
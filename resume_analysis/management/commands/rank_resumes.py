@@ -0,0 +1,75 @@
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from django.core.management.base import BaseCommand, CommandError
+from resume_analysis.ranking import build_resume_index, rank_resumes
+from resume_analysis.utils import RESUME_FILE_EXTENSIONS, extract_text_from_file
+
+class Command(BaseCommand):
+    help = 'Rank a folder of resumes against one job description (recruiter mode)'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help='Folder containing resume PDFs or .txt files')
+        parser.add_argument('--jd', required=True, help='File containing the job description')
+        parser.add_argument('--top-k', type=int, default=20, help='Number of ranked resumes to report')
+        parser.add_argument('--shortlist', type=int, default=5, help='Top resumes sent to AI analysis for feedback (0 disables)')
+        parser.add_argument('--processes', type=int, default=None, help='Worker processes used for text extraction')
+        parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    
+    def handle(self, *args, **options):
+        directory = Path(options['directory'])
+        if not directory.is_dir():
+            raise CommandError(f'Not a directory: {directory}')
+        try:
+            job_description = Path(options['jd']).read_text(encoding='utf-8')
+        except OSError as e:
+            raise CommandError(f'Could not read job description: {e}')
+        
+        paths = sorted(p for p in directory.rglob('*') if p.suffix.lower() in RESUME_FILE_EXTENSIONS)
+        if not paths:
+            raise CommandError(f'No resumes found in {directory}')
+        
+        started = time.perf_counter()
+        resumes = {}
+        with ProcessPoolExecutor(max_workers=options['processes']) as executor:
+            texts = executor.map(_safe_extract, paths, chunksize=32)
+            for path, text in zip(paths, texts):
+                if text.strip():
+                    resumes[str(path.relative_to(directory))] = text
+                else:
+                    self.stderr.write(f'Skipping {path.name}: no extractable text')
+        extracted = time.perf_counter()
+        
+        index = build_resume_index(resumes)
+        indexed = time.perf_counter()
+        
+        ranked = rank_resumes(
+            resumes,
+            job_description,
+            top_k=options['top_k'],
+            shortlist_size=options['shortlist'],
+            index=index
+        )
+        finished = time.perf_counter()
+        
+        if options['json']:
+            self.stdout.write(json.dumps(ranked, indent=2))
+        else:
+            for entry in ranked:
+                line = f"{entry['rank']:>3}. {entry['score']:>8.3f}  {entry['resume_id']}"
+                if 'analysis' in entry:
+                    line += f"  (AI match score: {entry['analysis'].get('match_score')})"
+                self.stdout.write(line)
+        
+        self.stderr.write(
+            f'{len(resumes)} resumes: extraction {extracted - started:.2f}s, '
+            f'indexing {indexed - extracted:.2f}s, ranking + shortlist {finished - indexed:.2f}s'
+        )
+
+def _safe_extract(path: Path) -> str:
+    # Runs in worker processes; one unreadable file must not abort the whole run
+    try:
+        return extract_text_from_file(str(path))
+    except Exception:
+        return ''
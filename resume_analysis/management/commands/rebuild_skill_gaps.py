@@ -0,0 +1,16 @@
+import time
+from django.core.management.base import BaseCommand
+from resume_analysis.aggregates import rebuild_aggregates
+
+class Command(BaseCommand):
+    help = 'Recompute the skill-gap and score-distribution aggregates from every stored analysis'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Analyses fetched from the database per chunk')
+    
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        total = rebuild_aggregates(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt aggregates from {total} analyses in {time.perf_counter() - started:.1f}s'
+        ))
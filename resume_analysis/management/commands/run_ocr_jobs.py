@@ -0,0 +1,30 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from resume_analysis.models import OCRJob
+from resume_analysis.ocr import ocr_available, run_ocr_job
+
+class Command(BaseCommand):
+    help = 'Run queued OCR jobs in this process, e.g. ones left behind by a server restart'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--stale-minutes', type=int, default=None, help='Also re-run jobs stuck in "running" for this long (default: OCR_STALE_AFTER)')
+        parser.add_argument('--limit', type=int, default=None, help='Maximum number of jobs to run')
+    
+    def handle(self, *args, **options):
+        if not ocr_available():
+            raise CommandError('No OCR engine is available; install Tesseract or set OCR_ENGINE')
+        
+        # Jobs still "running" long after their last update belong to a process that died
+        stale_after = timedelta(minutes=options['stale_minutes']) if options['stale_minutes'] is not None else timedelta(seconds=settings.OCR_STALE_AFTER)
+        stale_before = timezone.now() - stale_after
+        requeued = OCRJob.objects.filter(status='running', updated_at__lt=stale_before).update(status='queued', updated_at=timezone.now())
+        
+        job_ids = list(OCRJob.objects.filter(status='queued').order_by('created_at').values_list('id', flat=True)[:options['limit']])
+        for job_id in job_ids:
+            run_ocr_job(job_id)
+            job = OCRJob.objects.get(id=job_id)
+            self.stdout.write(f'OCR job {job_id}: {job.status}' + (f' ({job.error})' if job.error else ''))
+        
+        self.stdout.write(self.style.SUCCESS(f'Ran {len(job_ids)} OCR jobs ({requeued} stale jobs re-queued)'))
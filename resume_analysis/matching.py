@@ -0,0 +1,131 @@
+import hashlib
+import heapq
+import math
+import threading
+from collections import Counter, defaultdict
+from operator import itemgetter
+from typing import Dict, List, Tuple
+from .dedup import compute_minhash, unindexed_postings
+from .models import JobPosting
+from .terms import normalize_terms
+
+def job_description_hash(job_description: str) -> str:
+    """Stable identity of a job description, insensitive to case and spacing"""
+    canonical = ' '.join(job_description.lower().split())
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def _log_tf_weights(terms: List[str]) -> Dict[str, float]:
+    return {term: 1 + math.log(count) for term, count in Counter(terms).items()}
+
+class JobCorpusIndex:
+    """
+    Sparse TF-IDF index over the job description corpus
+    Documents use log-tf cosine-normalized weights and queries carry the idf
+    (SMART lnc.ltc), so adding a posting never requires re-weighting the rest
+    of the corpus and the index can be updated incrementally
+    """
+    
+    # Terms found in more than this share of the corpus barely discriminate but
+    # have the longest posting lists, so queries skip them
+    max_document_frequency = 0.5
+    
+    def __init__(self):
+        self.postings = defaultdict(list)  # term -> [(posting_id, normalized weight)]
+        self.posting_ids = set()
+        self.synced_until = None  # Creation time postings are loaded up to (see unindexed_postings)
+        self.lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self.posting_ids)
+    
+    def add(self, posting_id: int, description: str):
+        """Add one job description; re-adding a known posting is a no-op"""
+        if posting_id in self.posting_ids:
+            return
+        weights = _log_tf_weights(normalize_terms(description))
+        norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+        for term, weight in weights.items():
+            self.postings[term].append((posting_id, weight / norm))
+        self.posting_ids.add(posting_id)
+    
+    def search(self, query_text: str, top_k: int = 20) -> List[Tuple[int, float]]:
+        """Return the top_k (posting_id, cosine similarity) pairs, best first"""
+        document_count = len(self.posting_ids)
+        if not document_count:
+            return []
+        
+        max_postings = max(1, int(document_count * self.max_document_frequency))
+        query_weights = {}
+        for term, weight in _log_tf_weights(normalize_terms(query_text)).items():
+            postings = self.postings.get(term)
+            if postings and (len(postings) <= max_postings or document_count < 10):
+                query_weights[term] = weight * math.log(document_count / len(postings))
+        query_norm = math.sqrt(sum(weight * weight for weight in query_weights.values())) or 1.0
+        
+        scores = defaultdict(float)
+        for term, query_weight in query_weights.items():
+            query_weight /= query_norm
+            for posting_id, document_weight in self.postings[term]:
+                scores[posting_id] += query_weight * document_weight
+        
+        best = heapq.nlargest(top_k, scores.items(), key=itemgetter(1))
+        return [(posting_id, round(score, 4)) for posting_id, score in best if score > 0]
+
+# Process-wide index, built lazily and caught up with new rows on every lookup
+_job_index = None
+_job_index_lock = threading.Lock()
+
+def get_job_index() -> JobCorpusIndex:
+    """Return the corpus index, loading postings created since the last call"""
+    global _job_index
+    with _job_index_lock:
+        if _job_index is None:
+            _job_index = JobCorpusIndex()
+        index = _job_index
+    
+    with index.lock:
+        new_postings, synced_until = unindexed_postings(index.posting_ids, index.synced_until, ('id', 'description'))
+        for posting in new_postings:
+            index.add(posting.id, posting.description)
+        index.synced_until = synced_until
+    return index
+
+def register_job_description(job_description: str, source: str = 'analysis', title: str = '', company_name: str = '') -> JobPosting:
+    """Store a job description in the corpus (deduplicated) and index it"""
+    posting, created = JobPosting.objects.get_or_create(
+        content_hash=job_description_hash(job_description),
+        defaults={
+            'description': job_description,
+            'source': source,
+            'title': title[:200],
+            'company_name': company_name[:200],
+            'minhash': compute_minhash(job_description),
+        }
+    )
+    if created and _job_index is not None:
+        with _job_index.lock:
+            _job_index.add(posting.id, posting.description)
+    return posting
+
+def match_jobs(resume_text: str, top_k: int = 20) -> List[Dict]:
+    """
+    Rank stored job descriptions against a resume
+    Only imported postings carry a text preview: the rest are job descriptions
+    users pasted into their own analyses, which are not shown to anyone else
+    """
+    ranked = get_job_index().search(resume_text, top_k)
+    postings = JobPosting.objects.only('id', 'title', 'company_name', 'description', 'source').in_bulk(
+        [posting_id for posting_id, _ in ranked]
+    )
+    return [
+        {
+            'job_posting_id': posting_id,
+            'title': postings[posting_id].title,
+            'company_name': postings[posting_id].company_name,
+            'source': postings[posting_id].source,
+            'preview': postings[posting_id].description[:200] if postings[posting_id].source == 'import' else '',
+            'score': score,
+        }
+        for posting_id, score in ranked
+        if posting_id in postings
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:48
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_analysis', '0003_alter_resumeanalysis_recommendations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(blank=True, max_length=200)),
+                ('company_name', models.CharField(blank=True, max_length=200)),
+                ('description', models.TextField()),
+                ('content_hash', models.CharField(max_length=64, unique=True)),
+                ('source', models.CharField(choices=[('analysis', 'Resume Analysis'), ('import', 'Bulk Import')], default='analysis', max_length=20)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
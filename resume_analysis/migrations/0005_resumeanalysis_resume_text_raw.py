@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_analysis', '0004_jobposting'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='resume_text_raw',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_analysis', '0005_resumeanalysis_resume_text_raw'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumeupload',
+            name='sha256',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+    ]
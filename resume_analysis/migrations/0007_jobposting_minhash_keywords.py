@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_analysis', '0006_resumeupload_sha256'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobposting',
+            name='keywords',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='minhash',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
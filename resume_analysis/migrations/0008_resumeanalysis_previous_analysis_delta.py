@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_analysis', '0007_jobposting_minhash_keywords'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='delta',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='previous_analysis',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='revisions', to='resume_analysis.resumeanalysis'),
+        ),
+    ]
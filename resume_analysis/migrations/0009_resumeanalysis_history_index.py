@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-19 08:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_analysis', '0008_resumeanalysis_previous_analysis_delta'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='resumeanalysis',
+            index=models.Index(fields=['-created_at', '-id'], name='resume_analysis_history_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_analysis', '0009_resumeanalysis_history_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScoreBandAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(max_length=10)),
+                ('jd_category', models.CharField(max_length=50)),
+                ('band', models.PositiveSmallIntegerField()),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SkillGapAggregate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(max_length=10)),
+                ('jd_category', models.CharField(max_length=50)),
+                ('skill', models.CharField(max_length=200)),
+                ('label', models.CharField(max_length=200)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['period', 'jd_category', '-count'], name='skill_gap_top_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='skillgapaggregate',
+            constraint=models.UniqueConstraint(fields=('period', 'jd_category', 'skill'), name='unique_skill_gap_aggregate'),
+        ),
+        migrations.AddConstraint(
+            model_name='scorebandaggregate',
+            constraint=models.UniqueConstraint(fields=('period', 'jd_category', 'band'), name='unique_score_band_aggregate'),
+        ),
+    ]
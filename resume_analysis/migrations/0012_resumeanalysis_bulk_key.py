@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_analysis', '0011_ocrjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='bulk_key',
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_analysis', '0013_jobposting_created_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='is_fallback',
+            field=models.BooleanField(default=False),
+        ),
+    ]
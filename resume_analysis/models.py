@@ -6,17 +6,26 @@ class ResumeAnalysis(models.Model):
     """Model to store resume analysis results"""
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
     resume_text = models.TextField()
+    resume_text_raw = models.TextField(blank=True, default='')  # Extractor output before normalization
     job_description = models.TextField()
     analysis_result = models.TextField()
     match_score = models.IntegerField(default=0)
     keywords_found = models.JSONField(default=list)
     missing_skills = models.JSONField(default=list)
     recommendations = models.JSONField(default=list)
+    previous_analysis = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True, related_name='revisions')
+    delta = models.JSONField(default=dict, blank=True)  # Changes relative to previous_analysis
+    bulk_key = models.CharField(max_length=64, null=True, blank=True, unique=True)  # analyze_bulk rows: hash of JD + resume text
+    is_fallback = models.BooleanField(default=False)  # The AI call failed; the result is a placeholder
     created_at = models.DateTimeField(default=timezone.now)
     
     class Meta:
         ordering = ['-created_at']
         verbose_name_plural = 'Resume Analyses'
+        indexes = [
+            # Backs keyset pagination of the history on (created_at, id)
+            models.Index(fields=['-created_at', '-id'], name='resume_analysis_history_idx'),
+        ]
     
     def __str__(self):
         username = self.user.username if self.user else "Anonymous"
@@ -27,6 +36,7 @@ class ResumeUpload(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
     resume_file = models.FileField(upload_to='resumes/')
     original_filename = models.CharField(max_length=255)
+    sha256 = models.CharField(max_length=64, blank=True, db_index=True)  # Digest computed while the upload streamed in
     uploaded_at = models.DateTimeField(default=timezone.now)
     
     class Meta:
@@ -36,3 +46,85 @@ class ResumeUpload(models.Model):
         username = self.user.username if self.user else "Anonymous"
         return f"{self.original_filename} - {username}"
 
+
+class JobPosting(models.Model):
+    """Distinct job description in the local job-matching corpus"""
+    SOURCE_CHOICES = [
+        ('analysis', 'Resume Analysis'),
+        ('import', 'Bulk Import'),
+    ]
+    
+    title = models.CharField(max_length=200, blank=True)
+    company_name = models.CharField(max_length=200, blank=True)
+    description = models.TextField()
+    content_hash = models.CharField(max_length=64, unique=True)
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES, default='analysis')
+    minhash = models.JSONField(default=list, blank=True)  # MinHash signature for near-duplicate lookup
+    keywords = models.JSONField(null=True, blank=True)  # Cached AI keyword extraction, shared by near-duplicates
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)  # The corpus indexes catch up by it
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return self.title or self.description[:50]
+
+
+class SkillGapAggregate(models.Model):
+    """How often a skill was reported missing, per week and job-description category"""
+    period = models.CharField(max_length=10)  # ISO week such as '2024-W35', or 'all'
+    jd_category = models.CharField(max_length=50)  # Course-catalog category of the JD, or 'all'
+    skill = models.CharField(max_length=200)  # Normalized skill id
+    label = models.CharField(max_length=200)  # Skill as first reported, for display
+    count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['period', 'jd_category', 'skill'], name='unique_skill_gap_aggregate'),
+        ]
+        indexes = [
+            models.Index(fields=['period', 'jd_category', '-count'], name='skill_gap_top_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.label} ({self.period}, {self.jd_category}): {self.count}"
+
+class ScoreBandAggregate(models.Model):
+    """Number of analyses per match-score band, per week and job-description category"""
+    period = models.CharField(max_length=10)
+    jd_category = models.CharField(max_length=50)
+    band = models.PositiveSmallIntegerField()  # Score // 10, so band 10 holds perfect scores
+    count = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['period', 'jd_category', 'band'], name='unique_score_band_aggregate'),
+        ]
+    
+    def __str__(self):
+        return f"{self.band * 10}+ ({self.period}, {self.jd_category}): {self.count}"
+
+class OCRJob(models.Model):
+    """Scanned resume queued for OCR, then analyzed like a regular upload"""
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    
+    upload = models.ForeignKey(ResumeUpload, on_delete=models.CASCADE, related_name='ocr_jobs')
+    job_description = models.TextField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued', db_index=True)
+    page_count = models.PositiveIntegerField(default=0)
+    pages_done = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    analysis = models.ForeignKey(ResumeAnalysis, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"OCR job {self.id} ({self.status}) - {self.upload.original_filename}"
@@ -0,0 +1,185 @@
+import logging
+import shutil
+import subprocess
+from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, wait
+from datetime import timedelta
+from functools import lru_cache
+from typing import Callable, List, Optional
+import fitz  # PyMuPDF
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from core.background import get_executor, submit_background
+from core.instrumentation import span
+from .models import OCRJob, ResumeAnalysis
+from .text_normalization import normalize_pages
+from .utils import analyze_resume_with_ai, is_fallback_result
+
+logger = logging.getLogger(__name__)
+
+# Shown to the user for failures that are not an OCRError; the details are logged
+OCR_FAILED_MESSAGE = 'Something went wrong while reading it. Please try again later.'
+
+class OCRError(Exception):
+    """OCR job failure whose message is meant for the user"""
+
+class OCREngine(ABC):
+    """
+    Pluggable OCR backend, selected with the OCR_ENGINE setting
+    Implementations turn one rendered page (PNG bytes) into plain text
+    """
+    
+    def is_available(self) -> bool:
+        return False
+    
+    @abstractmethod
+    def image_to_text(self, image: bytes) -> str:
+        ...
+
+class TesseractEngine(OCREngine):
+    """Locally installed Tesseract binary, fed through stdin/stdout"""
+    
+    def __init__(self):
+        self.command = settings.OCR_TESSERACT_CMD
+        self.language = settings.OCR_LANGUAGE
+    
+    def is_available(self) -> bool:
+        return shutil.which(self.command) is not None
+    
+    def image_to_text(self, image: bytes) -> str:
+        # --psm 3: automatic page segmentation, which suits multi-column resumes
+        result = subprocess.run(
+            [self.command, 'stdin', 'stdout', '-l', self.language, '--psm', '3'],
+            input=image,
+            capture_output=True,
+            timeout=settings.OCR_PAGE_TIMEOUT,
+            check=True
+        )
+        return result.stdout.decode('utf-8', errors='ignore')
+
+@lru_cache(maxsize=None)
+def get_ocr_engine() -> OCREngine:
+    """Engine named by OCR_ENGINE, instantiated once per process"""
+    return import_string(settings.OCR_ENGINE)()
+
+def ocr_available() -> bool:
+    try:
+        return get_ocr_engine().is_available()
+    except ImportError:
+        return False
+
+def render_page(page, dpi: int) -> bytes:
+    """Grayscale PNG of one page; OCR gains nothing from color and it triples the pixel data"""
+    pixmap = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY, alpha=False)
+    return pixmap.tobytes('png')
+
+def ocr_pdf(data: bytes, on_page: Optional[Callable[[int, int], None]] = None) -> List[str]:
+    """
+    Text of every page of a PDF, recognizing pages that have no text layer
+    Pages are rendered here one at a time and recognized on the shared page pool;
+    at most OCR_PAGES_IN_FLIGHT_PER_JOB pages of this document are queued at once,
+    so rendering overlaps recognition and a long scan cannot fill the pool.
+    Rendering stays on this thread: a PyMuPDF document must not be used from
+    several threads, and recognizing a page takes far longer than rendering it
+    ``on_page(pages_done, page_count)`` is called as pages finish
+    """
+    engine = get_ocr_engine()
+    pool = get_executor('ocr-pages', settings.OCR_PAGE_WORKERS)
+    doc = fitz.open(stream=data, filetype='pdf')
+    try:
+        page_count = doc.page_count
+        texts = [''] * page_count
+        in_flight = {}
+        pages_done = 0
+        
+        def collect(futures):
+            nonlocal pages_done
+            for future in futures:
+                texts[in_flight.pop(future)] = future.result()
+                pages_done += 1
+                if on_page:
+                    on_page(pages_done, page_count)
+        
+        for page_number in range(page_count):
+            page = doc[page_number]
+            # Mixed documents: pages that do have a text layer skip OCR
+            text = page.get_text()
+            if text.strip():
+                texts[page_number] = text
+                pages_done += 1
+                if on_page:
+                    on_page(pages_done, page_count)
+                continue
+            if len(in_flight) >= settings.OCR_PAGES_IN_FLIGHT_PER_JOB:
+                collect(wait(in_flight, return_when=FIRST_COMPLETED).done)
+            in_flight[pool.submit(engine.image_to_text, render_page(page, settings.OCR_DPI))] = page_number
+        
+        collect(list(wait(in_flight).done))
+        return texts
+    finally:
+        doc.close()
+
+def enqueue_ocr_job(job: OCRJob):
+    """Run the job on the bounded OCR job pool once the current transaction commits"""
+    transaction.on_commit(
+        lambda: submit_background('ocr-jobs', settings.OCR_MAX_CONCURRENT_JOBS, run_ocr_job, job.id)
+    )
+
+def resume_stale_ocr_job(job_id: int) -> bool:
+    """
+    Queue the job again if it has made no progress for OCR_STALE_AFTER seconds
+    (its process died or lost its in-memory queue); True if it was re-queued
+    """
+    stale_before = timezone.now() - timedelta(seconds=settings.OCR_STALE_AFTER)
+    requeued = OCRJob.objects.filter(
+        id=job_id, status__in=('queued', 'running'), updated_at__lt=stale_before
+    ).update(status='queued', updated_at=timezone.now())
+    if requeued:
+        logger.warning('OCR job %s made no progress for %ss; re-queued', job_id, settings.OCR_STALE_AFTER)
+        submit_background('ocr-jobs', settings.OCR_MAX_CONCURRENT_JOBS, run_ocr_job, job_id)
+    return bool(requeued)
+
+def run_ocr_job(job_id: int):
+    """OCR the upload, then analyze it against the job description; status is kept on the job row"""
+    # Claim the job so a job queued twice (or picked up by run_ocr_jobs) only runs once
+    if not OCRJob.objects.filter(id=job_id, status='queued').update(status='running', updated_at=timezone.now()):
+        return
+    job = OCRJob.objects.select_related('upload').get(id=job_id)
+    
+    # QuerySet.update() skips auto_now; updated_at is what marks a job as still alive
+    def report_progress(pages_done, page_count):
+        OCRJob.objects.filter(id=job_id).update(pages_done=pages_done, page_count=page_count, updated_at=timezone.now())
+    
+    try:
+        with job.upload.resume_file.open('rb') as f:
+            data = f.read()
+        with span(logger, 'ocr.recognize', job_id=job_id, bytes=len(data)) as fields:
+            pages = ocr_pdf(data, on_page=report_progress)
+            fields['pages'] = len(pages)
+        raw_resume_text = "".join(page_text + "\n" for page_text in pages)
+        if not raw_resume_text.strip():
+            raise OCRError("No text could be recognized in the scanned PDF.")
+        
+        resume_text = normalize_pages(pages)
+        analysis_result = analyze_resume_with_ai(resume_text, job.job_description)
+        analysis = ResumeAnalysis.objects.create(
+            user=None,
+            resume_text=resume_text,
+            resume_text_raw=raw_resume_text,
+            job_description=job.job_description,
+            analysis_result=analysis_result.get('analysis', 'Analysis completed'),
+            match_score=analysis_result.get('match_score', 50),
+            keywords_found=analysis_result.get('keywords_found', []),
+            missing_skills=analysis_result.get('missing_skills', []),
+            recommendations=analysis_result.get('recommendations', []),
+            is_fallback=is_fallback_result(analysis_result)
+        )
+        OCRJob.objects.filter(id=job_id).update(status='completed', analysis=analysis, error='', updated_at=timezone.now())
+    except OCRError as e:
+        logger.warning('OCR job %s failed: %s', job_id, e)
+        OCRJob.objects.filter(id=job_id).update(status='failed', error=str(e), updated_at=timezone.now())
+    except Exception:
+        logger.exception('OCR job %s failed', job_id)
+        OCRJob.objects.filter(id=job_id).update(status='failed', error=OCR_FAILED_MESSAGE, updated_at=timezone.now())
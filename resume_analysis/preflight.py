@@ -0,0 +1,65 @@
+from django.conf import settings
+from .utils import open_pdf_upload
+
+PDF_MAGIC = b'%PDF-'
+# The PDF header may be preceded by a little junk; readers scan the first KB
+MAGIC_SEARCH_BYTES = 1024
+
+class PreflightError(Exception):
+    """
+    Upload rejected before extraction
+    ``reason`` is a short machine-readable code, ``route`` names the queue that
+    can still handle the file (e.g. "ocr" for image-only PDFs) or is None
+    """
+    
+    def __init__(self, reason: str, message: str, route: str = None):
+        super().__init__(message)
+        self.reason = reason
+        self.message = message
+        self.route = route
+
+def preflight_pdf(uploaded_file) -> dict:
+    """
+    Cheap checks run before full text extraction or any AI call: size, PDF magic
+    bytes, encryption, page count and text presence on a sample of pages
+    Raises PreflightError with a specific reason; returns {'page_count': n}
+    """
+    if uploaded_file.size == 0:
+        raise PreflightError('empty', "The uploaded file is empty. Please check your file and try again.")
+    if uploaded_file.size > settings.RESUME_MAX_UPLOAD_SIZE:
+        limit_mb = settings.RESUME_MAX_UPLOAD_SIZE // (1024 * 1024)
+        raise PreflightError('too_large', f"The file is larger than {limit_mb}MB. Please upload a smaller PDF.")
+    
+    uploaded_file.seek(0)
+    header = uploaded_file.read(MAGIC_SEARCH_BYTES)
+    uploaded_file.seek(0)
+    if PDF_MAGIC not in header:
+        raise PreflightError('not_pdf', "The file is not a PDF. Please upload your resume as a PDF file.")
+    
+    try:
+        doc = open_pdf_upload(uploaded_file)
+    except Exception:
+        raise PreflightError('corrupt', "The PDF file appears to be damaged and could not be opened.")
+    
+    try:
+        if doc.needs_pass:
+            raise PreflightError('encrypted', "The PDF is password protected. Please upload an unprotected copy.")
+        
+        page_count = doc.page_count
+        if page_count == 0:
+            raise PreflightError('no_pages', "The PDF file has no pages.")
+        if page_count > settings.RESUME_MAX_PAGES:
+            raise PreflightError('too_many_pages', f"The PDF has {page_count} pages; resumes are limited to {settings.RESUME_MAX_PAGES} pages.")
+        
+        # First, middle and last pages are representative enough to detect scans
+        sample = sorted({0, page_count // 2, page_count - 1})[:settings.RESUME_PREFLIGHT_SAMPLE_PAGES]
+        if not any(doc[page_number].get_text().strip() for page_number in sample):
+            raise PreflightError(
+                'image_only',
+                "The PDF contains no selectable text; it looks like a scanned image.",
+                route='ocr'
+            )
+    finally:
+        doc.close()
+    
+    return {'page_count': page_count}
@@ -0,0 +1,112 @@
+import heapq
+import math
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import Dict, Hashable, List, Tuple
+from django.conf import settings
+from .terms import normalize_terms
+from .utils import analyze_resume_with_ai
+
+class ResumeIndex:
+    """
+    Inverted index over normalized resume terms scored with Okapi BM25
+    Only the posting lists of the job description's terms are visited per query,
+    so ranking thousands of resumes costs milliseconds after indexing
+    """
+    
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = defaultdict(list)  # term -> [(doc_number, term_frequency)]
+        self.doc_ids = []
+        self.doc_lengths = []
+        self.total_length = 0
+        self._length_norms = None
+    
+    def __len__(self):
+        return len(self.doc_ids)
+    
+    def add(self, doc_id: Hashable, text: str):
+        """Index one resume under the caller's identifier (file name, primary key...)"""
+        terms = normalize_terms(text)
+        doc_number = len(self.doc_ids)
+        self.doc_ids.append(doc_id)
+        self.doc_lengths.append(len(terms))
+        self.total_length += len(terms)
+        for term, frequency in Counter(terms).items():
+            self.postings[term].append((doc_number, frequency))
+        self._length_norms = None
+    
+    def _get_length_norms(self) -> List[float]:
+        # k1 * (1 - b + b * |d| / avgdl) only changes when documents are added
+        if self._length_norms is None:
+            average_length = self.total_length / len(self.doc_ids) or 1.0
+            self._length_norms = [
+                self.k1 * (1 - self.b + self.b * length / average_length)
+                for length in self.doc_lengths
+            ]
+        return self._length_norms
+    
+    def search(self, query_text: str, top_k: int = 10) -> List[Tuple[Hashable, float]]:
+        """Return the top_k (doc_id, score) pairs for a job description, best first"""
+        if not self.doc_ids:
+            return []
+        
+        length_norms = self._get_length_norms()
+        doc_count = len(self.doc_ids)
+        scores = defaultdict(float)
+        
+        for term in set(normalize_terms(query_text)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            numerator_weight = idf * (self.k1 + 1)
+            for doc_number, frequency in postings:
+                scores[doc_number] += numerator_weight * frequency / (frequency + length_norms[doc_number])
+        
+        best = heapq.nlargest(top_k, scores.items(), key=itemgetter(1))
+        return [(self.doc_ids[doc_number], round(score, 4)) for doc_number, score in best]
+
+def build_resume_index(resumes: Dict[Hashable, str]) -> ResumeIndex:
+    """Build a ResumeIndex from a mapping of identifier -> resume text"""
+    index = ResumeIndex()
+    for doc_id, text in resumes.items():
+        index.add(doc_id, text)
+    return index
+
+def rank_resumes(
+    resumes: Dict[Hashable, str],
+    job_description: str,
+    top_k: int = 20,
+    shortlist_size: int = 5,
+    index: ResumeIndex = None,
+    max_workers: int = None
+) -> List[Dict]:
+    """
+    Rank resumes against one job description
+    All resumes are scored locally; only the best shortlist_size are sent to the
+    AI analysis for narrative feedback
+    """
+    if index is None:
+        index = build_resume_index(resumes)
+    if max_workers is None:
+        max_workers = settings.RESUME_BATCH_MAX_WORKERS
+    
+    ranked = [
+        {'rank': position, 'resume_id': doc_id, 'score': score}
+        for position, (doc_id, score) in enumerate(index.search(job_description, top_k), start=1)
+    ]
+    
+    shortlist = ranked[:shortlist_size]
+    if shortlist:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(shortlist)))) as executor:
+            analyses = executor.map(
+                lambda entry: analyze_resume_with_ai(resumes[entry['resume_id']], job_description),
+                shortlist
+            )
+            for entry, analysis in zip(shortlist, analyses):
+                entry['analysis'] = analysis
+    
+    return ranked
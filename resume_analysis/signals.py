@@ -0,0 +1,18 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from .aggregates import record_analyses
+from .matching import register_job_description
+from .models import ResumeAnalysis
+
+@receiver(post_save, sender=ResumeAnalysis)
+def add_job_description_to_corpus(sender, instance, created, **kwargs):
+    """Keep the job-matching corpus in step with newly analyzed job descriptions"""
+    if created and instance.job_description.strip():
+        register_job_description(instance.job_description)
+
+@receiver(post_save, sender=ResumeAnalysis)
+def update_skill_gap_aggregates(sender, instance, created, **kwargs):
+    """Count each new analysis into the precomputed skill-gap and score aggregates"""
+    # Placeholders from failed AI calls would count their canned skills and score
+    if created and not instance.is_fallback:
+        record_analyses([instance])
@@ -0,0 +1,110 @@
+import re
+from typing import List
+
+# Keeps tokens such as "c++", "c#", "node.js" and "asp.net" intact
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9+#]")
+
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could did do does
+doing during each etc few for from further had has have having he her here hers him his how i if in
+into is it its itself just me more most my no nor not of off on once only or other our ours out over
+own per same she should so some such than that the their theirs them then there these they this
+those through to too under until up very via was we were what when where which while who whom why
+will with within would you your yours
+ability able candidate candidates experience experienced including job knowledge looking must
+plus preferred required requirements responsibilities role skill skills strong team work working
+year years
+""".split())
+
+# Alternative spellings mapped onto one canonical skill term
+SKILL_ALIASES = {
+    'js': 'javascript',
+    'ecmascript': 'javascript',
+    'ts': 'typescript',
+    'py': 'python',
+    'python3': 'python',
+    'golang': 'go',
+    'k8s': 'kubernetes',
+    'node': 'nodejs',
+    'node.js': 'nodejs',
+    'react.js': 'react',
+    'reactjs': 'react',
+    'vue.js': 'vue',
+    'vuejs': 'vue',
+    'angularjs': 'angular',
+    'postgres': 'postgresql',
+    'psql': 'postgresql',
+    'mongo': 'mongodb',
+    'gcp': 'google_cloud',
+    'excel': 'microsoft_excel',
+    'ml': 'machine_learning',
+    'dl': 'deep_learning',
+    'ai': 'artificial_intelligence',
+    'nlp': 'natural_language_processing',
+    'cicd': 'ci_cd',
+    'oop': 'object_oriented_programming',
+    'ux': 'user_experience',
+    'ui': 'user_interface',
+}
+
+# Multi-word skills (two or three words) collapsed into a single term so they score as one unit
+SKILL_PHRASES = {
+    ('machine', 'learning'): 'machine_learning',
+    ('deep', 'learning'): 'deep_learning',
+    ('artificial', 'intelligence'): 'artificial_intelligence',
+    ('natural', 'language', 'processing'): 'natural_language_processing',
+    ('computer', 'vision'): 'computer_vision',
+    ('data', 'analysis'): 'data_analysis',
+    ('data', 'science'): 'data_science',
+    ('data', 'engineering'): 'data_engineering',
+    ('project', 'management'): 'project_management',
+    ('product', 'management'): 'product_management',
+    ('google', 'cloud'): 'google_cloud',
+    ('microsoft', 'excel'): 'microsoft_excel',
+    ('power', 'bi'): 'power_bi',
+    ('spring', 'boot'): 'spring_boot',
+    ('ruby', 'on', 'rails'): 'ruby_on_rails',
+    ('unit', 'testing'): 'unit_testing',
+    ('rest', 'api'): 'rest_api',
+    ('restful', 'api'): 'rest_api',
+    ('user', 'experience'): 'user_experience',
+    ('amazon', 'web', 'services'): 'aws',
+    ('user', 'interface'): 'user_interface',
+    ('ci', 'cd'): 'ci_cd',
+    ('object', 'oriented', 'programming'): 'object_oriented_programming',
+}
+
+PHRASE_STARTS = frozenset(words[0] for words in SKILL_PHRASES)
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase text and split it into raw tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+def normalize_terms(text: str) -> List[str]:
+    """Turn free text into canonical skill/term tokens with stopwords removed"""
+    tokens = tokenize(text)
+    token_count = len(tokens)
+    terms = []
+    append = terms.append
+    i = 0
+    while i < token_count:
+        token = tokens[i]
+        if token in PHRASE_STARTS:
+            for length in (3, 2):
+                phrase = SKILL_PHRASES.get(tuple(tokens[i:i + length]))
+                if phrase:
+                    break
+            if phrase:
+                append(phrase)
+                i += length
+                continue
+        token = SKILL_ALIASES.get(token, token)
+        if token not in STOPWORDS and not token.isdigit():
+            append(token)
+        i += 1
+    return terms
+
+def normalize_skill(skill: str) -> str:
+    """Canonical identifier for a skill name, e.g. "Node.js" -> "nodejs", "Machine Learning" -> "machine_learning" """
+    terms = normalize_terms(skill)
+    return '_'.join(terms) if terms else skill.strip().lower()
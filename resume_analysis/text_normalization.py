@@ -0,0 +1,128 @@
+import re
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Tuple
+
+# Bullet glyphs PyMuPDF commonly emits at the start of a line
+BULLET_PATTERN = re.compile(r"^[ \t]*[•●○◦▪▫■□►▸▹‣⁃∙·➢➤✓✔❖◆◇\-–—*][ \t]+", re.MULTILINE)
+# Word broken across a line end with a hyphen ("develop-\nment", but also "full-\nstack")
+HYPHENATION_PATTERN = re.compile(r"(\w+)-[ \t]*\n[ \t]*([a-z]\w*)")
+# Line-end fragments that are word endings, not words: "develop-\nment" is "development"
+HYPHENATION_SUFFIXES = frozenset([
+    'able', 'ably', 'al', 'ally', 'ance', 'ant', 'ary', 'ate', 'ated', 'ation', 'ations',
+    'ed', 'ence', 'ent', 'er', 'ers', 'ible', 'ic', 'ical', 'ing', 'ings', 'ion', 'ions',
+    'ism', 'ist', 'ity', 'ive', 'ize', 'ized', 'izing', 'ise', 'ised', 'ly', 'ment',
+    'ments', 'ness', 'or', 'ors', 'ous', 'ship', 'sion', 'sions', 'tion', 'tions', 'ture',
+])
+WORD_PATTERN = re.compile(r"\w+")
+# Soft hyphens, zero-width characters and BOMs carry no content
+INVISIBLE_PATTERN = re.compile(r"[­​‌‍⁠﻿]")
+HORIZONTAL_SPACE_PATTERN = re.compile(r"[ \t ]+")
+BLANK_LINES_PATTERN = re.compile(r"\n{3,}")
+# Lines that say they are page numbers ("Page 2", "Page 2 of 3", "2 of 3")
+PAGE_MARKER_PATTERN = re.compile(r"^\s*(?:page\s*\d+(?:\s*(?:of|/)\s*\d+)?|\d+\s*of\s*\d+)\s*$", re.IGNORECASE)
+# Lines of only numbers ("2", "2/3", but also "2019" or "2015/2018"): page numbers
+# only when one sits at the same top/bottom position on several pages
+NUMERIC_LINE_PATTERN = re.compile(r"^[\s/\-\u2013]*\d[\d\s/\-\u2013]*$")
+DIGITS_PATTERN = re.compile(r"\d+")
+
+# Lines this close to the top/bottom of a page are header/footer candidates
+HEADER_FOOTER_DEPTH = 2
+
+def normalize_text(text: str) -> str:
+    """
+    Canonicalize extracted or pasted text: NFKC folding (ligatures, full-width
+    forms), dehyphenation, bullet canonicalization and whitespace collapse
+    """
+    text = unicodedata.normalize('NFKC', text)
+    text = INVISIBLE_PATTERN.sub('', text)
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    text = _dehyphenate(text)
+    text = BULLET_PATTERN.sub('- ', text)
+    text = HORIZONTAL_SPACE_PATTERN.sub(' ', text)
+    text = '\n'.join(line.strip() for line in text.split('\n'))
+    text = BLANK_LINES_PATTERN.sub('\n\n', text)
+    return text.strip()
+
+def _dehyphenate(text: str) -> str:
+    """
+    Rejoin words hyphenated across a line end. The hyphen is only dropped when the
+    joined word is known: the fragment is a word ending, or the document uses the
+    joined spelling elsewhere; otherwise it was a real hyphen ("full-stack")
+    """
+    known_words = None
+    
+    def rejoin(match):
+        nonlocal known_words
+        head, tail = match.group(1), match.group(2)
+        joined = head + tail
+        if tail.lower() in HYPHENATION_SUFFIXES:
+            return joined
+        if known_words is None:
+            known_words = set(WORD_PATTERN.findall(text.lower()))
+        return joined if joined.lower() in known_words else f'{head}-{tail}'
+    
+    return HYPHENATION_PATTERN.sub(rejoin, text)
+
+def _line_signature(line: str) -> str:
+    # Page numbers vary between pages, so digits are ignored when comparing lines
+    return DIGITS_PATTERN.sub('#', line.strip().lower())
+
+def _numeric_edge_positions(lines: List[str]) -> Dict[int, Tuple]:
+    """Line index -> (edge, depth, signature) of number-only lines at the top/bottom of a page"""
+    content = [index for index, line in enumerate(lines) if line.strip()]
+    positions = {}
+    for depth, index in enumerate(content[:HEADER_FOOTER_DEPTH]):
+        positions[index] = ('top', depth)
+    for depth, index in enumerate(reversed(content[-HEADER_FOOTER_DEPTH:])):
+        positions.setdefault(index, ('bottom', depth))
+    return {
+        index: position + (_line_signature(lines[index]),)
+        for index, position in positions.items()
+        if NUMERIC_LINE_PATTERN.match(lines[index])
+    }
+
+def remove_headers_and_footers(pages: List[str]) -> List[str]:
+    """
+    Drop page-number lines and lines repeated at the top/bottom of most pages
+    The first occurrence of a repeated line is kept, since page one's header is
+    usually the candidate's name. A number-only line is a page number only when it
+    says so ("Page 2", "2 of 3") or repeats at the same position, so dates survive
+    """
+    page_lines = [page.split('\n') for page in pages]
+    numeric_positions = [_numeric_edge_positions(lines) for lines in page_lines]
+    
+    repeated = set()
+    page_number_positions = set()
+    if len(pages) >= 2:
+        edge_counts = Counter()
+        position_counts = Counter()
+        for lines, positions in zip(page_lines, numeric_positions):
+            content = [line for line in lines if line.strip()]
+            edges = content[:HEADER_FOOTER_DEPTH] + content[-HEADER_FOOTER_DEPTH:]
+            # Number-only lines are matched by position instead, below
+            edge_counts.update({_line_signature(line) for line in edges if not NUMERIC_LINE_PATTERN.match(line)})
+            position_counts.update(set(positions.values()))
+        threshold = max(2, (len(pages) * 3 + 4) // 5)  # at least 60% of pages
+        repeated = {signature for signature, count in edge_counts.items() if count >= threshold}
+        page_number_positions = {position for position, count in position_counts.items() if count >= threshold}
+    
+    cleaned = []
+    kept = set()
+    for lines, positions in zip(page_lines, numeric_positions):
+        page = []
+        for index, line in enumerate(lines):
+            if PAGE_MARKER_PATTERN.match(line) or positions.get(index) in page_number_positions:
+                continue
+            signature = _line_signature(line)
+            if signature in repeated:
+                if signature in kept:
+                    continue
+                kept.add(signature)
+            page.append(line)
+        cleaned.append('\n'.join(page))
+    return cleaned
+
+def normalize_pages(pages: List[str]) -> str:
+    """Normalize the per-page text of a PDF into one clean document"""
+    return normalize_text('\n'.join(remove_headers_and_footers(pages)))
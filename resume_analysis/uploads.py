@@ -0,0 +1,23 @@
+import hashlib
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+
+class HashingTemporaryFileUploadHandler(TemporaryFileUploadHandler):
+    """
+    Spool every upload straight to a temporary file on disk and compute its
+    SHA-256 while the chunks stream in, so the file is never buffered in memory
+    and never has to be read again just to be hashed
+    The digest is exposed as ``uploaded_file.sha256``
+    """
+    
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.hasher = hashlib.sha256()
+    
+    def receive_data_chunk(self, raw_data, start):
+        self.hasher.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+    
+    def file_complete(self, file_size):
+        uploaded_file = super().file_complete(file_size)
+        uploaded_file.sha256 = self.hasher.hexdigest()
+        return uploaded_file
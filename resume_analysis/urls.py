@@ -6,8 +6,14 @@ app_name = 'resume_analysis'
 urlpatterns = [
     path('', views.resume_analysis_home, name='home'),
     path('results/<int:analysis_id>/', views.analysis_results, name='results'),
+    path('ocr/<int:job_id>/', views.ocr_job_status, name='ocr_status'),
     path('history/', views.analysis_history, name='history'),
     path('api/analyze/', views.api_analyze_resume, name='api_analyze'),
+    path('api/analyze-batch/', views.api_analyze_batch, name='api_analyze_batch'),
+    path('api/match-jobs/', views.api_match_jobs, name='api_match_jobs'),
+    path('api/history/', views.api_analysis_history, name='api_history'),
+    path('api/ocr-jobs/<int:job_id>/', views.api_ocr_job, name='api_ocr_job'),
+    path('api/skill-gaps/', views.api_skill_gaps, name='api_skill_gaps'),
 ]
 
 
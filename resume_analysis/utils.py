@@ -1,31 +1,142 @@
 import json
+import hashlib
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import fitz  # PyMuPDF
 import google.generativeai as genai
 from django.conf import settings
-from typing import Dict, List
+from django.core.cache import cache
+from typing import Dict, Iterator, List, Tuple
+from core.instrumentation import span
+from .courses import recommend_courses
+from .dedup import find_near_duplicate
+from .matching import register_job_description
+from .terms import normalize_skill
+from .text_normalization import normalize_pages
+
+logger = logging.getLogger(__name__)
 
 # Configure Gemini AI
 genai.configure(api_key=settings.GOOGLE_API_KEY)
 model = genai.GenerativeModel("gemini-2.0-flash")
 
-def analyze_resume_with_ai(resume_text: str, job_description: str) -> Dict:
+# Keyword extraction only depends on the job description, so it is cached per JD
+JD_KEYWORDS_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Resume files accepted by the bulk/recruiter tooling
+RESUME_FILE_EXTENSIONS = ('.pdf', '.txt')
+
+def _read_pdf_pages(doc) -> List[str]:
+    try:
+        return [page.get_text() for page in doc]
+    finally:
+        doc.close()
+
+def extract_pages_from_pdf(file_content: bytes) -> List[str]:
+    """Raw text of each page of a PDF held in memory"""
+    return _read_pdf_pages(fitz.open(stream=file_content, filetype="pdf"))
+
+def open_pdf_upload(uploaded_file):
     """
-    Analyze resume against job description using AI
-    Returns comprehensive analysis with scoring and recommendations
+    Open an uploaded PDF with PyMuPDF
+    Spooled uploads are opened by path so the PDF is never copied into a bytes object
     """
-    # print("=== STARTING RESUME ANALYSIS ===")
-    # print(f"Resume length: {len(resume_text)} chars")
-    # print(f"Job description length: {len(job_description)} chars")
-    
-    # Truncate inputs if too long to avoid API limits
-    max_resume_length = 8000
-    max_jd_length = 4000
-    
-    if len(resume_text) > max_resume_length:
-        resume_text = resume_text[:max_resume_length] + "..."
-    if len(job_description) > max_jd_length:
-        job_description = job_description[:max_jd_length] + "..."
+    if hasattr(uploaded_file, 'temporary_file_path'):
+        return fitz.open(uploaded_file.temporary_file_path())
+    uploaded_file.seek(0)
+    return fitz.open(stream=uploaded_file.read(), filetype="pdf")
+
+def extract_pages_from_upload(uploaded_file) -> List[str]:
+    """Raw text of each page of an uploaded PDF"""
+    return _read_pdf_pages(open_pdf_upload(uploaded_file))
+
+def extract_text_from_pdf(file_content: bytes) -> str:
+    """Extract normalized text from a PDF held in memory"""
+    return normalize_pages(extract_pages_from_pdf(file_content))
+
+def extract_pages_from_file(path: str) -> List[str]:
+    """Raw text of each page of a resume on disk (a plain text file is one page)"""
+    if str(path).lower().endswith('.pdf'):
+        return _read_pdf_pages(fitz.open(path))
+    with open(path, encoding='utf-8', errors='ignore') as f:
+        return [f.read()]
+
+def extract_text_from_file(path: str) -> str:
+    """Extract normalized text from a resume on disk (PDF or plain text)"""
+    return normalize_pages(extract_pages_from_file(path))
+
+# Inputs up to these sizes are analyzed in a single call; longer ones are split
+# into section-aligned chunks, analyzed concurrently and merged (map-reduce).
+# Chunks never exceed these sizes (the per-prompt limit) and there are at most
+# MAX_*_CHUNKS of them; text beyond that is left out of the analysis.
+MAX_RESUME_CHUNK_LENGTH = 8000
+MAX_JD_CHUNK_LENGTH = 4000
+MAX_RESUME_CHUNKS = 4
+MAX_JD_CHUNKS = 2
+
+# Short lines that open a new resume/JD section
+SECTION_HEADING_PATTERN = re.compile(
+    r"^\s*(?:[A-Z][A-Z &/\-]{2,40}|(?i:(?:professional\s+)?(?:summary|profile|objective|skills|technical skills|"
+    r"experience|work experience|employment|projects|education|certifications|publications|awards|"
+    r"responsibilities|requirements|qualifications|preferred qualifications|benefits|about (?:us|the role))))"
+    r"\s*:?\s*$",
+    re.MULTILINE
+)
+
+def split_into_sections(text: str) -> List[str]:
+    """Split text at section headings, keeping each heading with its content"""
+    starts = [match.start() for match in SECTION_HEADING_PATTERN.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    sections = [text[start:end] for start, end in zip(starts, starts[1:] + [len(text)])]
+    return [section for section in sections if section.strip()]
+
+def chunk_text(text: str, max_length: int) -> List[str]:
+    """Pack whole sections into chunks of at most max_length characters"""
+    pieces = []
+    for section in split_into_sections(text):
+        if len(section) <= max_length:
+            pieces.append(section)
+            continue
+        # Oversized section: fall back to line boundaries, then to a hard cut
+        for line in section.splitlines(keepends=True):
+            while len(line) > max_length:
+                pieces.append(line[:max_length])
+                line = line[max_length:]
+            pieces.append(line)
     
-    prompt = f"""
+    chunks = []
+    current = ''
+    for piece in pieces:
+        if current and len(current) + len(piece) > max_length:
+            chunks.append(current)
+            current = ''
+        current += piece
+    if current.strip():
+        chunks.append(current)
+    return chunks
+
+def fit_chunks(text: str, max_length: int, max_chunks: int) -> Tuple[List[str], bool]:
+    """
+    At most max_chunks chunks of at most max_length characters, and whether text
+    past max_chunks * max_length had to be dropped to get there
+    """
+    limit = max_length * max_chunks
+    truncated = len(text) > limit
+    if truncated:
+        # Cut at a line break where there is one, so no line is analyzed half
+        cut = text.rfind('\n', 0, limit)
+        text = text[:cut if cut > 0 else limit]
+    chunks = chunk_text(text, max_length)
+    if len(chunks) > max_chunks:
+        # Section boundaries leave each chunk part empty; pack at fixed offsets instead
+        chunks = [text[i:i + max_length] for i in range(0, len(text), max_length)]
+        chunks = [chunk for chunk in chunks if chunk.strip()]
+    return chunks, truncated
+
+def _build_analysis_prompt(resume_text: str, job_description: str) -> str:
+    return f"""
     Analyze the following resume and job description to provide a comprehensive assessment.
     
     Resume: {resume_text}
@@ -54,173 +165,145 @@ def analyze_resume_with_ai(resume_text: str, job_description: str) -> Dict:
     
     Keep the analysis professional and constructive. Return ONLY the JSON object.
     """
+
+def _strip_code_fence(response_text: str) -> str:
+    """Text of a JSON reply with any markdown code fence (```json ... ```) removed"""
+    response_text = response_text.strip()
+    if response_text.startswith('```'):
+        response_text = response_text[3:]
+        if response_text.startswith('json'):
+            response_text = response_text[4:]
+    if response_text.endswith('```'):
+        response_text = response_text[:-3]
+    return response_text.strip()
+
+def _request_analysis(resume_text: str, job_description: str) -> Dict:
+    """Run one analysis call and return the parsed, type-checked JSON result"""
+    with span(logger, 'analysis.ai_request', resume_chars=len(resume_text), jd_chars=len(job_description)):
+        response = model.generate_content(_build_analysis_prompt(resume_text, job_description))
     
-    try:
-        # print("Sending request to Gemini API...")
-        response = model.generate_content(prompt)
-        # print(f"Received response: {response.text[:200]}...")
-        
-        # Clean the response text to extract JSON
-        response_text = response.text.strip()
-        
-        # Remove any markdown formatting
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
-        
-        result = json.loads(response_text)
-        # print(f"Parsed JSON successfully: {result}")
-        
-        # Ensure all required fields are present with correct types
-        if not isinstance(result.get('match_score'), int):
-            result['match_score'] = 50
-        if not isinstance(result.get('keywords_found'), list):
-            result['keywords_found'] = []
-        if not isinstance(result.get('missing_skills'), list):
-            result['missing_skills'] = []
-        if not isinstance(result.get('analysis'), str):
-            result['analysis'] = 'Analysis completed successfully.'
-        # Generate enhanced recommendations including course suggestions
-        base_recommendations = [
-            "Tailor resume keywords to match job description requirements.",
-            "Highlight relevant experience and quantifiable achievements.",
-            "Add specific technical skills mentioned in the job posting.",
-            "Include industry-specific certifications and qualifications.",
-            "Optimize resume format for ATS compatibility and readability."
-        ]
-        
-        # Add course recommendations based on missing skills
-        missing_skills = result.get('missing_skills', [])
-        if missing_skills:
-            # Add 2-3 course recommendations based on missing skills
-            skill_courses = []
-            for skill in missing_skills[:3]:  # Limit to first 3 missing skills
-                if any(tech in skill.lower() for tech in ['python', 'programming', 'coding']):
-                    skill_courses.append(f"Consider taking Python programming courses on platforms like Coursera or Udemy to strengthen {skill} skills.")
-                elif any(data in skill.lower() for data in ['data', 'analytics', 'sql']):
-                    skill_courses.append(f"Enroll in data analysis courses or SQL certification programs to develop {skill} expertise.")
-                elif any(cloud in skill.lower() for cloud in ['aws', 'azure', 'cloud']):
-                    skill_courses.append(f"Pursue cloud certification courses (AWS, Azure, GCP) to gain {skill} competency.")
-                elif any(web in skill.lower() for web in ['javascript', 'react', 'web', 'frontend']):
-                    skill_courses.append(f"Take web development courses focusing on {skill} through online platforms.")
-                else:
-                    skill_courses.append(f"Look for professional courses or certifications related to {skill} to bridge this skill gap.")
-            
-            # Add course recommendations to the list
-            base_recommendations.extend(skill_courses[:2])  # Add max 2 course recommendations
-        
-        result['recommendations'] = base_recommendations
-        
-        # print(f"Final recommendations: {result['recommendations']}")
-        
-        # print(f"=== ANALYSIS COMPLETE ===")
-        return result
-        
-    except json.JSONDecodeError as e:
-        # print(f"JSON parsing error: {e}")
-        # print(f"Raw response: {response.text if 'response' in locals() else 'No response'}")
-        # Fallback response if JSON parsing fails
-        return {
-            "match_score": 50,
-            "keywords_found": ["Python", "Communication", "Problem Solving"],
-            "missing_skills": ["Advanced Data Analysis", "Cloud Computing (AWS/Azure)", "Machine Learning", "Project Management"],
-            "analysis": "Resume analysis completed. The system detected relevant skills and experience.",
-            "recommendations": ["Tailor resume keywords to match job description", "Highlight relevant experience", "Add specific technical skills mentioned in job posting"]
-        }
-    except Exception as e:
-        # print(f"General error in AI analysis: {e}")
-        # Fallback response if AI fails
-        return {
-            "match_score": 50,
-            "keywords_found": ["Python", "Communication", "Problem Solving"],
-            "missing_skills": ["Advanced Data Analysis", "Cloud Computing (AWS/Azure)", "Machine Learning", "Project Management"],
-            "analysis": f"Analysis could not be completed due to an error: {str(e)}",
-            "recommendations": ["Please try again or contact support if the issue persists."]
-        }
+    result = json.loads(_strip_code_fence(response.text))
     
-    # Original AI code commented out for debugging
+    # Ensure all required fields are present with correct types
+    if not isinstance(result.get('match_score'), int):
+        result['match_score'] = 50
+    if not isinstance(result.get('keywords_found'), list):
+        result['keywords_found'] = []
+    if not isinstance(result.get('missing_skills'), list):
+        result['missing_skills'] = []
+    if not isinstance(result.get('analysis'), str):
+        result['analysis'] = 'Analysis completed successfully.'
+    return result
+
+def _merge_unique(skill_lists: List[List[str]], exclude: set = frozenset()) -> List[str]:
+    """Ordered union of skill lists, deduplicated on the normalized skill id"""
+    merged = []
+    seen = set(exclude)
+    for skills in skill_lists:
+        for skill in skills:
+            if not isinstance(skill, str):
+                continue
+            skill_id = normalize_skill(skill)
+            if skill_id not in seen:
+                seen.add(skill_id)
+                merged.append(skill)
+    return merged
+
+def _reduce_analyses(results: List[List[Dict]], jd_chunks: List[str]) -> Dict:
     """
-    # Truncate inputs if too long to avoid API limits
-    max_resume_length = 8000
-    max_jd_length = 4000
-    
-    if len(resume_text) > max_resume_length:
-        resume_text = resume_text[:max_resume_length] + "..."
-    if len(job_description) > max_jd_length:
-        job_description = job_description[:max_jd_length] + "..."
+    Merge a grid of chunk analyses (results[jd_index][resume_index]) deterministically
+    - match score: best resume chunk per JD chunk, averaged weighted by JD chunk length
+    - keywords found: ordered union; missing skills: ordered union minus anything found
+    - analysis: texts of the three best-scoring chunk pairs, in document order
+    """
+    total_jd_length = sum(len(chunk) for chunk in jd_chunks) or 1
+    match_score = round(sum(
+        max(result['match_score'] for result in row) * len(jd_chunk)
+        for row, jd_chunk in zip(results, jd_chunks)
+    ) / total_jd_length)
     
-    prompt = f'''
-    Analyze the following resume and job description to provide a comprehensive assessment.
+    flat = [result for row in results for result in row]
+    keywords_found = _merge_unique([result['keywords_found'] for result in flat])
+    missing_skills = _merge_unique(
+        [result['missing_skills'] for result in flat],
+        exclude={normalize_skill(skill) for skill in keywords_found}
+    )
     
-    Resume: {resume_text}
+    best_positions = sorted(
+        sorted(range(len(flat)), key=lambda position: -flat[position]['match_score'])[:3]
+    )
+    analysis = '\n\n'.join(flat[position]['analysis'] for position in best_positions)
     
-    Job Description: {job_description}
+    return {
+        'match_score': max(0, min(100, match_score)),
+        'keywords_found': keywords_found,
+        'missing_skills': missing_skills,
+        'analysis': analysis,
+    }
+
+def _analyze_map_reduce(resume_text: str, job_description: str) -> Dict:
+    """Analyze every (resume chunk, JD chunk) pair concurrently and merge the results"""
+    resume_chunks, resume_truncated = fit_chunks(resume_text, MAX_RESUME_CHUNK_LENGTH, MAX_RESUME_CHUNKS)
+    jd_chunks, jd_truncated = fit_chunks(job_description, MAX_JD_CHUNK_LENGTH, MAX_JD_CHUNKS)
     
-    Please provide analysis in the following JSON format (return ONLY valid JSON, no other text):
-    {{
-        "match_score": 75,
-        "keywords_found": ["Python", "Django", "SQL"],
-        "missing_skills": ["React", "AWS"],
-        "analysis": "The resume shows strong technical skills...",
-        "recommendations": [
-            "Add React experience to strengthen frontend development skills",
-            "Include cloud platforms like AWS or Azure in your technical skills",
-            "Highlight specific project outcomes with quantifiable metrics"
-        ]
-    }}
+    pairs = [(resume_chunk, jd_chunk) for jd_chunk in jd_chunks for resume_chunk in resume_chunks]
+    max_workers = max(1, min(settings.RESUME_ANALYSIS_CHUNK_WORKERS, len(pairs)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        flat = list(executor.map(lambda pair: _request_analysis(*pair), pairs))
     
-    Focus on:
-    1. Keyword matching and relevance
-    2. Skills alignment
-    3. Experience fit
-    4. Specific areas for improvement
-    5. Actionable recommendations
+    results = [flat[i:i + len(resume_chunks)] for i in range(0, len(flat), len(resume_chunks))]
+    result = _reduce_analyses(results, jd_chunks)
     
-    Keep the analysis professional and constructive. Return ONLY the JSON object.
-    '''
+    notes = []
+    if resume_truncated:
+        notes.append(f'the resume was analyzed up to its first {sum(map(len, resume_chunks)):,} characters')
+    if jd_truncated:
+        notes.append(f'the job description was analyzed up to its first {sum(map(len, jd_chunks)):,} characters')
+    if notes:
+        logger.warning('Analysis input truncated: %s', '; '.join(notes))
+        result['truncated'] = True
+        result['analysis'] += f"\n\nNote: this text was too long to analyze in full; {' and '.join(notes)}."
+    return result
+
+def build_recommendations(missing_skills: List[str], job_description: str = '') -> List[str]:
+    """Generate enhanced recommendations including course suggestions"""
+    base_recommendations = [
+        "Tailor resume keywords to match job description requirements.",
+        "Highlight relevant experience and quantifiable achievements.",
+        "Add specific technical skills mentioned in the job posting.",
+        "Include industry-specific certifications and qualifications.",
+        "Optimize resume format for ATS compatibility and readability."
+    ]
     
+    # Add course recommendations for the missing skills the JD stresses most
+    base_recommendations.extend(recommend_courses(missing_skills, job_description, limit=2))
+    return base_recommendations
+
+def analyze_resume_with_ai(resume_text: str, job_description: str) -> Dict:
+    """
+    Analyze resume against job description using AI
+    Returns comprehensive analysis with scoring and recommendations
+    Inputs too long for one prompt are analyzed section by section (map-reduce)
+    When the AI fails a placeholder result with "fallback": True is returned
+    """
     try:
-        # print("Sending request to Gemini API...")
-        response = model.generate_content(prompt)
-        # print(f"Received response: {response.text[:200]}...")
-        
-        # Clean the response text to extract JSON
-        response_text = response.text.strip()
-        
-        # Remove any markdown formatting
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
-        
-        result = json.loads(response_text)
-        # print(f"Parsed JSON successfully: {result}")
-        
-        # Ensure all required fields are present with correct types
-        if not isinstance(result.get('match_score'), int):
-            result['match_score'] = 50
-        if not isinstance(result.get('keywords_found'), list):
-            result['keywords_found'] = []
-        if not isinstance(result.get('missing_skills'), list):
-            result['missing_skills'] = []
-        if not isinstance(result.get('analysis'), str):
-            result['analysis'] = 'Analysis completed successfully.'
-        if not isinstance(result.get('recommendations'), list):
-            if isinstance(result.get('recommendations'), str):
-                result['recommendations'] = [result['recommendations']]
+        with span(logger, 'analysis.analyze', resume_chars=len(resume_text), jd_chars=len(job_description)) as fields:
+            if len(resume_text) <= MAX_RESUME_CHUNK_LENGTH and len(job_description) <= MAX_JD_CHUNK_LENGTH:
+                result = _request_analysis(resume_text, job_description)
             else:
-                result['recommendations'] = []
-        
+                fields['map_reduce'] = True
+                result = _analyze_map_reduce(resume_text, job_description)
+            
+            with span(logger, 'analysis.recommendations'):
+                result['recommendations'] = build_recommendations(result.get('missing_skills', []), job_description)
+            fields['match_score'] = result.get('match_score')
         return result
-        
+    
     except json.JSONDecodeError as e:
-        # print(f"JSON parsing error: {e}")
-        # print(f"Raw response: {response.text if 'response' in locals() else 'No response'}")
+        logger.warning('Analysis response was not valid JSON: %s', e)
         # Fallback response if JSON parsing fails
         return {
+            "fallback": True,
             "match_score": 50,
             "keywords_found": ["Python", "Communication", "Problem Solving"],
             "missing_skills": ["Advanced Data Analysis", "Cloud Computing (AWS/Azure)", "Machine Learning", "Project Management"],
@@ -228,16 +311,20 @@ def analyze_resume_with_ai(resume_text: str, job_description: str) -> Dict:
             "recommendations": ["Tailor resume keywords to match job description", "Highlight relevant experience", "Add specific technical skills mentioned in job posting"]
         }
     except Exception as e:
-        # print(f"General error in AI analysis: {e}")
         # Fallback response if AI fails
+        logger.exception('Resume analysis failed')
         return {
+            "fallback": True,
             "match_score": 50,
             "keywords_found": ["Python", "Communication", "Problem Solving"],
             "missing_skills": ["Advanced Data Analysis", "Cloud Computing (AWS/Azure)", "Machine Learning", "Project Management"],
             "analysis": f"Analysis could not be completed due to an error: {str(e)}",
             "recommendations": ["Please try again or contact support if the issue persists."]
         }
-    """
+
+def is_fallback_result(result: Dict) -> bool:
+    """True for the placeholder analyze_resume_with_ai returns when the AI call or its parsing failed"""
+    return bool(result.get('fallback'))
 
 def extract_keywords_from_jd(job_description: str) -> List[str]:
     """Extract key skills and requirements from job description"""
@@ -258,10 +345,12 @@ def extract_keywords_from_jd(job_description: str) -> List[str]:
     """
     
     try:
-        response = model.generate_content(prompt)
-        keywords = json.loads(response.text)
+        with span(logger, 'analysis.jd_keywords', jd_chars=len(job_description)):
+            response = model.generate_content(prompt)
+        keywords = json.loads(_strip_code_fence(response.text))
         return keywords if isinstance(keywords, list) else []
-    except:
+    except Exception as e:
+        logger.warning('Keyword extraction failed: %s', type(e).__name__)
         return []
 
 def calculate_match_score(resume_text: str, job_description: str) -> int:
@@ -287,4 +376,68 @@ def calculate_match_score(resume_text: str, job_description: str) -> int:
     except:
         return 50  # Default score if AI fails
 
+def get_jd_keywords(job_description: str) -> List[str]:
+    """
+    Return keywords for a job description, extracting them at most once per JD
+    Near-duplicate postings (same text up to whitespace/boilerplate edits) share
+    the extraction stored on their JobPosting
+    """
+    cache_key = 'jd_keywords:' + hashlib.sha256(job_description.encode('utf-8')).hexdigest()
+    keywords = cache.get(cache_key)
+    if keywords is not None:
+        return keywords
+    
+    posting = register_job_description(job_description)
+    keywords = posting.keywords
+    if keywords is None:
+        duplicate = find_near_duplicate(job_description, exclude_id=posting.id)
+        if duplicate is not None:
+            keywords = duplicate.keywords
+        else:
+            keywords = extract_keywords_from_jd(job_description)
+        # An empty list usually means the AI call failed, so it is not persisted
+        if keywords:
+            posting.keywords = keywords
+            posting.save(update_fields=['keywords'])
+    
+    if keywords:
+        cache.set(cache_key, keywords, JD_KEYWORDS_CACHE_TIMEOUT)
+    return keywords
 
+def analyze_resume_batch(
+    resume_text: str,
+    job_descriptions: List[str],
+    max_workers: int = None,
+    include_keywords: bool = False
+) -> Iterator[Tuple[int, Dict]]:
+    """
+    Analyze one resume against several job descriptions concurrently
+    Yields (index, result) pairs in completion order; identical JDs are analyzed once
+    include_keywords adds 'jd_keywords', which costs an extra AI call per JD not seen before
+    """
+    if max_workers is None:
+        max_workers = settings.RESUME_BATCH_MAX_WORKERS
+    
+    # Group duplicate job descriptions so each distinct JD costs one analysis
+    indexes_by_jd = {}
+    for index, job_description in enumerate(job_descriptions):
+        indexes_by_jd.setdefault(job_description, []).append(index)
+    
+    if not indexes_by_jd:
+        return
+    
+    def analyze_one(job_description: str) -> Dict:
+        result = analyze_resume_with_ai(resume_text, job_description)
+        if include_keywords:
+            result['jd_keywords'] = get_jd_keywords(job_description)
+        return result
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(indexes_by_jd)))) as executor:
+        futures = {
+            executor.submit(analyze_one, job_description): indexes
+            for job_description, indexes in indexes_by_jd.items()
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            for index in futures[future]:
+                yield index, result
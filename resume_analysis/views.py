@@ -1,15 +1,31 @@
 import json
-import fitz  # PyMuPDF
+import logging
+import re
+from datetime import datetime, timedelta, timezone as dt_timezone
 from django.shortcuts import render, redirect
+from django.urls import reverse
+from django.db.models import Q
+from django.db.models.functions import Substr
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
 from django.utils import timezone
 from .forms import ResumeUploadForm, JobDescriptionForm
-from .models import ResumeAnalysis, ResumeUpload
-from .utils import analyze_resume_with_ai
+from .models import OCRJob, ResumeAnalysis, ResumeUpload
+from .utils import analyze_resume_with_ai, analyze_resume_batch, extract_pages_from_upload, is_fallback_result
+from .text_normalization import normalize_pages, normalize_text
+from .incremental import reanalyze_resume
+from .matching import match_jobs
+from .preflight import PreflightError, preflight_pdf
+from .aggregates import ALL, score_distribution, skill_gap_heatmap, top_missing_skills
+from .courses import get_course_catalog
+from .ocr import enqueue_ocr_job, ocr_available, resume_stale_ocr_job
+from core.instrumentation import span
+from core.ownership import owned_rows, remember_row
+
+logger = logging.getLogger(__name__)
 
 def resume_analysis_home(request):
     """Main resume analysis page"""
@@ -20,120 +36,91 @@ def resume_analysis_home(request):
         if resume_form.is_valid() and jd_form.is_valid():
             # Extract text from PDF FIRST (before saving form which consumes file pointer)
             try:
-                # Debugging file upload
-                # print("=== DEBUGGING FILE UPLOAD ===")
-                # print(f"request.FILES keys: {list(request.FILES.keys())}")
-                
                 if 'resume_file' not in request.FILES:
                     messages.error(request, "No file was uploaded. Please select a PDF file.")
                     return redirect('resume_analysis:home')
                 
                 uploaded_file = request.FILES['resume_file']
-                # print(f"File name: {uploaded_file.name}")
-                # print(f"File size: {uploaded_file.size}")
-                # print(f"Content type: {uploaded_file.content_type}")
+                logger.debug('Resume upload: %d bytes, %s', uploaded_file.size, uploaded_file.content_type)
                 
-                if uploaded_file.size == 0:
-                    messages.error(request, "The uploaded file is empty. Please check your file and try again.")
+                # Reject empty, encrypted, scanned or oversized PDFs before extraction
+                try:
+                    preflight_pdf(uploaded_file)
+                except PreflightError as e:
+                    # Scanned PDFs go to the OCR queue instead of being rejected
+                    if e.route == 'ocr' and ocr_available():
+                        return _queue_ocr_job(request, resume_form, jd_form, uploaded_file)
+                    messages.error(request, e.message)
                     return redirect('resume_analysis:home')
                 
-                # Reset file pointer to beginning
-                uploaded_file.seek(0)
+                # Extract text page by page straight from the spooled upload
+                with span(logger, 'analysis.extract_text', bytes=uploaded_file.size) as fields:
+                    pages = extract_pages_from_upload(uploaded_file)
+                    fields['pages'] = len(pages)
                 
-                # Read file content into memory
-                file_content = uploaded_file.read()
-                # print(f"File content read: {len(file_content)} bytes")
-                
-                if len(file_content) == 0:
-                    messages.error(request, "Could not read file content. Please try uploading again.")
-                    return redirect('resume_analysis:home')
-                
-                # Open PDF from memory
-                doc = fitz.open(stream=file_content, filetype="pdf")
-                # print(f"PDF opened successfully, pages: {doc.page_count}")
-                
-                if doc.page_count == 0:
+                if not pages:
                     messages.error(request, "The PDF file has no pages.")
-                    doc.close()
                     return redirect('resume_analysis:home')
                 
-                resume_text = ""
-                for page_num in range(doc.page_count):
-                    page = doc[page_num]
-                    page_text = page.get_text()
-                    resume_text += page_text + "\n"
-                    # print(f"Page {page_num + 1} text length: {len(page_text)}")
+                raw_resume_text = "".join(page_text + "\n" for page_text in pages)
                 
-                doc.close()
-                
-                if not resume_text.strip():
+                if not raw_resume_text.strip():
                     messages.error(request, "Could not extract text from the PDF. The file might be a scanned image or password protected.")
                     return redirect('resume_analysis:home')
                 
-                # print(f"Total extracted text length: {len(resume_text)} characters")
-                # print(f"First 200 chars: {resume_text[:200]}")
+                # Normalize once at ingestion; the raw text is stored alongside
+                resume_text = normalize_pages(pages)
                 
                 # Reset file pointer again for form save
                 uploaded_file.seek(0)
                 
-                # Now save the form
+                # Now save the form; storage moves the spooled temp file instead of copying it
                 resume_upload = resume_form.save(commit=False)
                 resume_upload.user = None  # No user authentication required
                 resume_upload.original_filename = uploaded_file.name
+                resume_upload.sha256 = getattr(uploaded_file, 'sha256', '')
                 resume_upload.save()
-                
+            
             except Exception as e:
-                # print(f"PDF processing error: {str(e)}")
-                import traceback
-                # traceback.print_exc()
+                logger.exception('PDF processing failed')
                 messages.error(request, f"Error processing PDF: {str(e)}. Please ensure you're uploading a valid PDF file.")
                 return redirect('resume_analysis:home')
             
             # Get job description
-            job_description = jd_form.cleaned_data['job_description']
+            job_description = normalize_text(jd_form.cleaned_data['job_description'])
             
             # Perform AI analysis
             try:
-                # print(f"Starting AI analysis for resume length: {len(resume_text)} chars, JD length: {len(job_description)} chars")
-                analysis_result = analyze_resume_with_ai(resume_text, job_description)
-                # print(f"AI analysis completed: {analysis_result}")
+                # Re-uploads of a lightly edited resume reuse the previous analysis
+                previous_id = request.session.get('resume_analysis', {}).get('analysis_id')
+                previous_analysis = ResumeAnalysis.objects.filter(id=previous_id).first() if previous_id else None
+                analysis_result = reanalyze_resume(resume_text, job_description, previous_analysis)
                 
                 # Save analysis to database
                 analysis = ResumeAnalysis.objects.create(
                     user=None,  # No user authentication required
                     resume_text=resume_text,
+                    resume_text_raw=raw_resume_text,
                     job_description=job_description,
                     analysis_result=analysis_result.get('analysis', 'Analysis completed'),
                     match_score=analysis_result.get('match_score', 50),
                     keywords_found=analysis_result.get('keywords_found', []),
                     missing_skills=analysis_result.get('missing_skills', []),
-                    recommendations=analysis_result.get('recommendations', [])
+                    recommendations=analysis_result.get('recommendations', []),
+                    previous_analysis=previous_analysis,
+                    delta=analysis_result.get('delta', {}),
+                    is_fallback=is_fallback_result(analysis_result)
                 )
                 
                 messages.success(request, 'Resume analysis completed successfully!')
                 
                 # Store comprehensive analysis data in session for other modules
-                request.session['resume_analysis'] = {
-                    'resume_text': resume_text,
-                    'job_description': job_description,
-                    'analysis_result': analysis_result,
-                    'analysis_id': analysis.id,
-                    'created_at': analysis.created_at.isoformat(),
-                    'match_score': analysis_result.get('match_score', 50),
-                    'keywords_found': analysis_result.get('keywords_found', []),
-                    'missing_skills': analysis_result.get('missing_skills', []),
-                    'recommendations': analysis_result.get('recommendations', [])
-                }
-                request.session['has_recent_analysis'] = True
-                request.session['analysis_completed'] = True
-                request.session.modified = True
+                _remember_analysis(request, analysis, analysis_result)
                 
                 return redirect('resume_analysis:results', analysis_id=analysis.id)
-                
+            
             except Exception as e:
-                # print(f"Error during analysis: {str(e)}")
-                import traceback
-                # traceback.print_exc()
+                logger.exception('Resume analysis request failed')
                 messages.error(request, f'Error during analysis: {str(e)}')
                 return redirect('resume_analysis:home')
     else:
@@ -146,6 +133,81 @@ def resume_analysis_home(request):
     }
     return render(request, 'resume_analysis/home.html', context)
 
+def _remember_analysis(request, analysis, analysis_result):
+    """Store the analysis in the session, where the other modules pick it up"""
+    request.session['resume_analysis'] = {
+        'resume_text': analysis.resume_text,
+        'job_description': analysis.job_description,
+        'analysis_result': analysis_result,
+        'analysis_id': analysis.id,
+        'created_at': analysis.created_at.isoformat(),
+        'match_score': analysis_result.get('match_score', 50),
+        'keywords_found': analysis_result.get('keywords_found', []),
+        'missing_skills': analysis_result.get('missing_skills', []),
+        'recommendations': analysis_result.get('recommendations', [])
+    }
+    request.session['has_recent_analysis'] = True
+    request.session['analysis_completed'] = True
+    request.session.modified = True
+
+def _owned_analyses(request):
+    """Analyses the caller may read: the session's latest one and, when signed in, their own"""
+    owned = Q(id=request.session.get('resume_analysis', {}).get('analysis_id'))
+    if request.user.is_authenticated:
+        owned |= Q(user=request.user)
+    return ResumeAnalysis.objects.filter(owned)
+
+def _queue_ocr_job(request, resume_form, jd_form, uploaded_file):
+    """Save a scanned upload and queue it for OCR and analysis off the request path"""
+    uploaded_file.seek(0)
+    resume_upload = resume_form.save(commit=False)
+    resume_upload.user = None
+    resume_upload.original_filename = uploaded_file.name
+    resume_upload.sha256 = getattr(uploaded_file, 'sha256', '')
+    resume_upload.save()
+    
+    job = OCRJob.objects.create(
+        upload=resume_upload,
+        job_description=normalize_text(jd_form.cleaned_data['job_description']),
+    )
+    # Only this session may follow the job (and pick up its analysis)
+    remember_row(request, job)
+    enqueue_ocr_job(job)
+    messages.info(request, "Your PDF is a scanned image, so we're reading it with OCR. This can take a minute.")
+    return redirect('resume_analysis:ocr_status', job_id=job.id)
+
+def ocr_job_status(request, job_id):
+    """Progress page for a queued OCR job; forwards to the results once analyzed"""
+    job = owned_rows(request, OCRJob.objects).select_related('analysis').filter(id=job_id).first()
+    if job is None:
+        raise Http404('OCR job not found')
+    if resume_stale_ocr_job(job_id):
+        job.refresh_from_db()
+    
+    if job.status == 'completed' and job.analysis:
+        analysis = job.analysis
+        _remember_analysis(request, analysis, {
+            'analysis': analysis.analysis_result,
+            'match_score': analysis.match_score,
+            'keywords_found': analysis.keywords_found,
+            'missing_skills': analysis.missing_skills,
+            'recommendations': analysis.recommendations,
+        })
+        return redirect('resume_analysis:results', analysis_id=analysis.id)
+    
+    context = {
+        'job': job,
+    }
+    return render(request, 'resume_analysis/ocr_status.html', context)
+
+def api_ocr_job(request, job_id):
+    """JSON status of an OCR job, polled by the progress page"""
+    jobs = owned_rows(request, OCRJob.objects).filter(id=job_id)
+    if not jobs.exists():
+        return JsonResponse({'error': 'OCR job not found'}, status=404)
+    resume_stale_ocr_job(job_id)
+    return JsonResponse(jobs.values('status', 'page_count', 'pages_done', 'error', 'analysis_id').first())
+
 def analysis_results(request, analysis_id):
     """Display analysis results"""
     try:
@@ -159,14 +221,69 @@ def analysis_results(request, analysis_id):
     }
     return render(request, 'resume_analysis/results.html', context)
 
+# History rows per page; pages are addressed by a (created_at, id) cursor
+HISTORY_PAGE_SIZE = 25
+HISTORY_PREVIEW_LENGTH = 60
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+def _encode_history_cursor(analysis) -> str:
+    microseconds = (analysis.created_at - EPOCH) // timedelta(microseconds=1)
+    return f'{microseconds}-{analysis.id}'
+
+def _history_page(cursor: str, page_size: int = HISTORY_PAGE_SIZE):
+    """
+    One page of the analysis history, newest first, and the cursor of the next page
+    Only the listed columns are loaded; the job description is cut down in SQL
+    """
+    analyses = (
+        ResumeAnalysis.objects.only('id', 'created_at', 'match_score')
+        .annotate(job_description_preview=Substr('job_description', 1, HISTORY_PREVIEW_LENGTH))
+        .order_by('-created_at', '-id')
+    )
+    if cursor:
+        microseconds, analysis_id = (int(part) for part in cursor.split('-', 1))
+        created_at = EPOCH + timedelta(microseconds=microseconds)
+        analyses = analyses.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=analysis_id))
+    
+    rows = list(analyses[:page_size + 1])
+    next_cursor = _encode_history_cursor(rows[page_size - 1]) if len(rows) > page_size else None
+    return rows[:page_size], next_cursor
+
 def analysis_history(request):
-    """Display user's analysis history"""
-    analyses = ResumeAnalysis.objects.all()  # Show all analyses since no user auth
+    """Display analysis history, one keyset-paginated page at a time"""
+    try:
+        analyses, next_cursor = _history_page(request.GET.get('cursor', ''))
+    except ValueError:
+        return redirect('resume_analysis:history')
     context = {
         'analyses': analyses,
+        'next_cursor': next_cursor,
+        'is_first_page': not request.GET.get('cursor'),
     }
     return render(request, 'resume_analysis/history.html', context)
 
+def api_analysis_history(request):
+    """JSON listing of the analysis history for infinite scroll"""
+    try:
+        page_size = max(1, min(int(request.GET.get('limit', HISTORY_PAGE_SIZE)), 100))
+        analyses, next_cursor = _history_page(request.GET.get('cursor', ''), page_size)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid cursor or limit'}, status=400)
+    
+    return JsonResponse({
+        'results': [
+            {
+                'id': analysis.id,
+                'created_at': analysis.created_at.isoformat(),
+                'match_score': analysis.match_score,
+                'job_description_preview': analysis.job_description_preview,
+                'url': reverse('resume_analysis:results', args=[analysis.id]),
+            }
+            for analysis in analyses
+        ],
+        'next_cursor': next_cursor,
+    })
+
 @csrf_exempt
 def api_analyze_resume(request):
     """API endpoint for resume analysis"""
@@ -175,8 +292,8 @@ def api_analyze_resume(request):
     
     try:
         data = json.loads(request.body)
-        resume_text = data.get('resume_text', '')
-        job_description = data.get('job_description', '')
+        resume_text = normalize_text(data.get('resume_text', ''))
+        job_description = normalize_text(data.get('job_description', ''))
         
         if not resume_text or not job_description:
             return JsonResponse({'error': 'Missing required fields'}, status=400)
@@ -184,9 +301,128 @@ def api_analyze_resume(request):
         # Perform analysis
         result = analyze_resume_with_ai(resume_text, job_description)
         return JsonResponse(result)
-        
+    
     except json.JSONDecodeError:
         return JsonResponse({'error': 'Invalid JSON'}, status=400)
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
+@csrf_exempt
+def api_analyze_batch(request):
+    """
+    API endpoint analyzing one resume against many job descriptions
+    Accepts JSON ({"resume_text", "job_descriptions"}) or a multipart upload
+    (resume_file plus repeated job_descriptions fields) and streams one
+    NDJSON line per job description as soon as its analysis completes
+    include_keywords=true adds each JD's extracted keywords (one more AI call per new JD)
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    
+    try:
+        if request.content_type == 'multipart/form-data':
+            uploaded_file = request.FILES.get('resume_file')
+            if not uploaded_file:
+                return JsonResponse({'error': 'Missing resume_file'}, status=400)
+            try:
+                preflight_pdf(uploaded_file)
+            except PreflightError as e:
+                return JsonResponse({'error': e.message, 'reason': e.reason, 'route': e.route}, status=400)
+            resume_text = normalize_pages(extract_pages_from_upload(uploaded_file))
+            job_descriptions = request.POST.getlist('job_descriptions')
+            include_keywords = request.POST.get('include_keywords', '').lower() == 'true'
+        else:
+            data = json.loads(request.body)
+            if not isinstance(data, dict):
+                return JsonResponse({'error': 'Request body must be a JSON object'}, status=400)
+            resume_text = data.get('resume_text', '')
+            if not isinstance(resume_text, str):
+                return JsonResponse({'error': 'resume_text must be a string'}, status=400)
+            include_keywords = data.get('include_keywords', False)
+            if not isinstance(include_keywords, bool):
+                return JsonResponse({'error': 'include_keywords must be a boolean'}, status=400)
+            resume_text = normalize_text(resume_text)
+            job_descriptions = data.get('job_descriptions', [])
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': f'Could not read resume: {str(e)}'}, status=400)
+    
+    if not isinstance(job_descriptions, list) or not all(isinstance(jd, str) and jd.strip() for jd in job_descriptions):
+        return JsonResponse({'error': 'job_descriptions must be a list of non-empty strings'}, status=400)
+    if not resume_text.strip() or not job_descriptions:
+        return JsonResponse({'error': 'Missing required fields'}, status=400)
+    if len(job_descriptions) > settings.RESUME_BATCH_MAX_JDS:
+        return JsonResponse({'error': f'At most {settings.RESUME_BATCH_MAX_JDS} job descriptions per request'}, status=400)
+    job_descriptions = [normalize_text(jd) for jd in job_descriptions]
+    
+    def stream_results():
+        for index, result in analyze_resume_batch(resume_text, job_descriptions, include_keywords=include_keywords):
+            yield json.dumps({'index': index, **result}) + '\n'
+    
+    response = StreamingHttpResponse(stream_results(), content_type='application/x-ndjson')
+    # Let reverse proxies forward each line as soon as it is produced
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+@csrf_exempt
+def api_match_jobs(request):
+    """API endpoint ranking stored job descriptions against a resume"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+    
+    try:
+        data = json.loads(request.body)
+        if not isinstance(data, dict):
+            return JsonResponse({'error': 'Expected a JSON object'}, status=400)
+        resume_text = data.get('resume_text', '')
+        if not isinstance(resume_text, str):
+            return JsonResponse({'error': 'resume_text must be a string'}, status=400)
+        top_k = data.get('top_k', 20)
+        if isinstance(top_k, bool) or not isinstance(top_k, (int, str)):
+            return JsonResponse({'error': 'top_k must be an integer'}, status=400)
+        try:
+            top_k = max(1, min(int(top_k), 100))
+        except ValueError:
+            return JsonResponse({'error': 'top_k must be an integer'}, status=400)
+        
+        if not resume_text and data.get('analysis_id'):
+            analysis = _owned_analyses(request).only('resume_text').filter(id=data['analysis_id']).first()
+            resume_text = analysis.resume_text if analysis else ''
+        
+        if not resume_text:
+            return JsonResponse({'error': 'Missing required fields'}, status=400)
+        
+        return JsonResponse({'matches': match_jobs(resume_text, top_k)})
+    
+    except (json.JSONDecodeError, TypeError, ValueError):
+        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+SKILL_GAP_PERIOD_PATTERN = re.compile(r'^(all|\d{4}-W\d{2})$')
+
+def api_skill_gaps(request):
+    """
+    Precomputed skill-gap and score aggregates for one period and JD category
+    Reads a bounded number of aggregate rows, however many analyses are stored
+    """
+    period = request.GET.get('period', ALL)
+    category = request.GET.get('category', ALL)
+    if not SKILL_GAP_PERIOD_PATTERN.match(period):
+        return JsonResponse({'error': "period must be 'all' or an ISO week such as 2024-W35"}, status=400)
+    if category != ALL and category not in get_course_catalog().categories:
+        return JsonResponse({'error': 'Unknown category'}, status=400)
+    try:
+        limit = max(1, min(int(request.GET.get('limit', 10)), 50))
+        weeks = max(1, min(int(request.GET.get('weeks', 8)), 52))
+    except ValueError:
+        return JsonResponse({'error': 'limit and weeks must be integers'}, status=400)
+    
+    return JsonResponse({
+        'period': period,
+        'category': category,
+        'top_missing_skills': top_missing_skills(period, category, limit),
+        'score_distribution': score_distribution(period, category),
+        'heatmap': skill_gap_heatmap(category, weeks, limit),
+    })
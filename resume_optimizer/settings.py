@@ -129,10 +129,88 @@ EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 # Google Gemini API
 GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
 
+# Resume upload pre-flight limits
+RESUME_MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB
+RESUME_MAX_PAGES = int(os.getenv('RESUME_MAX_PAGES', '20'))
+RESUME_PREFLIGHT_SAMPLE_PAGES = 3
+
+# Concurrent AI calls per analysis of a resume or JD too long for one prompt
+RESUME_ANALYSIS_CHUNK_WORKERS = int(os.getenv('RESUME_ANALYSIS_CHUNK_WORKERS', '4'))
+
+# Incremental re-analysis: edits below this share of the resume are rescored
+# locally when the job description is (nearly) unchanged
+RESUME_INCREMENTAL_CHANGE_THRESHOLD = 0.15
+RESUME_INCREMENTAL_JD_SIMILARITY = 0.9
+
+# Skill -> course recommendation catalog (edit the JSON to add skill families)
+COURSE_CATALOG_PATH = os.getenv('COURSE_CATALOG_PATH', os.path.join(BASE_DIR, 'resume_analysis', 'data', 'course_catalog.json'))
+
+# Rules for stripping the model's chatter from generated resumes, cover letters and tips
+CHATTER_RULES_PATH = os.getenv('CHATTER_RULES_PATH', os.path.join(BASE_DIR, 'core', 'data', 'chatter_rules.json'))
+
+# Batch resume analysis (one resume against many job descriptions)
+RESUME_BATCH_MAX_JDS = int(os.getenv('RESUME_BATCH_MAX_JDS', '25'))
+RESUME_BATCH_MAX_WORKERS = int(os.getenv('RESUME_BATCH_MAX_WORKERS', '4'))
+
+# OCR fallback for scanned (image-only) resume PDFs
+# 300 DPI grayscale is the resolution Tesseract is trained for; lower loses small fonts
+OCR_ENGINE = os.getenv('OCR_ENGINE', 'resume_analysis.ocr.TesseractEngine')
+OCR_TESSERACT_CMD = os.getenv('OCR_TESSERACT_CMD', 'tesseract')
+OCR_LANGUAGE = os.getenv('OCR_LANGUAGE', 'eng')
+OCR_DPI = int(os.getenv('OCR_DPI', '300'))
+OCR_PAGE_TIMEOUT = int(os.getenv('OCR_PAGE_TIMEOUT', '60'))  # Seconds per page
+OCR_MAX_CONCURRENT_JOBS = int(os.getenv('OCR_MAX_CONCURRENT_JOBS', '2'))
+OCR_PAGE_WORKERS = int(os.getenv('OCR_PAGE_WORKERS', '4'))  # Shared by all jobs
+OCR_PAGES_IN_FLIGHT_PER_JOB = int(os.getenv('OCR_PAGES_IN_FLIGHT_PER_JOB', '2'))
+OCR_STALE_AFTER = int(os.getenv('OCR_STALE_AFTER', '1800'))  # Seconds without progress before a job is re-queued
+
+# PDF rendering: TTF used for text outside Latin-1 (default: first DejaVu/Arial found)
+PDF_UNICODE_FONT = os.getenv('PDF_UNICODE_FONT', '')
+PDF_UNICODE_BOLD_FONT = os.getenv('PDF_UNICODE_BOLD_FONT', '')
+
+# Speculative tailoring: started when a template is picked, reused if the form is submitted unchanged
+TAILORING_SPECULATION = os.getenv('TAILORING_SPECULATION', 'True').lower() == 'true'
+TAILORING_SPECULATION_WORKERS = int(os.getenv('TAILORING_SPECULATION_WORKERS', '4'))
+TAILORING_SPECULATION_TTL = int(os.getenv('TAILORING_SPECULATION_TTL', '900'))  # Seconds
+
+# Rendered download cache (least recently used files are evicted past the size cap)
+ARTIFACT_CACHE_DIR = os.getenv('ARTIFACT_CACHE_DIR', os.path.join(BASE_DIR, 'artifact_cache'))
+ARTIFACT_CACHE_MAX_BYTES = int(os.getenv('ARTIFACT_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))
+
+# Bulk ZIP export of the history (see core.export)
+EXPORT_WORKERS = int(os.getenv('EXPORT_WORKERS', '4'))
+EXPORT_FILES_IN_FLIGHT = int(os.getenv('EXPORT_FILES_IN_FLIGHT', '8'))  # Rendered files held at once
+
+# Logging for the app modules (see core.instrumentation): written from a background
+# thread, JSON by default; LOG_SPAN_SAMPLE_RATE is the share of traces whose timing spans are kept
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')  # 'json' or 'text'
+LOG_SPAN_SAMPLE_RATE = float(os.getenv('LOG_SPAN_SAMPLE_RATE', '1.0'))
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'core.instrumentation.JsonFormatter'},
+        'text': {'format': '%(asctime)s %(levelname)s %(name)s %(message)s'},
+    },
+    'handlers': {
+        'app': {
+            'class': 'core.instrumentation.QueuedStreamHandler',
+            'formatter': LOG_FORMAT,
+        },
+    },
+    'loggers': {
+        app: {'handlers': ['app'], 'level': LOG_LEVEL, 'propagate': False}
+        for app in ['core', 'resume_analysis', 'resume_tailoring', 'cover_letter', 'interview_prep', 'clothing_advisor']
+    },
+}
+
 # Fashion Dataset Path
 FASHION_DATASET_PATH = os.path.join(BASE_DIR, 'scraped_fashion_products.csv')
 
 # File upload settings
+# Uploads are spooled to disk and hashed while streaming (see resume_analysis.uploads)
+FILE_UPLOAD_HANDLERS = ['resume_analysis.uploads.HashingTemporaryFileUploadHandler']
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 
@@ -0,0 +1,217 @@
+import hashlib
+import html
+import logging
+import re
+from typing import List, Tuple
+from django.core.cache import cache
+from fpdf import XPos, YPos
+from core.instrumentation import span
+from core.pdf import CORE_FONT_FAMILY, TYPOGRAPHY_TRANSLATION, needs_unicode_font, new_pdf, pdf_bytes, to_latin1
+
+logger = logging.getLogger(__name__)
+
+# Parsed resume document shared by every output format, so the text is classified once
+# per resume version instead of once per view. A document is a tuple of blocks:
+#   (kind, runs) with kind one of BLOCK_KINDS and runs a tuple of (text, bold) pairs
+# Headers (all-caps lines, known section names and lines entirely in **bold**) are
+# upper-cased; bullets drop their marker; an 'activity' block is a bold category run
+# followed by a comma-separated list of items.
+
+BLOCK_KINDS = ('blank', 'header', 'separator', 'bullet', 'activity', 'text')
+
+# Part of every download's cache key; bump when parsing or any emitter changes output
+RENDERER_VERSION = '3'
+DOCUMENT_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Lines treated as section headings, besides all-caps lines
+SECTION_KEYWORDS = frozenset([
+    'summary', 'skills', 'experience', 'education', 'certifications',
+    'work experience', 'relevant skills', 'professional summary',
+    'certifications & activities', 'achievements', 'projects',
+    'technical skills', 'soft skills', 'career objective'
+])
+MARKDOWN_EMPHASIS = re.compile(r'\*\*|__')
+SEPARATOR = re.compile(r'===|---|~~~')
+BULLET = re.compile(r'^(?:\* |\u2022 |\*)\s*')
+ACTIVITY_LINE = re.compile(r'competitions:|social contributions:|extra curriculum:|projects/research:', re.IGNORECASE)
+MAX_HEADING_LENGTH = 80
+
+def _runs(line: str) -> Tuple[Tuple[str, bool], ...]:
+    """**bold** / __bold__ spans of a line; an unmatched marker is dropped"""
+    parts = MARKDOWN_EMPHASIS.split(line)
+    if len(parts) % 2 == 0:
+        parts[-2:] = [parts[-2] + parts[-1]]
+    return tuple((part, index % 2 == 1) for index, part in enumerate(parts) if part)
+
+def plain(runs) -> str:
+    return ''.join(text for text, _ in runs)
+
+def _is_bold_line(runs) -> bool:
+    """A line written entirely in **bold**, which the model uses for headings"""
+    return bool(runs) and all(bold for _, bold in runs)
+
+def build_document(text: str) -> Tuple:
+    """Classify each line of resume text into a block"""
+    blocks = []
+    for line in text.translate(TYPOGRAPHY_TRANSLATION).split('\n'):
+        runs = _runs(line.strip())
+        clean_line = plain(runs)
+        if not clean_line:
+            blocks.append(('blank', ()))
+        elif len(clean_line) < MAX_HEADING_LENGTH and (
+            clean_line.isupper() or clean_line.lower() in SECTION_KEYWORDS or _is_bold_line(runs)
+        ):
+            blocks.append(('header', ((clean_line.upper(), True),)))
+        elif SEPARATOR.search(clean_line):
+            blocks.append(('separator', ()))
+        elif clean_line.startswith(('*', '\u2022 ')):
+            blocks.append(('bullet', _runs(BULLET.sub('', line.strip(), count=1))))
+        elif len(clean_line) > 100 and ':' in clean_line and ACTIVITY_LINE.search(clean_line):
+            category, items = clean_line.split(':', 1)
+            blocks.append(('activity', ((category + ':', True), (items.strip(), False))))
+        else:
+            blocks.append(('text', runs))
+    return tuple(blocks)
+
+def get_document(text: str) -> Tuple:
+    """build_document(text), cached per resume version (the hash of its text)"""
+    key = f"resume_document:{RENDERER_VERSION}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+    document = cache.get(key)
+    if document is None:
+        with span(logger, 'document.build', chars=len(text)) as fields:
+            document = build_document(text)
+            fields['blocks'] = len(document)
+        cache.set(key, document, DOCUMENT_CACHE_TIMEOUT)
+    return document
+
+def activity_items(runs) -> List[str]:
+    """Items of an 'activity' block"""
+    return [item.strip() for item in runs[1][0].split(',') if item.strip()]
+
+def to_text(document) -> str:
+    """Plain text: headers in capitals, '- ' bullets, emphasis markers removed"""
+    lines = []
+    for kind, runs in document:
+        if kind == 'separator':
+            lines.append('---')
+        elif kind == 'bullet':
+            lines.append('- ' + plain(runs))
+        elif kind == 'activity':
+            lines.append(f"{runs[0][0]} {runs[1][0]}")
+        else:
+            lines.append(plain(runs))
+    return '\n'.join(lines).strip('\n') + '\n'
+
+def _markdown_runs(runs) -> str:
+    return ''.join(f'**{text.strip()}**' if bold and text.strip() else text for text, bold in runs)
+
+def to_markdown(document) -> str:
+    lines = []
+    for kind, runs in document:
+        if kind == 'header':
+            lines.extend(['', f'## {plain(runs).title()}', ''])
+        elif kind == 'separator':
+            lines.extend(['', '---', ''])
+        elif kind == 'bullet':
+            lines.append('- ' + _markdown_runs(runs))
+        elif kind == 'activity':
+            lines.append(f"**{runs[0][0]}**")
+            lines.extend(f'- {item}' for item in activity_items(runs))
+        else:
+            # Two trailing spaces keep consecutive lines (name, contact details) apart
+            lines.append(_markdown_runs(runs) + '  ' if runs else '')
+    markdown = re.sub(r'\n{3,}', '\n\n', '\n'.join(lines))
+    return markdown.strip('\n') + '\n'
+
+def _html_runs(runs) -> str:
+    return ''.join(f'<strong>{html.escape(text)}</strong>' if bold else html.escape(text) for text, bold in runs)
+
+def to_html(document, standalone: bool = False, title: str = 'Resume') -> str:
+    """HTML fragment for the preview page, or a complete page for download"""
+    parts = []
+    in_list = False
+    for kind, runs in document:
+        if kind != 'bullet' and in_list:
+            parts.append('</ul>')
+            in_list = False
+        if kind == 'header':
+            parts.append(f'<h3>{html.escape(plain(runs))}</h3>')
+        elif kind == 'separator':
+            parts.append('<hr>')
+        elif kind == 'bullet':
+            if not in_list:
+                parts.append('<ul>')
+                in_list = True
+            parts.append(f'<li>{_html_runs(runs)}</li>')
+        elif kind == 'activity':
+            items = ''.join(f'<li>{html.escape(item)}</li>' for item in activity_items(runs))
+            parts.append(f'<p><strong>{html.escape(runs[0][0])}</strong></p><ul>{items}</ul>')
+        elif kind == 'text':
+            parts.append(f'<p>{_html_runs(runs)}</p>')
+    if in_list:
+        parts.append('</ul>')
+    body = '\n'.join(parts)
+    if not standalone:
+        return body
+    return (
+        '<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+        f'<title>{html.escape(title)}</title>\n'
+        '<style>body{font-family:Helvetica,Arial,sans-serif;max-width:800px;margin:2em auto;line-height:1.4}'
+        'h3{border-bottom:1px solid #333;margin-top:1.5em}p{margin:.3em 0}</style>\n'
+        f'</head>\n<body>\n{body}\n</body>\n</html>\n'
+    )
+
+def _pdf_markdown(runs):
+    """Text for multi_cell, with fpdf's **bold** markup when the line has emphasis and no other markup"""
+    text = plain(runs)
+    if any(bold for _, bold in runs) and not any(marker in text for marker in ('**', '__', '--')):
+        return ''.join(f'**{part}**' if bold else part for part, bold in runs), True
+    return text, False
+
+def to_pdf(document) -> bytes:
+    """
+    PDF bytes, rendered in memory
+    Latin-1 resumes use a built-in font; anything else embeds a Unicode TTF subset
+    """
+    unicode_text = any(needs_unicode_font(text) for _, runs in document for text, _ in runs)
+    pdf, family = new_pdf(unicode_text)
+    if family == CORE_FONT_FAMILY:
+        document = [(kind, tuple((to_latin1(text), bold) for text, bold in runs)) for kind, runs in document]
+    
+    pdf.add_page()
+    pdf.set_font(family, size=10)
+    for kind, runs in document:
+        if kind == 'blank':
+            pdf.ln(3)
+        elif kind == 'header':
+            pdf.set_font(family, 'B', 14)  # Bold and larger headers
+            pdf.multi_cell(0, 8, plain(runs))
+            pdf.ln(3)
+            pdf.set_font(family, size=10)  # Reset to normal
+        elif kind == 'separator':
+            # Section separators become actual lines
+            pdf.ln(2)
+            pdf.set_draw_color(0, 0, 0)
+            pdf.line(10, pdf.get_y(), 200, pdf.get_y())
+            pdf.ln(4)
+        elif kind == 'bullet':
+            pdf.set_x(15)  # Indent bullet points
+            text, markdown = _pdf_markdown(runs)
+            pdf.multi_cell(0, 6, '- ' + text, markdown=markdown)
+            pdf.ln(1)
+        elif kind == 'activity':
+            # Long certification/activity lines: bold category, then one item per line
+            pdf.set_font(family, 'B', 10)
+            pdf.multi_cell(0, 6, runs[0][0], new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            pdf.set_font(family, size=10)
+            for item in activity_items(runs):
+                pdf.multi_cell(0, 6, '  - ' + item)
+                pdf.ln(1)
+        else:
+            text, markdown = _pdf_markdown(runs)
+            pdf.multi_cell(0, 6, text, markdown=markdown)
+            pdf.ln(1)
+    
+    # Output is where fonts are subset and pages compressed
+    with span(logger, 'document.pdf_output', unicode_font=family != CORE_FONT_FAMILY):
+        return pdf_bytes(pdf)
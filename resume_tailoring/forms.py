@@ -56,6 +56,11 @@ class ResumeCustomizationForm(forms.Form):
         required=False
     )
     
+    generate_all_templates = forms.BooleanField(
+        label='Also prepare the other two layouts so I can switch between them instantly',
+        required=False
+    )
+    
     additional_notes = forms.CharField(
         widget=forms.Textarea(attrs={
             'class': 'form-control',
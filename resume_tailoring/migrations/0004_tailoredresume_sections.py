@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_tailoring', '0003_alter_tailoredresume_template_used'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tailoredresume',
+            name='sections',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
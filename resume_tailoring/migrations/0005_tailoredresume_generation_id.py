@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 09:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resume_tailoring', '0004_tailoredresume_sections'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tailoredresume',
+            name='generation_id',
+            field=models.CharField(blank=True, db_index=True, max_length=32),
+        ),
+    ]
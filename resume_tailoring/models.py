@@ -14,8 +14,10 @@ class TailoredResume(models.Model):
     original_resume = models.TextField()
     job_description = models.TextField()
     tailored_content = models.TextField()
+    sections = models.JSONField(default=list, blank=True)  # Parsed sections, re-rendered locally per template
     template_used = models.CharField(max_length=20, choices=TEMPLATE_CHOICES, null=False, blank=False)
     match_score = models.IntegerField(default=0)
+    generation_id = models.CharField(max_length=32, blank=True, db_index=True)  # Shared by variants generated together
     created_at = models.DateTimeField(default=timezone.now)
     
     class Meta:
@@ -24,6 +26,12 @@ class TailoredResume(models.Model):
     def __str__(self):
         username = self.user.username if self.user else "Anonymous"
         return f"{self.get_template_used_display()} Resume - {username}"
+    
+    def variants(self):
+        """The other template versions generated alongside this one"""
+        if not self.generation_id:
+            return TailoredResume.objects.none()
+        return TailoredResume.objects.filter(generation_id=self.generation_id).exclude(id=self.id).only('id', 'template_used')
 
 class ResumeTemplate(models.Model):
     """Model to store resume template configurations"""
@@ -0,0 +1,94 @@
+import io
+import re
+import zipfile
+from xml.sax.saxutils import escape
+from .document import activity_items, plain
+
+# Minimal WordprocessingML (.docx) writer for the resume document; the package holds
+# only the three parts Word requires, so no python-docx dependency is needed.
+# Every zip entry gets a fixed timestamp: the same document always yields the same
+# bytes, which keeps download ETags stable.
+
+DOCX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+ZIP_TIMESTAMP = (1980, 1, 1, 0, 0, 0)
+
+CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+PACKAGE_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/>'
+    '</Relationships>'
+)
+DOCUMENT_XML_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+)
+# A4 with 2cm margins, in twentieths of a point
+DOCUMENT_XML_END = (
+    '<w:sectPr><w:pgSz w:w="11906" w:h="16838"/>'
+    '<w:pgMar w:top="1134" w:right="1134" w:bottom="1134" w:left="1134" w:header="708" w:footer="708" w:gutter="0"/>'
+    '</w:sectPr></w:body></w:document>'
+)
+
+# Control characters (e.g. form feeds from PDF extraction) are not allowed in XML
+XML_INVALID = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+FONT = 'Calibri'
+BODY_SIZE = 21  # Half-points
+HEADER_SIZE = 28
+
+def _run(text: str, bold: bool = False, size: int = BODY_SIZE) -> str:
+    properties = f'<w:rFonts w:ascii="{FONT}" w:hAnsi="{FONT}" w:cs="{FONT}"/>'
+    if bold:
+        properties += '<w:b/>'
+    properties += f'<w:sz w:val="{size}"/>'
+    text = escape(XML_INVALID.sub('', text))
+    return f'<w:r><w:rPr>{properties}</w:rPr><w:t xml:space="preserve">{text}</w:t></w:r>'
+
+def _paragraph(runs: str, properties: str = '') -> str:
+    spacing = '<w:spacing w:before="0" w:after="60"/>'
+    return f'<w:p><w:pPr>{spacing}{properties}</w:pPr>{runs}</w:p>'
+
+def _bullet(runs: str) -> str:
+    # A hanging indent with a literal bullet avoids a numbering part
+    return _paragraph(_run('\u2022\t') + runs, '<w:tabs><w:tab w:val="left" w:pos="360"/></w:tabs><w:ind w:left="360" w:hanging="360"/>')
+
+def to_docx(document) -> bytes:
+    paragraphs = []
+    for kind, runs in document:
+        if kind == 'blank':
+            paragraphs.append(_paragraph(''))
+        elif kind == 'header':
+            paragraphs.append(_paragraph(
+                _run(plain(runs), bold=True, size=HEADER_SIZE),
+                '<w:keepNext/><w:pBdr><w:bottom w:val="single" w:sz="6" w:space="1" w:color="333333"/></w:pBdr>'
+            ))
+        elif kind == 'separator':
+            paragraphs.append(_paragraph('', '<w:pBdr><w:bottom w:val="single" w:sz="6" w:space="1" w:color="999999"/></w:pBdr>'))
+        elif kind == 'bullet':
+            paragraphs.append(_bullet(''.join(_run(text, bold) for text, bold in runs)))
+        elif kind == 'activity':
+            paragraphs.append(_paragraph(_run(runs[0][0], bold=True)))
+            paragraphs.extend(_bullet(_run(item)) for item in activity_items(runs))
+        else:
+            paragraphs.append(_paragraph(''.join(_run(text, bold) for text, bold in runs)))
+    
+    output = io.BytesIO()
+    with zipfile.ZipFile(output, 'w', zipfile.ZIP_DEFLATED) as package:
+        for name, content in (
+            ('[Content_Types].xml', CONTENT_TYPES_XML),
+            ('_rels/.rels', PACKAGE_RELS_XML),
+            ('word/document.xml', DOCUMENT_XML_START + ''.join(paragraphs) + DOCUMENT_XML_END),
+        ):
+            package.writestr(zipfile.ZipInfo(name, ZIP_TIMESTAMP), content, zipfile.ZIP_DEFLATED)
+    return output.getvalue()
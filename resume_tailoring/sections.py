@@ -0,0 +1,163 @@
+import re
+from typing import Dict, List, Optional
+
+# Heading text (lowercased, markdown and trailing colon stripped) -> section key
+SECTION_HEADINGS = {
+    'summary': 'summary',
+    'professional summary': 'summary',
+    'career summary': 'summary',
+    'profile': 'summary',
+    'professional profile': 'summary',
+    'objective': 'summary',
+    'career objective': 'summary',
+    'about me': 'summary',
+    'skills': 'skills',
+    'technical skills': 'skills',
+    'relevant skills': 'skills',
+    'key skills': 'skills',
+    'core competencies': 'skills',
+    'skills & tools': 'skills',
+    'skills and tools': 'skills',
+    'technical skills & tools': 'skills',
+    'experience': 'experience',
+    'work experience': 'experience',
+    'professional experience': 'experience',
+    'relevant experience': 'experience',
+    'employment history': 'experience',
+    'work history': 'experience',
+    'education': 'education',
+    'education & training': 'education',
+    'academic background': 'education',
+    'certifications': 'certifications',
+    'certification': 'certifications',
+    'certifications & licenses': 'certifications',
+    'certifications and licenses': 'certifications',
+    'licenses & certifications': 'certifications',
+    'certifications & activities': 'certifications',
+    'certificates': 'certifications',
+}
+
+# Other sections kept as they are, after the template's sections, in their original order
+EXTRA_SECTIONS = {
+    'projects', 'achievements', 'awards', 'honors', 'publications', 'languages',
+    'volunteer experience', 'volunteering', 'activities', 'extracurricular activities',
+    'interests', 'hobbies', 'references', 'training', 'courses', 'leadership',
+}
+
+MAX_HEADING_LENGTH = 50
+HEADING_DECORATION = re.compile(r'^[#*_=\-\s]+|[*_=\-:\s]+$')
+
+def _heading_key(line: str):
+    """Section key when the line is a section heading, otherwise None"""
+    stripped = line.strip()
+    if not stripped or len(stripped) > MAX_HEADING_LENGTH:
+        return None
+    text = HEADING_DECORATION.sub('', stripped).lower()
+    if text in SECTION_HEADINGS:
+        return SECTION_HEADINGS[text]
+    if text in EXTRA_SECTIONS:
+        return text.replace(' ', '_')
+    return None
+
+def parse_sections(text: str) -> List[Dict]:
+    """
+    Split resume text into [{'key', 'heading', 'body'}, ...] in document order
+    Everything before the first recognized heading is the 'header' section;
+    a heading that repeats (e.g. two SKILLS blocks) is merged into the first one
+    """
+    sections = [{'key': 'header', 'heading': '', 'body': []}]
+    by_key = {'header': sections[0]}
+    current = sections[0]
+    for line in text.split('\n'):
+        key = _heading_key(line)
+        if key is None:
+            current['body'].append(line)
+        elif key in by_key:
+            current = by_key[key]
+        else:
+            current = {'key': key, 'heading': HEADING_DECORATION.sub('', line.strip()).upper(), 'body': []}
+            sections.append(current)
+            by_key[key] = current
+    
+    for section in sections:
+        section['body'] = '\n'.join(section['body']).strip('\n')
+    return [section for section in sections if section['key'] != 'header' or section['body'].strip()]
+
+def order_sections(sections: List[Dict], section_order: List[str], exclude=()) -> List[Dict]:
+    """Sections in template order; sections the template doesn't name keep their relative order at the end"""
+    rank = {key: position for position, key in enumerate(section_order)}
+    kept = [section for section in sections if section['key'] not in exclude]
+    # sorted() is stable, so unknown sections stay in document order
+    return sorted(kept, key=lambda section: rank.get(section['key'], len(section_order)))
+
+def render_sections(sections: List[Dict], section_order: List[str], exclude=()) -> str:
+    """Plain-text resume with uppercase headings, in the given section order"""
+    blocks = []
+    for section in order_sections(sections, section_order, exclude):
+        if section['key'] == 'header':
+            blocks.append(section['body'])
+        else:
+            blocks.append(f"{section['heading']}\n{section['body']}".rstrip())
+    return '\n\n'.join(blocks) + '\n'
+
+def section_keys(sections: List[Dict]) -> List[str]:
+    return [section['key'] for section in sections]
+
+ENTRY_BULLET = re.compile(r'^\s*(?:[*\-\u2022\u25aa\u2192]|\d+[.)])\s')
+MAX_ENTRY_HEADING_LENGTH = 100
+
+def _is_entry_heading(line: str) -> bool:
+    """A line that can open an entry after bullets: unindented, short and not starting in lowercase"""
+    stripped = line.strip()
+    return not line[:1].isspace() and len(stripped) <= MAX_ENTRY_HEADING_LENGTH and not stripped[:1].islower()
+
+def split_entries(body: str) -> List[str]:
+    """
+    Entries of a section body, e.g. one job per entry in EXPERIENCE
+    An entry starts at a line that isn't a bullet, following a blank line, or following
+    bullets when it looks like a heading; an indented line or one starting in lowercase
+    continues the bullet above it (a wrapped bullet)
+    """
+    entries = []
+    current = []
+    after_blank = False
+    in_bullets = False
+    for line in body.split('\n'):
+        if not line.strip():
+            after_blank = True
+            current.append(line)
+            continue
+        if ENTRY_BULLET.match(line):
+            starts_entry = False
+            in_bullets = True
+        else:
+            starts_entry = after_blank or (in_bullets and _is_entry_heading(line))
+            if starts_entry:
+                in_bullets = False
+        if starts_entry and any(existing.strip() for existing in current):
+            entries.append('\n'.join(current).strip('\n'))
+            current = []
+        current.append(line)
+        after_blank = False
+    if any(line.strip() for line in current):
+        entries.append('\n'.join(current).strip('\n'))
+    return entries
+
+def replace_section(sections: List[Dict], key: str, body: str, entry: Optional[int] = None) -> List[Dict]:
+    """
+    Copy of `sections` with one section's body (or one entry of it) replaced
+    Raises KeyError for an unknown section and IndexError for an unknown entry
+    """
+    updated = [dict(section) for section in sections]
+    section = next((section for section in updated if section['key'] == key), None)
+    if section is None:
+        raise KeyError(key)
+    if entry is None:
+        section['body'] = body.strip('\n')
+    else:
+        entries = split_entries(section['body'])
+        if not 0 <= entry < len(entries):
+            raise IndexError(entry)
+        entries[entry] = body.strip('\n')
+        section['body'] = '\n\n'.join(entries)
+    return updated
@@ -0,0 +1,80 @@
+import hashlib
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Dict, Optional, Tuple
+from django.conf import settings
+from core.background import submit_background
+from .utils import generate_tailored_sections
+
+# Tailoring started as soon as a template is picked, with the customization form's
+# defaults, so a user who submits the form unchanged gets a result that is already
+# (mostly) done. Jobs live in this process only: a submit that lands on another
+# worker process, or after the TTL, simply generates as before.
+
+SPECULATION_POOL = 'tailoring-speculation'
+
+_speculations: Dict[str, Tuple[str, float, Future]] = {}
+_speculations_lock = threading.Lock()
+
+def default_options(resume_text: str, job_description: str, template_name: str) -> Dict:
+    """generate_tailored_sections arguments for a customization form submitted untouched"""
+    return {
+        'resume_text': resume_text,
+        'job_description': job_description,
+        'template_name': template_name,
+        'custom_skills': '',
+        'remove_sections': [],
+        'additional_notes': '',
+    }
+
+def _fingerprint(options: Dict) -> str:
+    return hashlib.sha256(json.dumps(options, sort_keys=True).encode('utf-8')).hexdigest()
+
+def _prune(now: float):
+    # Unclaimed jobs (abandoned forms) are dropped so their results don't pile up
+    for token, (_, started, future) in list(_speculations.items()):
+        if now - started > settings.TAILORING_SPECULATION_TTL:
+            future.cancel()
+            del _speculations[token]
+
+def start_speculation(options: Dict) -> str:
+    """Queue generate_tailored_sections(**options) in the background; returns a token for the session"""
+    token = uuid.uuid4().hex
+    future = submit_background(SPECULATION_POOL, settings.TAILORING_SPECULATION_WORKERS, generate_tailored_sections, **options)
+    now = time.monotonic()
+    with _speculations_lock:
+        _prune(now)
+        _speculations[token] = (_fingerprint(options), now, future)
+    return token
+
+def discard_speculation(token: Optional[str]):
+    """
+    Forget a job; one still waiting for a worker is cancelled
+    A call already in flight can't be interrupted, its result is just dropped
+    """
+    if not token:
+        return
+    with _speculations_lock:
+        entry = _speculations.pop(token, None)
+    if entry:
+        entry[2].cancel()
+
+def claim_speculation(token: Optional[str], options: Dict) -> Optional[Future]:
+    """
+    The job's future when it was started with exactly `options` and hasn't failed;
+    otherwise the job is discarded and None is returned, and the caller generates afresh
+    """
+    if not token:
+        return None
+    with _speculations_lock:
+        entry = _speculations.pop(token, None)
+    if entry is None:
+        return None
+    fingerprint, _, future = entry
+    if fingerprint != _fingerprint(options) or (future.done() and (future.cancelled() or future.exception() is not None)):
+        future.cancel()
+        return None
+    return future
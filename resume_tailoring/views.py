@@ -1,21 +1,61 @@
 import json
+import logging
+import uuid
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse, HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 from .models import TailoredResume
 from .forms import ResumeCustomizationForm
-from .utils import generate_tailored_resume, apply_template_formatting, save_resume_as_pdf
+from .utils import generate_tailored_resume, generate_tailored_sections, generate_all_template_variants, render_tailored_resume, regenerate_section, resume_artifact_key, TEMPLATES
+from .document import get_document, to_html, to_markdown, to_pdf, to_text
+from .ooxml import DOCX_CONTENT_TYPE, to_docx
+from .sections import parse_sections, split_entries
+from .speculation import claim_speculation, default_options, discard_speculation, start_speculation
 from resume_analysis.models import ResumeAnalysis
+from core.artifact_cache import artifact_response, discard_artifacts
+from core.ownership import remember_row
+from core.instrumentation import span
+
+logger = logging.getLogger(__name__)
+
+# Download formats: format_type -> (content type, render(document, title) -> bytes)
+DOWNLOAD_FORMATS = {
+    'txt': ('text/plain; charset=utf-8', lambda document, title: to_text(document).encode('utf-8')),
+    'md': ('text/markdown; charset=utf-8', lambda document, title: to_markdown(document).encode('utf-8')),
+    'html': ('text/html; charset=utf-8', lambda document, title: to_html(document, standalone=True, title=title).encode('utf-8')),
+    'docx': (DOCX_CONTENT_TYPE, lambda document, title: to_docx(document)),
+    'pdf': ('application/pdf', lambda document, title: to_pdf(document)),
+}
+
+def _discard_resume_artifacts(tailored_resume):
+    """Drop cached downloads of the resume's current text before it is replaced"""
+    content = tailored_resume.tailored_content
+    discard_artifacts(
+        resume_artifact_key(content, 'pdf'),
+        *(resume_artifact_key(content, format_type, tailored_resume.template_used) for format_type in DOWNLOAD_FORMATS)
+    )
+
+def _tailoring_source(session_analysis, recent_analysis):
+    """(resume_text, job_description) to tailor; session data if available, otherwise database"""
+    if session_analysis:
+        return session_analysis['resume_text'], session_analysis['job_description']
+    return recent_analysis.resume_text, recent_analysis.job_description
+
+def _clear_tailoring_options(request):
+    """Remove the template selection, dropping its speculative generation"""
+    tailoring_options = request.session.pop('tailoring_options', None)
+    if tailoring_options:
+        discard_speculation(tailoring_options.get('speculation_id'))
 
 def tailoring_home(request):
     """Main resume tailoring page - SESSION PERSISTENCE FIX"""
     # Clear previous template selection EVERY time
-    if 'tailoring_options' in request.session:
-        del request.session['tailoring_options']
+    _clear_tailoring_options(request)
     
     # Also clear any individual template keys
     session_keys_to_remove = ['selected_template', 'template_choice', 'last_template']
@@ -46,6 +86,12 @@ def tailoring_home(request):
                 'timestamp': str(timezone.now()),
                 'user_selected': True  # Flag to indicate user actually selected this
             }
+            # Start tailoring with the form's defaults now; most users submit them unchanged
+            if settings.TAILORING_SPECULATION:
+                resume_text, job_description = _tailoring_source(request.session.get('resume_analysis'), recent_analysis)
+                request.session['tailoring_options']['speculation_id'] = start_speculation(
+                    default_options(resume_text, job_description, template_choice)
+                )
             request.session.modified = True
             return redirect('resume_tailoring:customize')
         else:
@@ -89,8 +135,7 @@ def customize_resume(request):
             # Generate tailored resume
             try:
                 # Use session data if available, otherwise database
-                resume_text = session_analysis['resume_text'] if session_analysis else recent_analysis.resume_text
-                job_description = session_analysis['job_description'] if session_analysis else recent_analysis.job_description
+                resume_text, job_description = _tailoring_source(session_analysis, recent_analysis)
                 
                 # Get the selected template - NO FALLBACK
                 selected_template = tailoring_options.get('template_choice')
@@ -104,27 +149,53 @@ def customize_resume(request):
                     messages.error(request, f'Invalid template in session: {selected_template}. Please select a new template.')
                     return redirect('resume_tailoring:home')
                 
+                options = {
+                    'resume_text': resume_text,
+                    'job_description': job_description,
+                    'template_name': selected_template,
+                    'custom_skills': form.cleaned_data.get('custom_skills', ''),
+                    'remove_sections': form.cleaned_data.get('remove_sections', []),
+                    'additional_notes': form.cleaned_data.get('additional_notes', ''),
+                }
+                # Reuse the generation started when the template was picked if the options match;
+                # otherwise it is cancelled and the customized one runs now
+                speculation = claim_speculation(tailoring_options.get('speculation_id'), options)
                 
-                tailored_content = generate_tailored_resume(
-                    resume_text=resume_text,
-                    job_description=job_description,
-                    template_name=selected_template,
-                    custom_skills=form.cleaned_data.get('custom_skills', ''),
-                    remove_sections=form.cleaned_data.get('remove_sections', []),
-                    additional_notes=form.cleaned_data.get('additional_notes', '')
-                )
-                
-                
-                # Save tailored resume
-                tailored_resume = TailoredResume.objects.create(
-                    user=None,  
-                    original_resume=resume_text,
-                    job_description=job_description,
-                    tailored_content=tailored_content if isinstance(tailored_content, str) else str(tailored_content),
-                    template_used=selected_template,
-                    match_score=session_analysis.get('match_score', 75) if session_analysis else (recent_analysis.match_score if hasattr(recent_analysis, 'match_score') else 75)
-                )
+                # Sections are stored so the resume can later be re-rendered for another template locally
+                with span(logger, 'tailoring.request', template=selected_template, speculative=speculation is not None):
+                    if form.cleaned_data.get('generate_all_templates'):
+                        variants = generate_all_template_variants(**options, sections_future=speculation)
+                    elif speculation:
+                        try:
+                            sections = speculation.result()
+                        except Exception:
+                            # The speculative call failed after it was claimed; generate afresh
+                            logger.warning('Speculative tailoring failed, generating again', exc_info=True)
+                            sections = generate_tailored_sections(**options)
+                        variants = {selected_template: sections}
+                    else:
+                        variants = {selected_template: generate_tailored_sections(**options)}
+                match_score = session_analysis.get('match_score', 75) if session_analysis else (recent_analysis.match_score if hasattr(recent_analysis, 'match_score') else 75)
+                generation_id = uuid.uuid4().hex if len(variants) > 1 else ''
                 
+                # Save tailored resume(s); all variants or none
+                with transaction.atomic():
+                    saved = {
+                        template_name: TailoredResume.objects.create(
+                            user=None,
+                            original_resume=resume_text,
+                            job_description=job_description,
+                            tailored_content=render_tailored_resume(sections, template_name),
+                            sections=sections,
+                            template_used=template_name,
+                            match_score=match_score,
+                            generation_id=generation_id
+                        )
+                        for template_name, sections in variants.items()
+                    }
+                tailored_resume = saved[selected_template]
+                for resume in saved.values():
+                    remember_row(request, resume)
                 
                 # Clear session data after successful generation
                 if 'tailoring_options' in request.session:
@@ -134,6 +205,7 @@ def customize_resume(request):
                 return redirect('resume_tailoring:preview', resume_id=tailored_resume.id)
                 
             except Exception as e:
+                logger.exception('Tailoring request failed')
                 messages.error(request, f'Error generating tailored resume: {str(e)}')
                 return redirect('resume_tailoring:home')
     else:
@@ -148,8 +220,7 @@ def customize_resume(request):
 
 def reset_template(request):
     """Force reset template selection"""
-    if 'tailoring_options' in request.session:
-        del request.session['tailoring_options']
+    _clear_tailoring_options(request)
     
     messages.info(request, 'Template selection has been reset.')
     return redirect('resume_tailoring:home')
@@ -157,7 +228,8 @@ def reset_template(request):
 def reset_session(request):
     """Completely reset the session for template selection"""
     # Clear all template-related session data
-    session_keys = ['tailoring_options', 'selected_template', 'template_choice', 'last_template']
+    _clear_tailoring_options(request)
+    session_keys = ['selected_template', 'template_choice', 'last_template']
     
     for key in session_keys:
         if key in request.session:
@@ -173,22 +245,17 @@ def download_edited_resume(request, resume_id):
         edited_content = request.POST.get('edited_content', '')
         
         try:
-            import tempfile
-            import os
-            from django.http import HttpResponse
-            from .utils import save_resume_as_pdf
-            
             # Clean the content before PDF generation
             from .utils import clean_resume_content
-            cleaned_content = clean_resume_content(edited_content)
             
-            # Generate PDF in memory (no temp file needed)
-            pdf_data = save_resume_as_pdf(cleaned_content, None)
-            
-            response = HttpResponse(pdf_data, content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="tailored_resume_edited.pdf"'
-            
-            return response
+            # Same text downloaded again is read from the artifact cache
+            return artifact_response(
+                request,
+                resume_artifact_key(edited_content, 'pdf'),
+                lambda: to_pdf(get_document(clean_resume_content(edited_content))),
+                'application/pdf',
+                'tailored_resume_edited.pdf',
+            )
                 
         except Exception as e:
             messages.error(request, f'Error generating PDF: {str(e)}')
@@ -221,9 +288,77 @@ def preview_resume(request, resume_id):
     context = {
         'tailored_resume': tailored_resume,
         'cleaned_content': cleaned_content,
+        'document_html': to_html(get_document(cleaned_content)),
+        'regenerable_sections': _regenerable_sections(tailored_resume),
     }
     return render(request, 'resume_tailoring/preview.html', context)
 
+# Sections whose entries (e.g. one job each) can be regenerated one at a time
+ENTRY_SECTIONS = {'experience', 'projects'}
+
+def _regenerable_sections(tailored_resume):
+    """[{'key', 'heading', 'entries': [(index, first line), ...]}, ...] for the regenerate controls"""
+    sections = tailored_resume.sections or parse_sections(tailored_resume.tailored_content)
+    choices = []
+    for section in sections:
+        if section['key'] == 'header':
+            continue
+        entries = split_entries(section['body']) if section['key'] in ENTRY_SECTIONS else []
+        choices.append({
+            'key': section['key'],
+            'heading': section['heading'],
+            'entries': [(index, entry.split('\n', 1)[0].strip()[:60]) for index, entry in enumerate(entries)] if len(entries) > 1 else [],
+        })
+    return choices
+
+def _regenerate_resume_section(tailored_resume, key, entry, instructions):
+    """Rewrite one section (or entry) with the AI and splice it into the stored resume"""
+    sections = tailored_resume.sections or parse_sections(tailored_resume.tailored_content)
+    sections = regenerate_section(
+        sections, tailored_resume.job_description, key, entry,
+        template_name=tailored_resume.template_used, instructions=instructions
+    )
+    _discard_resume_artifacts(tailored_resume)
+    tailored_resume.sections = sections
+    tailored_resume.tailored_content = render_tailored_resume(sections, tailored_resume.template_used)
+    tailored_resume.save(update_fields=['sections', 'tailored_content'])
+    return sections
+
+def _parse_entry(value):
+    """Entry index from a request value; None (the whole section) when blank"""
+    if value in (None, ''):
+        return None
+    if isinstance(value, bool):
+        # int(True) would be 1
+        raise TypeError(value)
+    entry = int(value)
+    if entry < 0:
+        raise ValueError(value)
+    return entry
+
+def regenerate_resume_section(request, resume_id):
+    """Regenerate one section of a tailored resume from the preview page"""
+    tailored_resume = get_object_or_404(TailoredResume, id=resume_id)
+    if request.method != 'POST':
+        return redirect('resume_tailoring:preview', resume_id=resume_id)
+    
+    # The preview form sends 'key' for a whole section or 'key:entry' for one entry
+    key, _, entry = request.POST.get('section', '').partition(':')
+    try:
+        entry = _parse_entry(entry)
+    except ValueError:
+        messages.error(request, 'That section is not in this resume.')
+        return redirect('resume_tailoring:preview', resume_id=resume_id)
+    
+    try:
+        _regenerate_resume_section(tailored_resume, key, entry, request.POST.get('instructions', '').strip())
+        messages.success(request, 'Section regenerated.')
+    except (KeyError, IndexError):
+        messages.error(request, 'That section is not in this resume.')
+    except Exception as e:
+        messages.error(request, f'Error regenerating section: {str(e)}')
+    return redirect('resume_tailoring:preview', resume_id=resume_id)
+
 def edit_resume(request, resume_id):
     """Edit the tailored resume content"""
     try:
@@ -235,7 +370,10 @@ def edit_resume(request, resume_id):
     if request.method == 'POST':
         new_content = request.POST.get('tailored_content', '')
         if new_content:
+            if new_content != tailored_resume.tailored_content:
+                _discard_resume_artifacts(tailored_resume)
             tailored_resume.tailored_content = new_content
+            tailored_resume.sections = parse_sections(new_content)
             tailored_resume.save()
             messages.success(request, 'Resume updated successfully!')
         else:
@@ -243,6 +381,31 @@ def edit_resume(request, resume_id):
     
     return redirect('resume_tailoring:preview', resume_id=resume_id)
 
+def switch_template(request, resume_id):
+    """Re-render a tailored resume for another template from its stored sections, without calling the AI"""
+    tailored_resume = get_object_or_404(TailoredResume, id=resume_id)
+    template_choice = request.POST.get('template_choice')
+    
+    if request.method != 'POST' or template_choice not in TEMPLATES:
+        messages.error(request, 'Please choose Traditional, Modern, or Hybrid.')
+        return redirect('resume_tailoring:preview', resume_id=resume_id)
+    
+    # Variants generated together already exist as their own rows
+    variant = tailored_resume.variants().filter(template_used=template_choice).first()
+    if variant:
+        return redirect('resume_tailoring:preview', resume_id=variant.id)
+    
+    # Resumes saved before sections were stored are parsed from their text once
+    if not tailored_resume.sections:
+        tailored_resume.sections = parse_sections(tailored_resume.tailored_content)
+    _discard_resume_artifacts(tailored_resume)
+    tailored_resume.tailored_content = render_tailored_resume(tailored_resume.sections, template_choice)
+    tailored_resume.template_used = template_choice
+    tailored_resume.save(update_fields=['sections', 'tailored_content', 'template_used'])
+    
+    messages.success(request, f'Switched to the {tailored_resume.get_template_used_display()} template.')
+    return redirect('resume_tailoring:preview', resume_id=resume_id)
+
 def download_resume(request, resume_id, format_type):
     """Download the tailored resume in different formats"""
     try:
@@ -251,27 +414,25 @@ def download_resume(request, resume_id, format_type):
         messages.error(request, 'Tailored resume not found.')
         return redirect('resume_tailoring:home')
     
-    if format_type == 'txt':
-        response = HttpResponse(tailored_resume.tailored_content, content_type='text/plain')
-        response['Content-Disposition'] = f'attachment; filename="tailored_resume_{tailored_resume.template_used}.txt"'
-        return response
-    
-    elif format_type == 'pdf':
-        try:
-            # Apply template formatting before PDF generation
-            formatted_content = apply_template_formatting(tailored_resume.tailored_content, tailored_resume.template_used)
-            pdf_content = save_resume_as_pdf(formatted_content, None)
-                
-            response = HttpResponse(pdf_content, content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="tailored_resume_{tailored_resume.template_used}.pdf"'
-            return response
-        except Exception as e:
-            messages.error(request, f'Error generating PDF: {str(e)}')
-            return redirect('resume_tailoring:preview', resume_id=resume_id)
-    
-    else:
+    if format_type not in DOWNLOAD_FORMATS:
         messages.error(request, 'Invalid format specified.')
         return redirect('resume_tailoring:preview', resume_id=resume_id)
+    
+    content_type, render_format = DOWNLOAD_FORMATS[format_type]
+    content = tailored_resume.tailored_content
+    template = tailored_resume.template_used
+    try:
+        # Every format is emitted from the same parsed document, only when it isn't cached yet
+        return artifact_response(
+            request,
+            resume_artifact_key(content, format_type, template),
+            lambda: render_format(get_document(content), f'{template.title()} Resume'),
+            content_type,
+            f'tailored_resume_{template}.{format_type}',
+        )
+    except Exception as e:
+        messages.error(request, f'Error generating {format_type.upper()}: {str(e)}')
+        return redirect('resume_tailoring:preview', resume_id=resume_id)
 
 def tailoring_history(request):
     """Display user's tailoring history"""
@@ -313,4 +474,44 @@ def api_generate_resume(request):
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
+@csrf_exempt
+def api_regenerate_section(request, resume_id):
+    """API endpoint for regenerating one section (or one entry of a section) of a tailored resume"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Method not allowed'}, status=405)
+
+    try:
+        tailored_resume = TailoredResume.objects.get(id=resume_id)
+    except TailoredResume.DoesNotExist:
+        return JsonResponse({'error': 'Tailored resume not found'}, status=404)
 
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+    if not isinstance(data, dict):
+        return JsonResponse({'error': 'Expected a JSON object'}, status=400)
+    key = data.get('section', '')
+    if not isinstance(key, str):
+        return JsonResponse({'error': 'section must be a string'}, status=400)
+    try:
+        entry = _parse_entry(data.get('entry'))
+    except (TypeError, ValueError):
+        return JsonResponse({'error': 'entry must be a non-negative integer'}, status=400)
+    
+    try:
+        sections = _regenerate_resume_section(tailored_resume, key, entry, str(data.get('instructions', '')).strip())
+    except KeyError:
+        return JsonResponse({'error': f'Unknown section: {key}'}, status=400)
+    except IndexError:
+        return JsonResponse({'error': f'Unknown entry: {entry}'}, status=400)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+    
+    section = next(section for section in sections if section['key'] == key)
+    return JsonResponse({
+        'section': key,
+        'entry': entry,
+        'body': split_entries(section['body'])[entry] if entry is not None else section['body'],
+        'tailored_content': tailored_resume.tailored_content,
+    })